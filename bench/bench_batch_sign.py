@@ -0,0 +1,42 @@
+# bench_batch_sign.py
+# Throughput (tx/sec) of crypto.batch_signer.sign_batch per chain.
+# Run from the repo root:  python -m bench.bench_batch_sign [count] [workers]
+import sys, time
+from crypto.batch_signer import sign_batch
+
+# Well-known test keys (never use with real funds)
+EVM_KEY = "4c0883a69102937d6231471b5dbb6204fe5129617082792ae468d01a3f362318"
+XRP_KEY = EVM_KEY
+BTC_WIF = "KyZpNDKnfs94vbrwhJneDi77V6jF64PWPF8x5cdJb8ifgg2DUc9d"     # m/84'/0'/0'/0/0 of "abandon … about"
+BTC_ADDR = "bc1qcr8te4kr609gcawutmrza0j4xv80jy8z306fyu"
+
+def make_txs(chain, n):
+    if chain == "evm":
+        return [{"nonce": i, "to": "0xb922645E90e9fCAea54029be2434EA10eE9Ef47e", "value": 10**15,
+                 "gas": 21000, "gasPrice": 12_500_000_000, "chainId": 1, "data": "0x"} for i in range(n)]
+    if chain == "xrp":
+        return [{"network": "XRP", "TransactionType": "Payment", "Account": "rHb9CJAWyB4rj91VRWn96DkukG4bwdtyTh",
+                 "Destination": "rPT1Sjq2YGrBMTttX4GZHjKu9dyfzbpAYe", "Amount": 1_000_000,
+                 "Sequence": i + 1, "Fee": 12, "Flags": 2147483648} for i in range(n)]
+    return [{"network": "BTC", "utxo": {"txid": f"{i:064x}", "vout": 0, "amount_sats": 100_000, "address": BTC_ADDR},
+             "to": BTC_ADDR, "send_amount_sats": 50_000, "fee_sats": 500, "change_address": BTC_ADDR} for i in range(n)]
+
+KEYS = {"evm": EVM_KEY, "xrp": XRP_KEY, "btc": BTC_WIF}
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    print(f"count={count} workers={workers or 1}")
+    print(f"{'chain':<6}{'ok':>6}{'fail':>6}{'seconds':>10}{'tx/s':>10}")
+    for chain in ("evm", "btc", "xrp"):
+        txs = make_txs(chain, count)
+        t0 = time.perf_counter()
+        res = list(sign_batch(txs, lambda tx, c: (c, KEYS[c]), workers=workers))
+        dt = time.perf_counter() - t0
+        ok = sum(r["ok"] for r in res)
+        print(f"{chain:<6}{ok:>6}{len(res)-ok:>6}{dt:>10.3f}{count/dt:>10.1f}")
+        if ok < len(res):
+            print("   first error:", next(r["error"] for r in res if not r["ok"]))
+
+if __name__ == "__main__":
+    main()
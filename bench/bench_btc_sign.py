@@ -0,0 +1,30 @@
+# bench_btc_sign.py
+# P2WPKH signing cost vs. input count: shared BIP143 hashes once per tx,
+# per-input sighash + ECDSA timing, optional process pool.
+# Run from the repo root:  python -m bench.bench_btc_sign [inputs] [workers]
+import sys, time
+from crypto.btc_signer import sign_p2wpkh
+
+# m/84'/0'/0'/0/0 of "abandon … about" (never use with real funds)
+WIF = "KyZpNDKnfs94vbrwhJneDi77V6jF64PWPF8x5cdJb8ifgg2DUc9d"
+ADDR = "bc1qcr8te4kr609gcawutmrza0j4xv80jy8z306fyu"
+
+def main():
+    n_inputs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    utxos = [{"txid": f"{i:064x}", "vout": i % 4, "amount_sats": 20_000, "address": ADDR} for i in range(n_inputs)]
+    outputs = [{"address": ADDR, "amount_sats": 10_000 * n_inputs}, {"address": ADDR, "amount_sats": 5_000 * n_inputs}]
+    print(f"inputs={n_inputs} outputs={len(outputs)} workers={workers or 1}")
+    for label, w in (("serial", 0), ("pool", workers)):
+        if label == "pool" and not workers: continue
+        t0 = time.perf_counter()
+        res = sign_p2wpkh(utxos, outputs, WIF, workers=w)
+        dt = time.perf_counter() - t0
+        sighash = sum(i["sighash_ms"] for i in res["inputs"])
+        sign = sum(i["sign_ms"] for i in res["inputs"])
+        print(f"{label:<7} total {dt*1000:9.1f} ms  shared {res['shared_ms']:7.2f} ms  "
+              f"sighash/in {sighash/n_inputs:6.3f} ms  ecdsa/in {sign/n_inputs:6.3f} ms  "
+              f"{n_inputs/dt:8.1f} in/s  vsize {res['vsize']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# bench_derive_range.py
+# Addresses/sec for WalletEngine.derive_range() per address type.
+# Run from the repo root:  python -m bench.bench_derive_range [count] [workers]
+import sys, time
+from crypto.wallet_engine import WalletEngine
+
+MNEMONIC = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+
+NETWORKS = [
+    {"key": "ETH",  "type": "evm"},
+    {"key": "BTC",  "type": "utxo", "address_type": "P2WPKH"},
+    {"key": "BTC49","type": "utxo", "address_type": "P2SH-P2WPKH"},
+    {"key": "BTC44","type": "utxo", "address_type": "P2PKH"},
+]
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    eng = WalletEngine()
+    seed = eng.mnemonic_to_seed(MNEMONIC)
+    print(f"count={count} workers={workers or 1}")
+    print(f"{'network':<14}{'seconds':>10}{'addr/s':>12}")
+    for net in NETWORKS:
+        label = net.get("address_type", "EVM")
+        t0 = time.perf_counter()
+        rng = eng.derive_range(seed, net, 0, count, workers=workers)
+        dt = time.perf_counter() - t0
+        assert len(rng) == count
+        print(f"{label:<14}{dt:>10.3f}{count/dt:>12.1f}")
+    # reference: one full derive_*_account per address (old per-call path)
+    t0 = time.perf_counter()
+    n = min(count, 100)
+    for i in range(n):
+        eng.wipe_cache()
+        eng.derive_evm_account(seed, f"m/44'/60'/0'/0/{i}")
+    dt = time.perf_counter() - t0
+    print(f"{'EVM (cold)':<14}{dt:>10.3f}{n/dt:>12.1f}   one-at-a-time, cache wiped per call")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# bench_evm_sign.py
+# Per-transaction latency: cached EvmSigner vs. the one-shot helpers, plus the
+# old Web3()-per-call path when web3 happens to be installed.
+# Run from the repo root:  python -m bench.bench_evm_sign [count]
+import sys, time, statistics
+
+# Well-known test key (never use with real funds)
+KEY = "4c0883a69102937d6231471b5dbb6204fe5129617082792ae468d01a3f362318"
+TO = "0xb922645E90e9fCAea54029be2434EA10eE9Ef47e"
+
+def _legacy(i):
+    return {"nonce": i, "to": TO, "value": 10**15, "gas": 21000, "gasPrice": 12_500_000_000, "chainId": 1, "data": "0x"}
+
+def _eip1559(i):
+    return {"type": 2, "nonce": i, "to": TO, "value": 10**15, "gas": 21000, "maxFeePerGas": 30_000_000_000,
+            "maxPriorityFeePerGas": 1_000_000_000, "chainId": 1, "data": "0x"}
+
+def _eip2930(i):
+    return {"type": 1, "nonce": i, "to": TO, "value": 10**15, "gas": 30000, "gasPrice": 12_500_000_000,
+            "chainId": 1, "accessList": [], "data": "0x"}
+
+def _time(fn, count):
+    lat = []
+    for i in range(count):
+        t0 = time.perf_counter(); fn(i); lat.append((time.perf_counter() - t0) * 1000)
+    lat.sort()
+    return statistics.mean(lat), lat[len(lat) // 2], lat[int(len(lat) * 0.95) - 1]
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    t0 = time.perf_counter()
+    from crypto.evm_signer import EvmSigner, sign_legacy_tx, sign_eip1559_tx
+    import_ms = (time.perf_counter() - t0) * 1000
+    print(f"count={count}  import crypto.evm_signer: {import_ms:.0f} ms")
+
+    signer = EvmSigner(KEY)
+    # the cached signer must produce the same bytes as the one-shot helpers
+    assert signer.sign(_legacy(0)) == sign_legacy_tx(KEY, TO, 10**15, 0, 21000, 12_500_000_000, 1)
+
+    rows = [
+        ("EvmSigner legacy",   lambda i: signer.sign(_legacy(i))),
+        ("EvmSigner 2930",     lambda i: signer.sign(_eip2930(i))),
+        ("EvmSigner 1559",     lambda i: signer.sign(_eip1559(i))),
+        ("sign_legacy_tx",     lambda i: sign_legacy_tx(KEY, TO, 10**15, i, 21000, 12_500_000_000, 1)),
+        ("sign_eip1559_tx",    lambda i: sign_eip1559_tx(KEY, TO, 10**15, i, 21000, 30_000_000_000, 1_000_000_000, 1)),
+    ]
+    try:
+        t0 = time.perf_counter()
+        from web3 import Web3
+        print(f"import web3: {(time.perf_counter() - t0) * 1000:.0f} ms")
+        def web3_legacy(i):
+            Web3().eth.account.sign_transaction(_legacy(i), bytes.fromhex(KEY))
+        rows.append(("Web3() per call", web3_legacy))
+    except ImportError:
+        print("web3 not installed; skipping the old per-call path")
+
+    print(f"{'path':<20}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for label, fn in rows:
+        mean, p50, p95 = _time(fn, count)
+        print(f"{label:<20}{mean:>10.3f}{p50:>10.3f}{p95:>10.3f}")
+
+if __name__ == "__main__":
+    main()
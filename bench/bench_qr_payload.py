@@ -0,0 +1,68 @@
+# bench_qr_payload.py
+# QR size/latency report: hex/JSON text in byte mode (the old export) vs. the
+# payload_codec envelope in base43 / alphanumeric mode, for typical EVM, XRP and
+# BTC transactions. Pages use the same QR data-bit budget on both sides
+# (350 byte-mode chars = 509 alphanumeric chars).
+# Run from the repo root:  python -m bench.bench_qr_payload [rounds]
+import json, math, random, sys, time
+from qr.payload_codec import to_qr_text, decode_scanned
+
+RAW_PAGE = 350
+ENC_PAGE = RAW_PAGE * 16 // 11
+_r = random.Random(7)
+
+def _hex(n, upper=False, prefix=""):
+    h = _r.randbytes(n).hex()
+    return prefix + (h.upper() if upper else h)
+
+# Public EIP-155 example (nonce 9, 20 gwei, 1 ETH, chain 1)
+EVM_LEGACY = ("0xf86c098504a817c800825208943535353535353535353535353535353535353535880de0b6b3a7640000"
+              "8025a028ef61340bd939bc2195fe537567866003e1a15d3c71ff63e1590620aa636276a067cbe9d8997f76"
+              "1aecb703304b3800ccf555c9f3dc64214b297fb1966a3b6d83")
+EVM_UNSIGNED = {"nonce": 9, "to": "0x3535353535353535353535353535353535353535", "value": 10**18,
+                "gas": 21000, "gasPrice": 20_000_000_000, "chainId": 1, "data": "0x"}
+XRP_SIGNED = _hex(180, upper=True)                        # Payment with TxnSignature, ~180 bytes
+XRP_UNSIGNED = {"network": "XRP", "TransactionType": "Payment", "Account": "rHb9CJAWyB4rj91VRWn96DkukG4bwdtyTh",
+                "Destination": "rPT1Sjq2YGrBMTttX4GZHjKu9dyfzbpAYe", "Amount": 1500000, "Sequence": 7,
+                "Fee": 12, "Flags": 2147483648}
+BTC_2IN = _hex(370)                                       # 2-in / 2-out P2WPKH, segwit serialisation
+BTC_10IN = _hex(1500)
+BTC_UNSIGNED = {"network": "BTC", "utxos": [{"txid": _hex(32), "vout": i, "amount_sats": 150000,
+                "address": "bc1qcr8te4kr609gcawutmrza0j4xv80jy8z306fyu"} for i in range(2)],
+                "outputs": [{"address": "bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq", "amount_sats": 200000},
+                            {"address": "bc1qcr8te4kr609gcawutmrza0j4xv80jy8z306fyu", "amount_sats": 99500}],
+                "fee_sats": 500, "change_address": "bc1qcr8te4kr609gcawutmrza0j4xv80jy8z306fyu"}
+
+CASES = {
+    "EVM signed": EVM_LEGACY,
+    "EVM unsigned": json.dumps(EVM_UNSIGNED, indent=2),
+    "EVM ladder x5": json.dumps({"kind": "evm-fee-ladder", "tiers": [
+        {"gasPrice": 20_000_000_000 * (i + 1), "raw": _hex(110, prefix="0x")} for i in range(5)]},
+        separators=(",", ":")),
+    "XRP signed": XRP_SIGNED,
+    "XRP unsigned": json.dumps(XRP_UNSIGNED, indent=2),
+    "XRP run x20": json.dumps([_hex(180, upper=True) for _ in range(20)], separators=(",", ":")),
+    "BTC 2-in": BTC_2IN,
+    "BTC 10-in": BTC_10IN,
+    "BTC unsigned": json.dumps(BTC_UNSIGNED, indent=2),
+}
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    print(f"{'payload':<15}{'raw ch':>8}{'pages':>6}{'enc ch':>8}{'pages':>6}{'bits saved':>11}"
+          f"{'enc us':>8}{'dec us':>8}")
+    for name, text in CASES.items():
+        enc = to_qr_text(text)
+        t0 = time.perf_counter()
+        for _ in range(rounds): to_qr_text(text)
+        enc_us = (time.perf_counter() - t0) * 1e6 / rounds
+        t0 = time.perf_counter()
+        for _ in range(rounds): back = decode_scanned(enc)
+        dec_us = (time.perf_counter() - t0) * 1e6 / rounds
+        assert back == text or json.loads(back) == json.loads(text)
+        saved = 1 - (len(enc) * 5.5) / (len(text) * 8)
+        print(f"{name:<15}{len(text):>8}{math.ceil(len(text) / RAW_PAGE):>6}{len(enc):>8}"
+              f"{math.ceil(len(enc) / ENC_PAGE):>6}{saved:>10.0%}{enc_us:>8.0f}{dec_us:>8.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# bench_qr_render.py
+# QR -> display surface: the old qrcode/PIL path (box_size=4 image, RGB convert,
+# NEAREST resize, tobytes -> fromstring) vs. the module-matrix renderer in
+# qr.qr_render, for an address-sized and a 350-char payload. Encoding is shared
+# by both paths and timed on its own; "cached" is a QrRenderer hit.
+# Run from the repo root:  python -m bench.bench_qr_render [rounds] [size]
+import os, sys, time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+import qrcode
+from PIL import Image
+from qr.qr_render import _encode, matrix_to_surface, QrRenderer
+
+PAYLOADS = {
+    "address (42)": "0xb922645E90e9fCAea54029be2434EA10eE9Ef47e",
+    "350 chars": ("0x" + "f86c098504a817c800825208943535353535353535353535353535353535353535" * 6)[:350],
+}
+
+def pil_encode(data):
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_Q, box_size=4, border=1)
+    qr.add_data(data); qr.make(fit=True)
+    return qr
+
+def pil_render(qr, size):
+    img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
+    img = img.resize((size, size), Image.NEAREST)
+    return pygame.image.fromstring(img.tobytes(), img.size, img.mode)
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 180
+    pygame.display.init()
+    pygame.display.set_mode((320, 240))
+    print(f"rounds={rounds} size={size}px")
+    print(f"{'payload':<14}{'path':<20}{'ms/render':>10}")
+
+    def row(name, label, fn):
+        t0 = time.perf_counter()
+        for _ in range(rounds): fn()
+        print(f"{name:<14}{label:<20}{(time.perf_counter() - t0) * 1000 / rounds:>10.3f}")
+
+    for name, data in PAYLOADS.items():
+        legacy_qr = pil_encode(data)
+        matrix = _encode(data, "Q").get_matrix()
+        cache = QrRenderer()
+        row(name, "encode (shared)", lambda: _encode(data, "Q"))
+        row(name, "PIL round-trip", lambda: pil_render(legacy_qr, size))
+        row(name, "matrix -> surface", lambda: matrix_to_surface(matrix, size))
+        row(name, "old full path", lambda: pil_render(pil_encode(data), size))
+        row(name, "cached", lambda: cache.surface(data, size))
+        s = matrix_to_surface(matrix, size)
+        print(f"{'':<14}{len(matrix)} modules, {size // len(matrix)} px/module, surface {s.get_size()}")
+
+if __name__ == "__main__":
+    main()
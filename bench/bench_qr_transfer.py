@@ -0,0 +1,48 @@
+# bench_qr_transfer.py
+# End-to-end QR transfer time, paged vs. animated fountain mode, for 1/10/50 KB.
+# Both modes carry the payload_codec envelope. Paged: one tap + capture per
+# page (tap_seconds each, in order).
+# Animated: frames cycle at fps; a simulated reader joins at a random frame,
+# misses each frame with probability `loss` and runs the real FountainDecoder
+# until the payload is rebuilt. Encoder/decoder CPU time is measured as well.
+# Run from the repo root:  python -m bench.bench_qr_transfer [fps] [loss] [tap_seconds] [trials]
+import math, os, random, statistics, sys, time
+from qr.fountain import FountainEncoder, FountainDecoder
+from qr.payload_codec import pack, to_qr_text
+
+SIZES = {"1 KB": 1024, "10 KB": 10 * 1024, "50 KB": 50 * 1024}
+PAGE_CHARS = 350 * 16 // 11      # show_paged page size for encoded payloads
+
+def simulate(frames, fps, loss, rng):
+    """Seconds until one reader has the payload, plus its decode CPU seconds."""
+    dec = FountainDecoder(); i = rng.randrange(len(frames)); shown = 0; cpu = 0.0
+    while not dec.complete:
+        shown += 1
+        if rng.random() >= loss:
+            t0 = time.perf_counter(); dec.receive(frames[i]); cpu += time.perf_counter() - t0
+        i = (i + 1) % len(frames)
+    return shown / fps, cpu
+
+def main():
+    fps = float(sys.argv[1]) if len(sys.argv) > 1 else 8
+    loss = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    tap_s = float(sys.argv[3]) if len(sys.argv) > 3 else 2.0
+    trials = int(sys.argv[4]) if len(sys.argv) > 4 else 50
+    rng = random.Random(1)
+    print(f"fps={fps:g} loss={loss:.0%} tap={tap_s:g}s/page trials={trials}")
+    print(f"{'payload':<8}{'pages':>6}{'paged s':>9}{'frames':>8}{'anim p50':>10}{'anim p95':>10}"
+          f"{'encode ms':>11}{'decode ms':>11}")
+    for name, n in SIZES.items():
+        payload = os.urandom(n // 2 + 1).hex()[:n]          # signed-tx-like hex text
+        pages = math.ceil(len(to_qr_text(payload)) / PAGE_CHARS)
+        t0 = time.perf_counter()
+        frames = FountainEncoder(pack(payload)).frames()
+        enc_ms = (time.perf_counter() - t0) * 1000
+        runs = [simulate(frames, fps, loss, rng) for _ in range(trials)]
+        secs = sorted(r[0] for r in runs)
+        dec_ms = statistics.mean(r[1] for r in runs) * 1000
+        print(f"{name:<8}{pages:>6}{pages * tap_s:>9.1f}{len(frames):>8}{statistics.median(secs):>10.1f}"
+              f"{secs[int(0.95 * (len(secs) - 1))]:>10.1f}{enc_ms:>11.1f}{dec_ms:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# bench_startup.py
+# Time-to-PIN for main_wallet: median time to the first display.flip() of the
+# PIN screen, time to import main_wallet, the slowest imports (-X importtime),
+# and heavy modules that must not be loaded before the PIN gate.
+# Budget: bench/startup_budget.json. Exits 1 when any budget is exceeded.
+# Run from the repo root:  python -m bench.bench_startup [runs]
+import json, os, statistics, subprocess, sys
+from pathlib import Path
+
+BUDGET_PATH = Path(__file__).with_name("startup_budget.json")
+
+# runs in a fresh interpreter: stops at the first frame the PIN screen flips
+_PROBE = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import main_wallet
+t_import = time.perf_counter()
+import pygame
+_flip = pygame.display.flip
+def _first_flip(*a):
+    _flip(*a)
+    print(json.dumps({"import_main_ms": (t_import - t0) * 1000,
+                      "first_frame_ms": (time.perf_counter() - t0) * 1000,
+                      "modules": sorted(sys.modules)}))
+    sys.stdout.flush(); os._exit(0)
+pygame.display.flip = _first_flip
+main_wallet.WalletApp().run()
+"""
+
+def _probe(env):
+    out = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, env=env, timeout=120)
+    for line in out.stdout.splitlines()[::-1]:
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(f"probe failed:\n{out.stderr[-2000:]}")
+
+def _import_breakdown(env, top=12):
+    """Cumulative import time of modules imported (directly or not) by main_wallet."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main_wallet"],
+                         capture_output=True, text=True, env=env, timeout=120)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(cumulative), depth, name.strip()))
+    rows = [r for r in rows if r[1] <= 2]
+    rows.sort(reverse=True)
+    return rows[:top]
+
+def main():
+    budget = json.loads(BUDGET_PATH.read_text())
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else int(budget.get("runs", 5))
+    env = dict(os.environ, PYTHONPATH=os.getcwd() + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    samples = [_probe(env) for _ in range(runs)]
+    first = statistics.median(s["first_frame_ms"] for s in samples)
+    imp = statistics.median(s["import_main_ms"] for s in samples)
+    loaded = set(samples[-1]["modules"])
+
+    print(f"runs={runs}")
+    print(f"{'metric':<22}{'median ms':>12}{'budget ms':>12}")
+    print(f"{'import main_wallet':<22}{imp:>12.1f}{budget['import_main_ms']:>12}")
+    print(f"{'first frame (PIN)':<22}{first:>12.1f}{budget['first_frame_ms']:>12}")
+    print("\nslowest imports (cumulative):")
+    for us, depth, name in _import_breakdown(env):
+        print(f"  {us/1000:9.1f} ms  {'  '*depth}{name}")
+
+    failures = []
+    if imp > budget["import_main_ms"]: failures.append(f"import main_wallet {imp:.0f} ms > {budget['import_main_ms']} ms")
+    if first > budget["first_frame_ms"]: failures.append(f"first frame {first:.0f} ms > {budget['first_frame_ms']} ms")
+    early = [m for m in budget.get("forbidden_before_pin", []) if m in loaded]
+    if early: failures.append("loaded before PIN: " + ", ".join(early))
+    if failures:
+        print("\nOVER BUDGET:\n  " + "\n  ".join(failures)); return 1
+    print("\nwithin budget"); return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
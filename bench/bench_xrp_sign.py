@@ -0,0 +1,36 @@
+# bench_xrp_sign.py
+# XRP Payment signing: one-shot helper per tx vs. XrpSigner.sign vs. a
+# Sequence run from one encoded template (serial and pooled).
+# Run from the repo root:  python -m bench.bench_xrp_sign [count] [workers]
+import sys, time
+from crypto.xrp_signer import XrpSigner, sign_xrp_payment_tx
+
+# Well-known test key (never use with real funds)
+KEY = "4c0883a69102937d6231471b5dbb6204fe5129617082792ae468d01a3f362318"
+DEST = "rPT1Sjq2YGrBMTttX4GZHjKu9dyfzbpAYe"
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    signer = XrpSigner(KEY)
+    tx = signer.payment(DEST, 1_000_000, 12, 1)
+    print(f"count={count} workers={workers or 1}")
+    print(f"{'path':<22}{'seconds':>10}{'tx/s':>10}{'ms/tx':>10}")
+
+    def row(label, fn):
+        t0 = time.perf_counter(); fn(); dt = time.perf_counter() - t0
+        print(f"{label:<22}{dt:>10.3f}{count/dt:>10.1f}{dt*1000/count:>10.3f}")
+
+    row("sign_xrp_payment_tx", lambda: [sign_xrp_payment_tx(KEY, signer.address, DEST, 1_000_000, s, 12)
+                                        for s in range(1, count + 1)])
+    row("XrpSigner.sign", lambda: [signer.sign(dict(tx, Sequence=s)) for s in range(1, count + 1)])
+    row("sequence range", lambda: signer.sign_sequence_range(tx, 1, count))
+    if workers > 1:
+        row(f"sequence range x{workers}", lambda: signer.sign_sequence_range(tx, 1, count, workers=workers))
+
+    # the template path must produce the same blobs as a full encode
+    run = signer.sign_sequence_range(tx, 1, 3)
+    assert [r["blob"] for r in run["signed"]] == [signer.sign(dict(tx, Sequence=s)) for s in (1, 2, 3)]
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# batch_signer.py
+# Sign a list of unsigned transactions (mixed EVM / BTC / XRP) and stream the
+# results. Keys are parsed once per account (per worker process when a pool is
+# used) and every item reports its own error, so one bad entry never aborts the run.
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+def classify(tx: dict) -> str:
+    """'evm' | 'btc' | 'xrp' for an unsigned_tx.json-style object."""
+    if not isinstance(tx, dict):
+        raise ValueError("transaction must be an object")
+    net = (tx.get("network") or "").upper()
+    if net == "XRP" or tx.get("TransactionType"):
+        return "xrp"
+    if net == "BTC" or "utxo" in tx or "utxos" in tx:
+        return "btc"
+    if "chainId" in tx or "nonce" in tx:
+        return "evm"
+    raise ValueError("cannot tell chain of transaction")
+
+# ---- per-process signer cache: account_id -> parsed signer ----
+_KEYS = {}
+_SIGNERS = {}
+
+def _init_worker(keys: dict):
+    global _KEYS, _SIGNERS
+    _KEYS = dict(keys); _SIGNERS = {}
+
+def _evm_signer(privkey_hex: str):
+    from crypto.evm_signer import EvmSigner
+    return EvmSigner(privkey_hex).sign
+
+def _xrp_signer(privkey_hex: str):
+    from crypto.xrp_signer import XrpSigner
+    signer = XrpSigner(privkey_hex)
+    def sign(tx):
+        t = {k: v for k, v in tx.items() if k != "network"}
+        for k in ("Amount", "Fee"):
+            if isinstance(t.get(k), int): t[k] = str(t[k])
+        return signer.sign(t)
+    return sign
+
+def _btc_signer(privkey: str):
+    from crypto.btc_signer import sign_p2wpkh, sign_p2wpkh_single_input
+    def sign(tx):
+        if "utxos" in tx:
+            return sign_p2wpkh(tx["utxos"], tx["outputs"], privkey,
+                               network=tx.get("btc_network", "mainnet"))["hex"]
+        u = tx["utxo"]
+        return sign_p2wpkh_single_input(
+            privkey_hex=privkey, utxo_txid_be_hex=u["txid"], utxo_vout=int(u["vout"]),
+            utxo_amount_sats=int(u["amount_sats"]), utxo_address=u["address"],
+            recipient_address=tx["to"], send_amount_sats=int(tx["send_amount_sats"]),
+            fee_sats=int(tx["fee_sats"]), change_address=tx.get("change_address"),
+            network=tx.get("btc_network", "mainnet"),
+        )
+    return sign
+
+_FACTORIES = {"evm": _evm_signer, "xrp": _xrp_signer, "btc": _btc_signer}
+
+def _signer(chain: str, account_id: str):
+    key = (chain, account_id)
+    s = _SIGNERS.get(key)
+    if s is None:
+        pk = _KEYS.get(account_id)
+        if not pk:
+            raise KeyError(f"no key for account {account_id}")
+        s = _SIGNERS[key] = _FACTORIES[chain](pk)
+    return s
+
+def _sign_one(job):
+    index, chain, account_id, tx = job
+    t0 = time.perf_counter()
+    try:
+        signed = _signer(chain, account_id)(tx)
+        return {"index": index, "ok": True, "chain": chain, "account": account_id,
+                "signed": signed, "ms": (time.perf_counter()-t0)*1000}
+    except Exception as e:
+        return {"index": index, "ok": False, "chain": chain, "account": account_id,
+                "error": f"{type(e).__name__}: {e}", "ms": (time.perf_counter()-t0)*1000}
+
+def sign_batch(txs, key_for, workers: int | None = None, chunksize: int = 16):
+    """
+    txs:     iterable of unsigned tx objects (mixed chains allowed)
+    key_for: callable(tx, chain) -> (account_id, private_key_text); resolved in this process
+    Yields one result dict per item, in input order:
+      {"index", "ok", "chain", "account", "signed" | "error", "ms"}
+    """
+    jobs = []; keys = {}; early = []
+    for i, tx in enumerate(txs):
+        try:
+            chain = classify(tx)
+            account_id, pk = key_for(tx, chain)
+            if not pk: raise KeyError(f"no key for {account_id}")
+            keys.setdefault(account_id, pk)
+            jobs.append((i, chain, account_id, tx))
+        except Exception as e:
+            early.append({"index": i, "ok": False, "chain": None, "account": None,
+                          "error": f"{type(e).__name__}: {e}", "ms": 0.0})
+    early_by_index = {r["index"]: r for r in early}
+
+    def merged(results):
+        pending = sorted(early_by_index)
+        for r in results:
+            while pending and pending[0] < r["index"]:
+                yield early_by_index[pending.pop(0)]
+            yield r
+        for i in pending:
+            yield early_by_index[i]
+
+    if not workers or workers <= 1 or len(jobs) < 2 * workers:
+        _init_worker(keys)
+        try:
+            yield from merged(_sign_one(j) for j in jobs)
+        finally:
+            _init_worker({})
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(keys,)) as ex:
+        yield from merged(ex.map(_sign_one, jobs, chunksize=chunksize))
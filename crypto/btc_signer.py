@@ -1,8 +1,15 @@
 # btc_signer.py
 # pyright: reportMissingImports=false, reportAttributeAccessIssue=false
-# Single-input P2WPKH signer (btclib), resilient to module layout changes.
-import importlib
-from btclib.tx import Tx, TxIn, TxOut, OutPoint
+# N-input / M-output P2WPKH signer. Serialization and BIP143 sighashes are done
+# here; btclib is only used for the ECDSA primitive (resilient to module layout
+# changes). The shared hashes (hashPrevouts, hashSequence, hashOutputs) are
+# computed once per transaction and every input resumes from a sha256 midstate.
+import hashlib, importlib, struct, time
+from concurrent.futures import ProcessPoolExecutor
+
+SIGHASH_ALL = 1
+SEQUENCE_FINAL = 0xFFFFFFFF
+_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
 
 # --- small local helper: hex string -> bytes (handles 0x prefix, odd length)
 def _bytes_from_hex(s: str) -> bytes:
@@ -28,37 +35,328 @@ def _import_attr(mod_paths, attr_names):
     raise ImportError(f"Could not import {attr_names} from {mod_paths}") from last
 
 # dynamic imports (work across btclib builds)
-addr_to_scriptpubkey = _import_attr(
-    ["btclib.address", "btclib.script.address"],
-    ["addr_to_scriptpubkey", "address_to_scriptpubkey"],
-)
-PSBT = _import_attr(
-    ["btclib.psbt.psbt", "btclib.psbt"],
-    ["PSBT", "Psbt"],
+dsa_sign_ = _import_attr(
+    ["btclib.ecc.dsa", "btclib.dsa"],
+    ["sign_"],
 )
-sign_psbtin = _import_attr(
-    ["btclib.psbt.psbt_in", "btclib.psbt.input"],
-    ["sign_psbtin"],
+dsa_verify_ = _import_attr(
+    ["btclib.ecc.dsa", "btclib.dsa"],
+    ["verify_"],
 )
-prvkey_from_prvkeyhex = _import_attr(
-    ["btclib.keys"],
-    ["prvkey_from_prvkeyhex"],
-)
-pubkey_from_prvkey = _import_attr(
-    ["btclib.keys"],
-    ["pubkey_from_prvkey"],
+pubkeyinfo_from_prvkey = _import_attr(
+    ["btclib.to_pub_key", "btclib.to_pubkey"],
+    ["pub_keyinfo_from_prv_key", "pubkeyinfo_from_prvkey"],
 )
 
-def _make_psbt_from_tx(tx: Tx, network: str):
-    if hasattr(PSBT, "from_tx"):
-        try:
-            return PSBT.from_tx(tx, network=network)
-        except TypeError:
-            return PSBT.from_tx(tx)
+# ---------------- hashing / encoding primitives ----------------
+def _sha256d(b: bytes) -> bytes:
+    return hashlib.sha256(hashlib.sha256(b).digest()).digest()
+
+def _hash160(b: bytes) -> bytes:
+    try:
+        r = hashlib.new("ripemd160")
+    except ValueError:   # OpenSSL 3 without the legacy provider
+        Hash160 = _import_attr(["bip_utils", "bip_utils.utils.crypto"], ["Hash160"])
+        return Hash160.QuickDigest(b)
+    r.update(hashlib.sha256(b).digest())
+    return r.digest()
+
+def _varint(n: int) -> bytes:
+    if n < 0xFD: return bytes([n])
+    if n <= 0xFFFF: return b"\xfd" + struct.pack("<H", n)
+    if n <= 0xFFFFFFFF: return b"\xfe" + struct.pack("<I", n)
+    return b"\xff" + struct.pack("<Q", n)
+
+_B58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+def _b58check_decode(s: str) -> bytes:
+    n = 0
+    for c in s:
+        i = _B58.find(c)
+        if i < 0: raise ValueError(f"Invalid base58 character {c!r}")
+        n = n * 58 + i
+    raw = n.to_bytes((n.bit_length() + 7) // 8, "big")
+    raw = b"\x00" * (len(s) - len(s.lstrip("1"))) + raw
+    body, check = raw[:-4], raw[-4:]
+    if len(raw) < 5 or _sha256d(body)[:4] != check:
+        raise ValueError("Bad base58 checksum")
+    return body
+
+_BECH32 = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+
+def _bech32_polymod(values) -> int:
+    gen = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+    chk = 1
+    for v in values:
+        b = chk >> 25
+        chk = (chk & 0x1FFFFFF) << 5 ^ v
+        for i in range(5):
+            if (b >> i) & 1: chk ^= gen[i]
+    return chk
+
+def _segwit_decode(addr: str):
+    """bech32/bech32m address -> (hrp, witness version, program)."""
+    if addr.lower() != addr and addr.upper() != addr:
+        raise ValueError("Mixed-case bech32 address")
+    a = addr.lower()
+    pos = a.rfind("1")
+    if pos < 1 or pos + 7 > len(a):
+        raise ValueError("Not a bech32 address")
+    hrp = a[:pos]
+    data = [_BECH32.find(c) for c in a[pos + 1:]]
+    if -1 in data: raise ValueError("Invalid bech32 character")
+    const = _bech32_polymod([ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp] + data)
+    ver = data[0]
+    if const != (1 if ver == 0 else 0x2BC830A3):
+        raise ValueError("Bad bech32 checksum")
+    acc = bits = 0; prog = bytearray()
+    for v in data[1:-6]:
+        acc = (acc << 5) | v; bits += 5
+        if bits >= 8:
+            bits -= 8; prog.append((acc >> bits) & 0xFF)
+    if bits >= 5 or (acc << (8 - bits)) & 0xFF:
+        raise ValueError("Bad bech32 padding")
+    if not 2 <= len(prog) <= 40 or (ver == 0 and len(prog) not in (20, 32)):
+        raise ValueError("Bad witness program length")
+    return hrp, ver, bytes(prog)
+
+_SEGWIT_HRP = {"mainnet": "bc", "testnet": "tb", "signet": "tb", "regtest": "bcrt"}
+_B58_PREFIX = {"mainnet": (0x00, 0x05), "testnet": (0x6F, 0xC4), "signet": (0x6F, 0xC4), "regtest": (0x6F, 0xC4)}
+
+def address_to_script_pubkey(addr: str, network: str = "mainnet") -> bytes:
+    """P2WPKH/P2WSH/P2TR (bech32/bech32m) or P2PKH/P2SH (base58) -> scriptPubKey."""
+    addr = (addr or "").strip()
+    try:
+        hrp, ver, prog = _segwit_decode(addr)
+    except ValueError:
+        hrp = None
+    if hrp is not None:
+        if hrp != _SEGWIT_HRP.get(network, "bc"):
+            raise ValueError(f"Address {addr} is not for {network}")
+        return bytes([ver + 0x50 if ver else 0, len(prog)]) + prog
+    body = _b58check_decode(addr)
+    p2pkh, p2sh = _B58_PREFIX.get(network, _B58_PREFIX["mainnet"])
+    if len(body) == 21 and body[0] == p2pkh:
+        return b"\x76\xa9\x14" + body[1:] + b"\x88\xac"
+    if len(body) == 21 and body[0] == p2sh:
+        return b"\xa9\x14" + body[1:] + b"\x87"
+    raise ValueError(f"Unsupported address {addr} for {network}")
+
+def _b58check_encode(body: bytes) -> str:
+    raw = body + _sha256d(body)[:4]
+    n = int.from_bytes(raw, "big"); out = ""
+    while n:
+        n, r = divmod(n, 58); out = _B58[r] + out
+    return "1" * (len(raw) - len(raw.lstrip(b"\0"))) + out
+
+def _segwit_encode(hrp: str, ver: int, prog: bytes) -> str:
+    acc = bits = 0; data = [ver]
+    for b in prog:
+        acc = (acc << 8) | b; bits += 8
+        while bits >= 5:
+            bits -= 5; data.append((acc >> bits) & 31)
+    if bits: data.append((acc << (5 - bits)) & 31)
+    pm = _bech32_polymod([ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp] + data + [0] * 6)
+    pm ^= 1 if ver == 0 else 0x2BC830A3
+    return hrp + "1" + "".join(_BECH32[d] for d in data + [(pm >> 5 * (5 - i)) & 31 for i in range(6)])
+
+def script_pubkey_to_address(spk: bytes, network: str = "mainnet") -> str:
+    """Inverse of address_to_script_pubkey; ValueError for non-standard scripts."""
+    spk = bytes(spk)
+    if len(spk) >= 4 and (spk[0] == 0 or 0x51 <= spk[0] <= 0x60) and spk[1] == len(spk) - 2:
+        ver = spk[0] - 0x50 if spk[0] else 0
+        if 2 <= spk[1] <= 40 and (ver or spk[1] in (20, 32)):
+            return _segwit_encode(_SEGWIT_HRP.get(network, "bc"), ver, spk[2:])
+    p2pkh, p2sh = _B58_PREFIX.get(network, _B58_PREFIX["mainnet"])
+    if len(spk) == 25 and spk[:3] == b"\x76\xa9\x14" and spk[23:] == b"\x88\xac":
+        return _b58check_encode(bytes([p2pkh]) + spk[3:23])
+    if len(spk) == 23 and spk[:2] == b"\xa9\x14" and spk[22] == 0x87:
+        return _b58check_encode(bytes([p2sh]) + spk[2:22])
+    raise ValueError("Non-standard output script")
+
+def privkey_bytes(privkey: str) -> bytes:
+    """WIF (compressed) or 64-hex private key -> 32 bytes."""
+    s = (privkey or "").strip()
+    if len(s) in (51, 52) and s[0] in "5KLc9":
+        body = _b58check_decode(s)
+        if body[0] not in (0x80, 0xEF): raise ValueError("Not a WIF private key")
+        if len(body) == 34 and body[-1] == 1: return body[1:33]
+        raise ValueError("Uncompressed WIF keys cannot sign P2WPKH")
+    b = _bytes_from_hex(s)
+    if len(b) != 32: raise ValueError("Private key must be 32 bytes")
+    return b
+
+def pubkey_from_privkey(prv: bytes) -> bytes:
+    info = pubkeyinfo_from_prvkey(int.from_bytes(prv, "big"))
+    pub = info[0] if isinstance(info, tuple) else info
+    if len(pub) != 33: raise ValueError("Expected compressed public key")
+    return bytes(pub)
+
+def p2wpkh_script_pubkey(pub: bytes) -> bytes:
+    return b"\x00\x14" + _hash160(pub)
+
+# ---------------- ECDSA (runs in workers) ----------------
+def _der(r: int, s: int) -> bytes:
+    def enc(x):
+        b = x.to_bytes((x.bit_length() + 7) // 8 or 1, "big")
+        if b[0] & 0x80: b = b"\x00" + b
+        return b"\x02" + bytes([len(b)]) + b
+    body = enc(r) + enc(s)
+    return b"\x30" + bytes([len(body)]) + body
+
+def ecdsa_sign_der(digest: bytes, prv: bytes) -> bytes:
+    sig = dsa_sign_(digest, int.from_bytes(prv, "big"))
+    r, s = (sig.r, sig.s) if hasattr(sig, "r") else (sig[0], sig[1])
+    if s > _N // 2: s = _N - s   # BIP62 low-s
+    return _der(r, s)
+
+def ecdsa_verify_der(digest: bytes, der: bytes, pub: bytes) -> bool:
+    """DER signature (no sighash byte) over a 32-byte digest, low-s enforced by btclib."""
+    try:
+        return bool(dsa_verify_(digest, pub, der))
+    except Exception:
+        return False
+
+_WORKER_KEYS = {}
+
+def _init_worker(keys: dict):
+    global _WORKER_KEYS
+    _WORKER_KEYS = dict(keys)
+
+def _sign_job(job):
+    index, digest, key_id = job
+    t0 = time.perf_counter()
+    der = ecdsa_sign_der(digest, _WORKER_KEYS[key_id])
+    return index, der + bytes([SIGHASH_ALL]), (time.perf_counter() - t0) * 1000
+
+# ---------------- transaction ----------------
+def _outpoint(txid_be_hex: str, vout: int) -> bytes:
+    """Exactly 64 hex chars; _bytes_from_hex would pad an odd-length typo into a valid-looking id."""
     try:
-        return PSBT(tx, network=network)
-    except TypeError:
-        return PSBT(tx)
+        txid = bytes.fromhex((txid_be_hex or "").strip())
+    except ValueError:
+        txid = b""
+    if len(txid) != 32:
+        raise ValueError(f"TXID must be 32 bytes (64 hex chars): {txid_be_hex!r}")
+    if not 0 <= int(vout) <= 0xFFFFFFFF:
+        raise ValueError(f"vout out of range: {vout}")
+    return txid[::-1] + struct.pack("<I", int(vout))
+
+class _Input:
+    __slots__ = ("outpoint", "amount", "sequence", "spk", "key_id")
+
+class Bip143Midstate:
+    """
+    BIP143 (SIGHASH_ALL) shared hashes for one transaction, hashed once; each
+    input's digest resumes from a copy of sha256(version||hashPrevouts||hashSequence).
+    """
+    def __init__(self, version: int, hash_prevouts: bytes, hash_sequence: bytes, hash_outputs: bytes,
+                 locktime: int, sighash: int = SIGHASH_ALL):
+        self._prefix = hashlib.sha256(struct.pack("<I", version) + hash_prevouts + hash_sequence)
+        self._suffix = hash_outputs + struct.pack("<I", locktime) + struct.pack("<I", sighash)
+
+    def p2wpkh_digest(self, outpoint: bytes, spk: bytes, amount: int, sequence: int) -> bytes:
+        script_code = b"\x19\x76\xa9\x14" + spk[2:22] + b"\x88\xac"
+        h = self._prefix.copy()
+        h.update(outpoint + script_code + struct.pack("<Q", amount) + struct.pack("<I", sequence) + self._suffix)
+        return hashlib.sha256(h.digest()).digest()
+
+def sign_p2wpkh(
+    inputs: list,
+    outputs: list,
+    privkeys,
+    *,
+    network: str = "mainnet",
+    version: int = 2,
+    locktime: int = 0,
+    workers: int | None = None,
+) -> dict:
+    """
+    inputs:   [{"txid": big-endian hex, "vout", "amount_sats", "address", "sequence"?}, ...]
+    outputs:  [{"address", "amount_sats"}, ...]
+    privkeys: one key (WIF or hex) for every input, or {address: key}
+    Returns {"hex", "txid", "fee_sats", "vsize", "shared_ms",
+             "inputs": [{"index", "sighash_ms", "sign_ms"}, ...]}
+    """
+    if not inputs: raise ValueError("No inputs")
+    if not outputs: raise ValueError("No outputs")
+    t0 = time.perf_counter()
+
+    keys = {}; pubs = {}; ins = []
+    for n, u in enumerate(inputs):
+        i = _Input()
+        i.outpoint = _outpoint(u["txid"], u["vout"])
+        i.amount = int(u["amount_sats"])
+        i.sequence = int(u.get("sequence", SEQUENCE_FINAL))
+        if i.amount <= 0: raise ValueError(f"Input {n}: amount_sats must be > 0")
+        i.spk = address_to_script_pubkey(u["address"], network)
+        if len(i.spk) != 22 or i.spk[:2] != b"\x00\x14":
+            raise ValueError(f"Input {n}: {u['address']} is not P2WPKH")
+        i.key_id = i.spk[2:]
+        if i.key_id not in keys:
+            pk = privkeys if isinstance(privkeys, str) else privkeys.get(u["address"])
+            if not pk: raise KeyError(f"Input {n}: no key for {u['address']}")
+            prv = privkey_bytes(pk); pub = pubkey_from_privkey(prv)
+            if p2wpkh_script_pubkey(pub) != i.spk:
+                raise ValueError(f"Input {n}: key does not own {u['address']}")
+            keys[i.key_id] = prv; pubs[i.key_id] = pub
+        ins.append(i)
+
+    outs = []
+    for n, o in enumerate(outputs):
+        amt = int(o["amount_sats"])
+        if amt <= 0: raise ValueError(f"Output {n}: amount_sats must be > 0")
+        spk = address_to_script_pubkey(o["address"], network)
+        outs.append(struct.pack("<Q", amt) + _varint(len(spk)) + spk)
+    fee = sum(i.amount for i in ins) - sum(int(o["amount_sats"]) for o in outputs)
+    if fee < 0: raise ValueError("Insufficient funds")
+    outputs_ser = b"".join(outs)
+
+    mid = Bip143Midstate(
+        version,
+        _sha256d(b"".join(i.outpoint for i in ins)),
+        _sha256d(b"".join(struct.pack("<I", i.sequence) for i in ins)),
+        _sha256d(outputs_ser),
+        locktime,
+    )
+    shared_ms = (time.perf_counter() - t0) * 1000
+
+    jobs = []; timing = []
+    for n, i in enumerate(ins):
+        t1 = time.perf_counter()
+        jobs.append((n, mid.p2wpkh_digest(i.outpoint, i.spk, i.amount, i.sequence), i.key_id))
+        timing.append({"index": n, "sighash_ms": (time.perf_counter() - t1) * 1000, "sign_ms": 0.0})
+
+    sigs = [None] * len(ins)
+    if workers and workers > 1 and len(jobs) >= 2 * workers:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(keys,)) as ex:
+            results = list(ex.map(_sign_job, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+    else:
+        _init_worker(keys)
+        try:
+            results = [_sign_job(j) for j in jobs]
+        finally:
+            _init_worker({})
+    for n, sig, ms in results:
+        sigs[n] = sig; timing[n]["sign_ms"] = ms
+
+    ver = struct.pack("<I", version); lock = struct.pack("<I", locktime)
+    body_in = _varint(len(ins)) + b"".join(i.outpoint + b"\x00" + struct.pack("<I", i.sequence) for i in ins)
+    body_out = _varint(len(outs)) + outputs_ser
+    witness = b"".join(
+        b"\x02" + _varint(len(sigs[n])) + sigs[n] + b"\x21" + pubs[i.key_id] for n, i in enumerate(ins)
+    )
+    stripped = ver + body_in + body_out + lock
+    raw = ver + b"\x00\x01" + body_in + body_out + witness + lock
+    weight = 3 * len(stripped) + len(raw)
+    return {
+        "hex": raw.hex(),
+        "txid": _sha256d(stripped)[::-1].hex(),
+        "fee_sats": fee,
+        "vsize": (weight + 3) // 4,
+        "shared_ms": shared_ms,
+        "inputs": timing,
+    }
 
 def sign_p2wpkh_single_input(
     *,
@@ -73,43 +371,13 @@ def sign_p2wpkh_single_input(
     change_address: str | None = None,
     network: str = "mainnet",
 ) -> str:
+    """One UTXO -> recipient (+ change). privkey_hex may also be WIF."""
     if send_amount_sats <= 0: raise ValueError("send_amount_sats must be > 0")
-    if utxo_amount_sats <= 0: raise ValueError("utxo_amount_sats must be > 0")
     if fee_sats < 0: raise ValueError("fee_sats must be >= 0")
-
     change_sats = utxo_amount_sats - send_amount_sats - fee_sats
     if change_sats < 0: raise ValueError("Insufficient funds")
-
-    # Build tx (little-endian txid inside the transaction)
-    prev_txid_le = _bytes_from_hex(utxo_txid_be_hex)[::-1]
-    txin = TxIn(OutPoint(prev_txid_le, int(utxo_vout)), b"", 0xFFFFFFFF)
-
-    outs = [TxOut(int(send_amount_sats), addr_to_scriptpubkey(recipient_address, network))]
+    outs = [{"address": recipient_address, "amount_sats": send_amount_sats}]
     if change_sats > 0:
-        outs.append(TxOut(int(change_sats), addr_to_scriptpubkey(change_address or utxo_address, network)))
-
-    tx = Tx(2, [txin], outs, 0)
-
-    # PSBT + witness UTXO
-    psbt = _make_psbt_from_tx(tx, network)
-    psbt.inputs[0].witness_utxo = TxOut(int(utxo_amount_sats), addr_to_scriptpubkey(utxo_address, network))
-
-    # Keys
-    prv = prvkey_from_prvkeyhex(privkey_hex)
-    pub = pubkey_from_prvkey(prv, compressed=True)
-
-    # Sign input 0 (SIGHASH_ALL)
-    try:
-        sign_psbtin(psbt, 0, prv, pub, sighash_flag=1)
-    except TypeError:
-        sign_psbtin(psbt, 0, prv, pub, 1)
-
-    # Finalize & extract raw hex
-    if hasattr(psbt, "finalize"): psbt.finalize()
-    elif hasattr(psbt, "finalize_psbt"): psbt.finalize_psbt()
-    elif hasattr(psbt, "finalize_input"): psbt.finalize_input(0)
-
-    tx_out = getattr(psbt, "tx", None) or (psbt.to_tx() if hasattr(psbt, "to_tx") else None)
-    if tx_out is None:
-        raise RuntimeError("btclib PSBT: cannot extract final transaction")
-    return tx_out.serialize().hex()
+        outs.append({"address": change_address or utxo_address, "amount_sats": change_sats})
+    utxo = {"txid": utxo_txid_be_hex, "vout": utxo_vout, "amount_sats": utxo_amount_sats, "address": utxo_address}
+    return sign_p2wpkh([utxo], outs, privkey_hex, network=network)["hex"]
@@ -123,6 +123,13 @@ if __name__ == "__main__":
     # 1. Perform the offline signing step
     raw_tx_hex_data = sign_offline_transaction()
     
-    # 2. Test online by broadcasting the result
+    # 2. Check offline first (decode + recover signer), then test online
     if raw_tx_hex_data:
-        broadcast_online_transaction(raw_tx_hex_data)
\ No newline at end of file
+        from crypto.tx_verify import verify_signed
+        sender, _ = load_eth_credentials(WALLET_FILE)
+        report = verify_signed(raw_tx_hex_data, expected_signer=sender)
+        print(f"Offline verify: {'OK' if report['ok'] else report['problems']} (signer {report['signer']})")
+        if report["ok"]:
+            broadcast_online_transaction(raw_tx_hex_data)
+        else:
+            print("🛑 Not broadcasting: offline verification failed.")
\ No newline at end of file
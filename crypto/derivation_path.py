@@ -0,0 +1,66 @@
+# derivation_path.py
+# BIP32 path templates such as "m/44'/60'/{account}'/0/{index}" are parsed once
+# into a tuple of (index-or-placeholder, hardened) steps and cached; binding the
+# placeholders yields raw child indexes ready for Bip32 ChildKey().
+from functools import lru_cache
+
+HARDENED = 0x80000000
+PLACEHOLDERS = ("account", "change", "index")
+
+class PathError(ValueError):
+    pass
+
+@lru_cache(maxsize=256)
+def compile_path(template: str) -> tuple:
+    """
+    "m/44'/60'/{account}'/0/{index}" ->
+      ((44, True), (60, True), ("account", True), (0, False), ("index", False))
+    Hardened markers: ' h H.  Raises PathError on malformed input.
+    """
+    t = (template or "").strip().replace(" ", "")
+    if not t:
+        raise PathError("Empty derivation path")
+    parts = t.split("/")
+    if parts[0] in ("m", "M"):
+        parts = parts[1:]
+    steps = []
+    for p in parts:
+        if not p:
+            raise PathError(f"Empty step in path: {template!r}")
+        hardened = p[-1] in "'hH"
+        body = p[:-1] if hardened else p
+        if body.startswith("{") and body.endswith("}"):
+            name = body[1:-1]
+            if name not in PLACEHOLDERS:
+                raise PathError(f"Unknown placeholder {{{name}}} in {template!r}")
+            steps.append((name, hardened))
+            continue
+        try:
+            v = int(body)
+        except ValueError:
+            raise PathError(f"Bad step {p!r} in {template!r}") from None
+        if v < 0 or v >= HARDENED:
+            raise PathError(f"Step out of range {p!r} in {template!r}")
+        steps.append((v, hardened))
+    return tuple(steps)
+
+def bind(compiled: tuple, account: int = 0, change: int = 0, index: int = 0) -> tuple:
+    """Resolve placeholders; returns raw child indexes (hardened bit applied)."""
+    values = {"account": account, "change": change, "index": index}
+    out = []
+    for v, hardened in compiled:
+        if isinstance(v, str):
+            v = int(values[v])
+        out.append(v | HARDENED if hardened else v)
+    return tuple(out)
+
+def split_account(compiled: tuple):
+    """(hardened prefix, non-hardened tail) — the prefix is what gets cached per seed."""
+    cut = 0
+    for i, (_, hardened) in enumerate(compiled):
+        if hardened: cut = i + 1
+    return compiled[:cut], compiled[cut:]
+
+def to_str(steps: tuple) -> str:
+    """Raw child indexes back to "m/84'/0'/0'/0/5"."""
+    return "m" + "".join(f"/{i & ~HARDENED}'" if i & HARDENED else f"/{i}" for i in steps)
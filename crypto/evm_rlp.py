@@ -0,0 +1,88 @@
+# evm_rlp.py
+# Minimal RLP for EVM transactions. Items are encoded once and concatenated, so
+# a list whose fields mostly stay the same can be re-framed cheaply:
+#   payload = head + encode_int(gas_price) + tail ; raw = encode_list_payload(payload)
+
+def _length_prefix(n: int, offset: int) -> bytes:
+    if n < 56:
+        return bytes([offset + n])
+    ln = n.to_bytes((n.bit_length() + 7) // 8, "big")
+    return bytes([offset + 55 + len(ln)]) + ln
+
+def encode_bytes(b: bytes) -> bytes:
+    b = bytes(b)
+    if len(b) == 1 and b[0] < 0x80:
+        return b
+    return _length_prefix(len(b), 0x80) + b
+
+def encode_int(v: int) -> bytes:
+    v = int(v)
+    if v < 0: raise ValueError("RLP integers must be >= 0")
+    return encode_bytes(v.to_bytes((v.bit_length() + 7) // 8, "big") if v else b"")
+
+def encode_list_payload(payload: bytes) -> bytes:
+    """Frame already-encoded items as a list."""
+    return _length_prefix(len(payload), 0xC0) + payload
+
+def encode(obj) -> bytes:
+    """int | bytes | list/tuple (nested) -> RLP."""
+    if isinstance(obj, (list, tuple)):
+        return encode_list_payload(b"".join(encode(o) for o in obj))
+    if isinstance(obj, int):
+        return encode_int(obj)
+    return encode_bytes(obj)
+
+def hex_bytes(v) -> bytes:
+    """'0x…' / bytes / None -> bytes ('' and None are empty)."""
+    if v is None: return b""
+    if isinstance(v, (bytes, bytearray)): return bytes(v)
+    h = str(v)
+    h = h[2:] if h.lower().startswith("0x") else h
+    if len(h) % 2: h = "0" + h
+    return bytes.fromhex(h)
+
+def access_list_items(access_list) -> list:
+    """[{"address", "storageKeys"}] -> [[address bytes, [key bytes, ...]], ...]"""
+    return [[hex_bytes(e["address"]), [hex_bytes(k) for k in e.get("storageKeys", [])]]
+            for e in (access_list or [])]
+
+def _decode_at(b: bytes, i: int):
+    """(item, next offset); items are bytes or lists. Rejects non-canonical lengths."""
+    p = b[i]
+    if p < 0x80:
+        return b[i:i + 1], i + 1
+    if p < 0xC0:
+        short = p < 0xB8
+        if short:
+            n, start = p - 0x80, i + 1
+        else:
+            ll = p - 0xB7
+            n = int.from_bytes(b[i + 1:i + 1 + ll], "big"); start = i + 1 + ll
+            if n < 56 or b[i + 1] == 0: raise ValueError("Non-canonical RLP length")
+        end = start + n
+        if end > len(b): raise ValueError("Truncated RLP")
+        if n == 1 and short and b[start] < 0x80: raise ValueError("Non-canonical RLP byte")
+        return b[start:end], end
+    if p < 0xF8:
+        n, start = p - 0xC0, i + 1
+    else:
+        ll = p - 0xF7
+        n = int.from_bytes(b[i + 1:i + 1 + ll], "big"); start = i + 1 + ll
+        if n < 56 or b[i + 1] == 0: raise ValueError("Non-canonical RLP length")
+    end = start + n
+    if end > len(b): raise ValueError("Truncated RLP")
+    out, j = [], start
+    while j < end:
+        item, j = _decode_at(b, j)
+        out.append(item)
+    if j != end: raise ValueError("RLP list overrun")
+    return out, end
+
+def decode(b: bytes):
+    item, end = _decode_at(bytes(b), 0)
+    if end != len(b): raise ValueError("Trailing bytes after RLP item")
+    return item
+
+def to_int(b: bytes) -> int:
+    if b[:1] == b"\x00": raise ValueError("RLP integer with leading zero")
+    return int.from_bytes(b, "big")
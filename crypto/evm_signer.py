@@ -1,5 +1,10 @@
 # evm_signer.py
-from web3 import Web3
+# Offline EVM signing on eth_account only (no web3 import). An EvmSigner parses the
+# private key once and is meant to be kept per account (see UnlockedSession.signer).
+from eth_account import Account
+
+_INT_FIELDS = ("nonce", "value", "gas", "gasPrice", "maxFeePerGas", "maxPriorityFeePerGas", "chainId", "type")
+_TX_FIELDS = _INT_FIELDS + ("to", "data", "accessList")
 
 def _to_0x_hex(v) -> str:
     """Normalize any bytes/HexBytes/str into a 0x-prefixed hex string."""
@@ -13,6 +18,80 @@ def _to_0x_hex(v) -> str:
         s = str(v)
         return s if s.startswith("0x") else ("0x" + s)
 
+def _int(v) -> int:
+    return int(v, 16) if isinstance(v, str) and v.lower().startswith("0x") else int(v)
+
+def _raw(signed):
+    # eth_account >= 0.13 renamed rawTransaction -> raw_transaction
+    raw = getattr(signed, "raw_transaction", None)
+    return raw if raw is not None else signed.rawTransaction
+
+def normalize_tx(tx: dict) -> dict:
+    """
+    unsigned_tx.json-style dict -> eth_account tx dict.
+    Ints may be given as decimal or 0x-hex; the type is inferred when absent:
+    maxFeePerGas -> 2 (EIP-1559), accessList + gasPrice -> 1 (EIP-2930), else legacy.
+    """
+    t = {k: tx[k] for k in _TX_FIELDS if tx.get(k) is not None}
+    for k in _INT_FIELDS:
+        if k in t: t[k] = _int(t[k])
+    t["data"] = t.get("data") or "0x"
+    if "type" not in t:
+        if "maxFeePerGas" in t: t["type"] = 2
+        elif "accessList" in t: t["type"] = 1
+    if t.get("type") == 2:
+        t.pop("gasPrice", None)
+        t.setdefault("accessList", [])
+    elif t.get("type") == 1:
+        t.setdefault("accessList", [])
+    if not t.get("type"):
+        t.pop("type", None)
+    return t
+
+class EvmSigner:
+    """
+    signer = EvmSigner(privkey_hex)        # key parsed once
+    signer.sign(tx_dict) -> "0x..." raw tx  (legacy, EIP-2930 or EIP-1559)
+    """
+    __slots__ = ("_acct", "_pk")
+
+    def __init__(self, privkey_hex: str):
+        h = privkey_hex[2:] if privkey_hex.startswith("0x") else privkey_hex
+        self._acct = Account.from_key(bytes.fromhex(h))
+        self._pk = None
+
+    @property
+    def address(self) -> str:
+        return self._acct.address
+
+    def sign_hash(self, msg_hash: bytes):
+        """Raw secp256k1 signature over a 32-byte hash -> (recovery id 0/1, r, s), low-s."""
+        if self._pk is None:
+            from eth_keys import keys
+            self._pk = keys.PrivateKey(bytes(self._acct.key))
+        sig = self._pk.sign_msg_hash(msg_hash)
+        return sig.v, sig.r, sig.s
+
+    def sign(self, tx: dict) -> str:
+        return _to_0x_hex(_raw(self._acct.sign_transaction(normalize_tx(tx))))
+
+    def sign_legacy(self, to_addr, value_wei, nonce, gas_limit, gas_price_wei, chain_id, data_bytes=b"") -> str:
+        return self.sign({"nonce": nonce, "to": to_addr, "value": value_wei, "gas": gas_limit,
+                          "gasPrice": gas_price_wei, "chainId": chain_id, "data": data_bytes or "0x"})
+
+    def sign_eip2930(self, to_addr, value_wei, nonce, gas_limit, gas_price_wei, chain_id,
+                     access_list=(), data_bytes=b"") -> str:
+        return self.sign({"type": 1, "nonce": nonce, "to": to_addr, "value": value_wei, "gas": gas_limit,
+                          "gasPrice": gas_price_wei, "chainId": chain_id,
+                          "accessList": list(access_list), "data": data_bytes or "0x"})
+
+    def sign_eip1559(self, to_addr, value_wei, nonce, gas_limit, max_fee_per_gas_wei,
+                     max_priority_fee_per_gas_wei, chain_id, data_bytes=b"", access_list=()) -> str:
+        return self.sign({"type": 2, "nonce": nonce, "to": to_addr, "value": value_wei, "gas": gas_limit,
+                          "maxFeePerGas": max_fee_per_gas_wei,
+                          "maxPriorityFeePerGas": max_priority_fee_per_gas_wei,
+                          "chainId": chain_id, "accessList": list(access_list), "data": data_bytes or "0x"})
+
 def sign_legacy_tx(
     privkey_hex: str,
     to_addr: str,
@@ -25,20 +104,9 @@ def sign_legacy_tx(
 ) -> str:
     """
     Sign a legacy EVM tx and return raw tx hex (0x...).
+    One-shot helper; keep an EvmSigner when signing more than once.
     """
-    tx = {
-        "nonce": int(nonce),
-        "to": to_addr,
-        "value": int(value_wei),
-        "gas": int(gas_limit),
-        "gasPrice": int(gas_price_wei),
-        "chainId": int(chain_id),
-        # Ensure bytes here; your unsigned JSON should use "0x"
-        "data": data_bytes or b"",
-    }
-    w3 = Web3()  # offline signing is fine
-    signed = w3.eth.account.sign_transaction(tx, bytes.fromhex(privkey_hex))
-    return _to_0x_hex(signed.raw_transaction)
+    return EvmSigner(privkey_hex).sign_legacy(to_addr, value_wei, nonce, gas_limit, gas_price_wei, chain_id, data_bytes)
 
 def sign_eip1559_tx(
     privkey_hex: str,
@@ -53,18 +121,8 @@ def sign_eip1559_tx(
 ) -> str:
     """
     Sign an EIP-1559 tx and return raw tx hex (0x...).
+    One-shot helper; keep an EvmSigner when signing more than once.
     """
-    tx = {
-        "type": 2,
-        "nonce": int(nonce),
-        "to": to_addr,
-        "value": int(value_wei),
-        "gas": int(gas_limit),
-        "maxFeePerGas": int(max_fee_per_gas_wei),
-        "maxPriorityFeePerGas": int(max_priority_fee_per_gas_wei),
-        "chainId": int(chain_id),
-        "data": data_bytes or b"",
-    }
-    w3 = Web3()
-    signed = w3.eth.account.sign_transaction(tx, bytes.fromhex(privkey_hex))
-    return _to_0x_hex(signed.rawTransaction)
+    return EvmSigner(privkey_hex).sign_eip1559(
+        to_addr, value_wei, nonce, gas_limit, max_fee_per_gas_wei, max_priority_fee_per_gas_wei, chain_id, data_bytes
+    )
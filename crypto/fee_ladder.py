@@ -0,0 +1,87 @@
+# fee_ladder.py
+# Pre-sign one EVM transfer (same nonce/to/value/data) at a ladder of fee tiers so
+# the online side can re-broadcast a higher tier without another air-gap trip.
+# The RLP of every field except the fee fields is encoded once; each tier only
+# encodes its fee integers, hashes and signs with the signer's cached key.
+from eth_utils import keccak
+from crypto.evm_rlp import encode, encode_int, encode_list_payload, hex_bytes, access_list_items
+from crypto.evm_signer import EvmSigner, normalize_tx
+
+MIN_BUMP = 1.10          # geth/erigon reject replacements below +10%
+BUNDLE_KIND = "evm-fee-ladder"
+
+def gwei(x) -> int:
+    return int(round(float(x) * 1_000_000_000))
+
+def legacy_tiers(base_gas_price_wei: int, count: int = 5, bump: float = 1.25) -> list:
+    """[{"gasPrice"}, ...] rising geometrically from base."""
+    if bump < MIN_BUMP: raise ValueError(f"bump must be >= {MIN_BUMP} to replace a pending tx")
+    out, gp = [], int(base_gas_price_wei)
+    for _ in range(int(count)):
+        out.append({"gasPrice": gp}); gp = int(gp * bump) + 1
+    return out
+
+def eip1559_tiers(base_max_fee_wei: int, base_priority_wei: int, count: int = 5, bump: float = 1.25) -> list:
+    """[{"maxFeePerGas", "maxPriorityFeePerGas"}, ...]; both fields bump together (replacement rule)."""
+    if bump < MIN_BUMP: raise ValueError(f"bump must be >= {MIN_BUMP} to replace a pending tx")
+    out, mf, mp = [], int(base_max_fee_wei), int(base_priority_wei)
+    for _ in range(int(count)):
+        out.append({"maxFeePerGas": max(mf, mp), "maxPriorityFeePerGas": mp})
+        mf = int(mf * bump) + 1; mp = int(mp * bump) + 1
+    return out
+
+class _Frame:
+    """Pre-encoded RLP around the fee fields of one tx type."""
+    def __init__(self, t: dict):
+        self.type = int(t.get("type") or 0)
+        to = hex_bytes(t.get("to")); data = hex_bytes(t.get("data"))
+        chain_id = int(t["chainId"])
+        body = encode_int(t["gas"]) + encode(to) + encode_int(t["value"]) + encode(data)
+        if self.type == 0:
+            self.head = encode_int(t["nonce"])
+            self.tail = body
+            self.sig_tail = encode_int(chain_id) + encode_int(0) + encode_int(0)   # EIP-155
+            self.v_base = chain_id * 2 + 35
+        else:
+            self.head = encode_int(chain_id) + encode_int(t["nonce"])
+            self.tail = body + encode(access_list_items(t.get("accessList")))
+            self.sig_tail = b""
+            self.v_base = 0
+        self.prefix = bytes([self.type]) if self.type else b""
+
+    def fee_items(self, tier: dict) -> bytes:
+        if self.type == 2:
+            return encode_int(tier["maxPriorityFeePerGas"]) + encode_int(tier["maxFeePerGas"])
+        return encode_int(tier["gasPrice"])
+
+    def sign(self, signer: EvmSigner, tier: dict) -> bytes:
+        fields = self.head + self.fee_items(tier) + self.tail
+        msg = self.prefix + encode_list_payload(fields + self.sig_tail)
+        v, r, s = signer.sign_hash(keccak(msg))
+        return self.prefix + encode_list_payload(fields + encode_int(self.v_base + v) + encode_int(r) + encode_int(s))
+
+def sign_ladder(signer: EvmSigner, tx: dict, tiers: list) -> list:
+    """
+    tx: unsigned_tx.json-style dict (fee fields ignored); tiers from legacy_tiers/eip1559_tiers.
+    Returns [{"tier", <fee fields>, "raw", "hash"}, ...] in ascending fee order.
+    """
+    t = normalize_tx({**tx, **tiers[0]})
+    frame = _Frame(t)
+    want = ("maxFeePerGas", "maxPriorityFeePerGas") if frame.type == 2 else ("gasPrice",)
+    out = []
+    for i, tier in enumerate(tiers):
+        if any(k not in tier for k in want):
+            raise ValueError(f"Tier {i} needs {', '.join(want)}")
+        raw = frame.sign(signer, tier)
+        out.append({"tier": i, **{k: int(tier[k]) for k in want},
+                    "raw": "0x" + raw.hex(), "hash": "0x" + keccak(raw).hex()})
+    return out
+
+def make_bundle(signer: EvmSigner, tx: dict, tiers: list) -> dict:
+    t = normalize_tx({**tx, **tiers[0]})
+    return {
+        "kind": BUNDLE_KIND, "version": 1,
+        "from": signer.address, "to": t.get("to"), "value": t["value"], "nonce": t["nonce"],
+        "gas": t["gas"], "chainId": t["chainId"], "type": int(t.get("type") or 0),
+        "tiers": sign_ladder(signer, tx, tiers),
+    }
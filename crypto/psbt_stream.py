@@ -0,0 +1,403 @@
+# psbt_stream.py
+# Streaming BIP174 (PSBT v0) signer for P2WPKH inputs. The PSBT is never loaded
+# as a whole: pass 1 walks the global unsigned tx and feeds the BIP143 shared
+# hashes; pass 2 walks the input maps one at a time, signs the inputs whose
+# scriptPubKey is ours and copies every key/value straight to the output.
+# Base64 text is decoded into a SpooledTemporaryFile, so memory stays bounded.
+import base64, hashlib, io, os, struct, tempfile
+from pathlib import Path
+from crypto.btc_signer import (
+    SIGHASH_ALL, Bip143Midstate, address_to_script_pubkey, ecdsa_sign_der, ecdsa_verify_der,
+    p2wpkh_script_pubkey, privkey_bytes, pubkey_from_privkey, script_pubkey_to_address,
+)
+
+MAGIC = b"psbt\xff"
+B64_PREFIX = "cHNidP"          # base64 of the magic
+SPOOL_MAX = 1 << 20            # keep up to 1 MiB in RAM, spill to disk beyond
+_CHUNK = 1 << 16
+
+# key types (BIP174)
+GLOBAL_UNSIGNED_TX = 0x00
+IN_NON_WITNESS_UTXO = 0x00
+IN_WITNESS_UTXO = 0x01
+IN_PARTIAL_SIG = 0x02
+IN_SIGHASH_TYPE = 0x03
+IN_FINAL_SCRIPTSIG = 0x07
+IN_FINAL_SCRIPTWITNESS = 0x08
+
+class PsbtError(ValueError):
+    pass
+
+# ---------------- low-level stream helpers ----------------
+def _read(f, n: int) -> bytes:
+    b = f.read(n)
+    if len(b) != n: raise PsbtError("Truncated PSBT")
+    return b
+
+def _read_varint(f) -> int:
+    b = _read(f, 1)[0]
+    if b < 0xFD: return b
+    return int.from_bytes(_read(f, {0xFD: 2, 0xFE: 4, 0xFF: 8}[b]), "little")
+
+def _varint(n: int) -> bytes:
+    if n < 0xFD: return bytes([n])
+    if n <= 0xFFFF: return b"\xfd" + struct.pack("<H", n)
+    if n <= 0xFFFFFFFF: return b"\xfe" + struct.pack("<I", n)
+    return b"\xff" + struct.pack("<Q", n)
+
+def _iter_map(f):
+    """Yield (key, value_offset, value_len) up to the 0x00 separator; values are not read."""
+    while True:
+        klen = _read_varint(f)
+        if klen == 0: return
+        key = _read(f, klen)
+        vlen = _read_varint(f); off = f.tell()
+        yield key, off, vlen
+        f.seek(off + vlen)
+
+def _value(f, off: int, n: int) -> bytes:
+    f.seek(off); return _read(f, n)
+
+def _feed(f, off: int, n: int, *sinks):
+    """Stream f[off:off+n] into hashers (update) and/or binary writers (write)."""
+    f.seek(off)
+    while n > 0:
+        b = _read(f, min(n, _CHUNK)); n -= len(b)
+        for s in sinks:
+            (s.update if hasattr(s, "update") else s.write)(b)
+
+def _write_kv(dst, key: bytes, value: bytes):
+    dst.write(_varint(len(key)) + key + _varint(len(value)) + value)
+
+# ---------------- input: file / text / bytes -> seekable binary ----------------
+def _spool():
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX, mode="w+b")
+
+def _b64_decode_stream(chunks, dst):
+    rest = b""
+    for c in chunks:
+        c = rest + b"".join(c.split())
+        cut = len(c) - len(c) % 4
+        dst.write(base64.b64decode(c[:cut], validate=True)); rest = c[cut:]
+    if rest.strip():
+        dst.write(base64.b64decode(rest, validate=True))
+
+def open_psbt(source):
+    """
+    source: path, bytes, or base64 text (e.g. from a QR scan).
+    Returns a seekable binary stream positioned at 0; binary files are used in place.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        if bytes(source[:5]) == MAGIC:
+            return io.BytesIO(source)
+        source = bytes(source).decode("ascii", "strict")
+    if isinstance(source, str) and source.lstrip().startswith(B64_PREFIX):
+        out = _spool(); text = source.encode("ascii")
+        _b64_decode_stream((text[i:i + _CHUNK] for i in range(0, len(text), _CHUNK)), out)
+        out.seek(0); return out
+    f = open(Path(source), "rb")
+    head = f.read(len(MAGIC)); f.seek(0)
+    if head == MAGIC:
+        return f
+    with f:
+        out = _spool()
+        try:
+            _b64_decode_stream(iter(lambda: f.read(_CHUNK), b""), out)
+        except Exception as e:
+            raise PsbtError(f"Not a PSBT (binary or base64): {e}") from None
+    out.seek(0); return out
+
+def write_base64(src, dst_text):
+    """Binary stream -> base64 text stream, in 3-byte aligned chunks."""
+    src.seek(0)
+    for b in iter(lambda: src.read(3 * _CHUNK), b""):
+        dst_text.write(base64.b64encode(b).decode("ascii"))
+
+# ---------------- pass 1: global map / unsigned tx ----------------
+class _Layout:
+    """Offsets and BIP143 hashes gathered in pass 1 (no per-input state)."""
+    __slots__ = ("tx_off", "tx_len", "ins_off", "n_in", "n_out", "version", "locktime",
+                 "midstate", "txid", "out_sats", "preview", "maps_off")
+
+def _scan(f, preview: int = 4) -> _Layout:
+    f.seek(0)
+    if f.read(len(MAGIC)) != MAGIC: raise PsbtError("Missing PSBT magic")
+    L = _Layout(); L.tx_off = None
+    for key, off, vlen in _iter_map(f):
+        if key == bytes([GLOBAL_UNSIGNED_TX]):
+            L.tx_off, L.tx_len = off, vlen
+    if L.tx_off is None: raise PsbtError("No unsigned tx in global map (PSBT v2 is not supported)")
+    L.maps_off = f.tell()
+
+    f.seek(L.tx_off)
+    L.version = struct.unpack("<I", _read(f, 4))[0]
+    L.n_in = _read_varint(f)
+    if L.n_in == 0: raise PsbtError("Unsigned tx has witness marker or no inputs")
+    L.ins_off = f.tell()
+    hp = hashlib.sha256(); hs = hashlib.sha256()
+    for _ in range(L.n_in):
+        hp.update(_read(f, 36))
+        if _read_varint(f) != 0: raise PsbtError("Unsigned tx input has a scriptSig")
+        hs.update(_read(f, 4))
+    L.n_out = _read_varint(f)
+    outs_off = f.tell(); L.out_sats = 0; L.preview = []
+    for _ in range(L.n_out):
+        amount = struct.unpack("<Q", _read(f, 8))[0]
+        spk = _read(f, _read_varint(f))
+        L.out_sats += amount
+        if len(L.preview) < preview: L.preview.append((amount, spk))
+    outs_len = f.tell() - outs_off
+    L.locktime = struct.unpack("<I", _read(f, 4))[0]
+    if f.tell() != L.tx_off + L.tx_len: raise PsbtError("Trailing bytes after unsigned tx")
+
+    ho = hashlib.sha256(); _feed(f, outs_off, outs_len, ho)
+    L.midstate = Bip143Midstate(
+        L.version, hashlib.sha256(hp.digest()).digest(), hashlib.sha256(hs.digest()).digest(),
+        hashlib.sha256(ho.digest()).digest(), L.locktime,
+    )
+    ht = hashlib.sha256(); _feed(f, L.tx_off, L.tx_len, ht)
+    L.txid = hashlib.sha256(ht.digest()).digest()[::-1].hex()
+    return L
+
+def _prev_output(f, off: int, n: int, vout: int, prev_txid: bytes):
+    """(amount, spk) of output `vout` in a serialized previous tx; checks its txid."""
+    f.seek(off)
+    ver = _read(f, 4); cnt = _read_varint(f); segwit = cnt == 0
+    if segwit:
+        _read(f, 1); cnt = _read_varint(f)
+    body_off = f.tell() - len(_varint(cnt))
+    for _ in range(cnt):
+        _read(f, 36); f.seek(_read_varint(f), 1); _read(f, 4)
+    found = None
+    for i in range(_read_varint(f)):
+        amount = struct.unpack("<Q", _read(f, 8))[0]; spk = _read(f, _read_varint(f))
+        if i == vout: found = (amount, spk)
+    body_end = f.tell()
+    h = hashlib.sha256(ver)
+    _feed(f, body_off, body_end - body_off, h)
+    _feed(f, off + n - 4, 4, h)
+    if hashlib.sha256(h.digest()).digest() != prev_txid:
+        raise PsbtError("non_witness_utxo does not match the spent outpoint")
+    if found is None: raise PsbtError("non_witness_utxo has no such output")
+    return found
+
+def _spent_output(f, entries, outpoint: bytes):
+    """
+    (amount, spk, verified) spent by one input, or None without utxo data.
+    A non_witness_utxo is hashed against the outpoint txid and wins; a witness_utxo
+    that disagrees with it is rejected (segwit fee-lying). A witness_utxo alone is
+    taken as given, so verified is False.
+    """
+    wit = full = None
+    for key, off, vlen in entries:
+        if key[0] == IN_WITNESS_UTXO and wit is None:
+            v = _value(f, off, vlen); s = io.BytesIO(v[8:])
+            wit = (struct.unpack("<Q", v[:8])[0], _read(s, _read_varint(s)))
+        elif key[0] == IN_NON_WITNESS_UTXO and full is None:
+            full = _prev_output(f, off, vlen, struct.unpack("<I", outpoint[32:])[0], outpoint[:32])
+    if full is not None:
+        if wit is not None and wit != full:
+            raise PsbtError("witness_utxo disagrees with non_witness_utxo (amount or script)")
+        return full[0], full[1], True
+    return (wit[0], wit[1], False) if wit is not None else None
+
+# ---------------- keys ----------------
+def _owned_keys(privkeys, network: str) -> dict:
+    """privkeys: one key (WIF/hex) or {address: key} -> {p2wpkh spk: (prv, pub)}"""
+    owned = {}
+    items = [(None, privkeys)] if isinstance(privkeys, str) else list((privkeys or {}).items())
+    for addr, pk in items:
+        if not pk: continue
+        prv = privkey_bytes(pk); pub = pubkey_from_privkey(prv)
+        spk = p2wpkh_script_pubkey(pub)
+        if addr is not None and address_to_script_pubkey(addr, network) != spk:
+            raise ValueError(f"Key does not own {addr}")
+        owned[spk] = (prv, pub)
+    return owned
+
+# ---------------- pass 2: sign + write ----------------
+def _input_sats(f, L: _Layout):
+    """(total spent by the inputs or None if one has no utxo data, every amount verified?)"""
+    total = 0; verified = True; cursor = L.ins_off; pos = L.maps_off
+    for _ in range(L.n_in):
+        f.seek(cursor)
+        outpoint = _read(f, 36); f.seek(_read_varint(f), 1); _read(f, 4)
+        cursor = f.tell()
+        f.seek(pos)
+        entries = list(_iter_map(f))
+        pos = f.tell()
+        spent = _spent_output(f, entries, outpoint)
+        if spent is None: return None, False
+        total += spent[0]; verified = verified and spent[2]
+    return total, verified
+
+def _describe(spk: bytes, network: str) -> str:
+    try:
+        return script_pubkey_to_address(spk, network)
+    except ValueError:
+        return "script " + spk.hex()
+
+def summarize(src, *, network: str = "mainnet", preview: int = 4) -> dict:
+    """
+    Preview for a confirm screen: counts, txid, amounts, fee (None when an input
+    amount is unknown; fee_verified False when an amount rests on a witness_utxo
+    alone) and the first `preview` outputs as (sats, address).
+    """
+    L = _scan(src, preview)
+    in_sats, verified = _input_sats(src, L)
+    return {"txid": L.txid, "inputs": L.n_in, "outputs": L.n_out, "out_sats": L.out_sats,
+            "in_sats": in_sats, "fee_sats": in_sats - L.out_sats if in_sats is not None else None,
+            "fee_verified": verified, "preview": [(a, _describe(s, network)) for a, s in L.preview]}
+
+def sign_psbt(src, dst, privkeys, *, network: str = "mainnet", finalize: bool = False) -> dict:
+    """
+    src: seekable binary PSBT stream (see open_psbt); dst: binary writer.
+    finalize=False -> dst receives the PSBT with our PSBT_IN_PARTIAL_SIG entries added.
+    finalize=True  -> dst receives the final network tx; every input must end up signed.
+    Returns {"txid", "inputs", "outputs", "signed", "skipped", "in_sats", "out_sats",
+             "fee_sats" (None when an input amount is unknown), "fee_verified",
+             "complete", "format", "prevouts" [(amount, spk) | None per input]}
+    Every new signature is verified before it is written.
+    """
+    owned = _owned_keys(privkeys, network)
+    L = _scan(src)
+    signed, skipped, prevouts = [], [], []
+    in_sats = 0; amounts_known = True; amounts_verified = True; complete = True
+
+    if finalize:
+        dst.write(struct.pack("<I", L.version) + b"\x00\x01")
+        _feed(src, L.tx_off + 4, L.tx_len - 8, dst)        # vin + vout as-is
+    else:
+        dst.write(MAGIC)
+        _feed(src, len(MAGIC), L.maps_off - len(MAGIC), dst)   # global map as-is
+
+    cursor = L.ins_off; pos = L.maps_off
+    for n in range(L.n_in):
+        src.seek(cursor)
+        outpoint = _read(src, 36); src.seek(_read_varint(src), 1)
+        sequence = struct.unpack("<I", _read(src, 4))[0]
+        cursor = src.tell()
+
+        src.seek(pos)
+        entries = list(_iter_map(src))        # (key, off, len) only; values stay on disk
+        pos = src.tell()
+
+        spent = _spent_output(src, entries, outpoint)
+        utxo = spent[:2] if spent is not None else None
+        prevouts.append(utxo)
+        amounts_verified = amounts_verified and spent is not None and spent[2]
+        sighash_type = SIGHASH_ALL; final_wit = None; partial = {}; has_final_sig = False
+        for key, off, vlen in entries:
+            t = key[0]
+            if t == IN_SIGHASH_TYPE:
+                sighash_type = struct.unpack("<I", _value(src, off, vlen))[0]
+            elif t == IN_PARTIAL_SIG:
+                partial[key[1:]] = (off, vlen)
+            elif t == IN_FINAL_SCRIPTWITNESS:
+                final_wit = (off, vlen)
+            elif t == IN_FINAL_SCRIPTSIG:
+                has_final_sig = True
+
+        if utxo is None:
+            amounts_known = False
+        else:
+            in_sats += utxo[0]
+
+        new_sig = None
+        mine = owned.get(utxo[1]) if utxo is not None else None
+        if final_wit is not None:
+            skipped.append((n, "already finalized"))
+        elif mine is None:
+            skipped.append((n, "not ours" if utxo is not None else "no utxo data"))
+        elif sighash_type != SIGHASH_ALL:
+            skipped.append((n, f"sighash {sighash_type} not supported"))
+        elif mine[1] in partial:
+            skipped.append((n, "already signed"))
+        else:
+            prv, pub = mine
+            digest = L.midstate.p2wpkh_digest(outpoint, utxo[1], utxo[0], sequence)
+            der = ecdsa_sign_der(digest, prv)
+            if not ecdsa_verify_der(digest, der, pub):
+                raise PsbtError(f"Input {n}: signature failed self-check")
+            new_sig = der + bytes([SIGHASH_ALL])
+            signed.append(n)
+
+        if finalize:
+            if has_final_sig:
+                raise PsbtError(f"Input {n} needs a scriptSig; export as PSBT instead")
+            if final_wit is not None:
+                _feed(src, final_wit[0], final_wit[1], dst)
+            elif new_sig is not None:
+                dst.write(b"\x02" + _varint(len(new_sig)) + new_sig + b"\x21" + mine[1])
+            elif len(partial) == 1 and utxo is not None and utxo[1][:2] == b"\x00\x14":
+                pub, (off, vlen) = next(iter(partial.items()))
+                if p2wpkh_script_pubkey(pub) != utxo[1]:
+                    raise PsbtError(f"Input {n}: partial signature key does not match")
+                dst.write(b"\x02" + _varint(vlen) + _value(src, off, vlen) + b"\x21" + pub)
+            else:
+                raise PsbtError(f"Input {n} cannot be finalized ({skipped[-1][1] if skipped else 'unsigned'})")
+        else:
+            for key, off, vlen in entries:
+                dst.write(_varint(len(key)) + key + _varint(vlen))
+                _feed(src, off, vlen, dst)
+            if new_sig is not None:
+                _write_kv(dst, bytes([IN_PARTIAL_SIG]) + mine[1], new_sig)
+            dst.write(b"\x00")
+            complete = complete and (final_wit is not None or new_sig is not None or bool(partial))
+
+    if finalize:
+        dst.write(struct.pack("<I", L.locktime))
+    else:
+        src.seek(pos)
+        for _ in range(L.n_out):               # output maps copied verbatim
+            start = src.tell()
+            for _k in _iter_map(src): pass
+            _feed(src, start, src.tell() - start, dst)
+
+    return {
+        "txid": L.txid, "inputs": L.n_in, "outputs": L.n_out,
+        "signed": signed, "skipped": skipped,
+        "in_sats": in_sats, "out_sats": L.out_sats,
+        "fee_sats": in_sats - L.out_sats if amounts_known else None, "fee_verified": amounts_verified,
+        "complete": complete, "format": "tx" if finalize else "psbt",
+        "prevouts": prevouts,
+    }
+
+def _check_final(raw_hex: str, info: dict, network: str):
+    """Offline verification of the finished tx against the PSBT's spent outputs."""
+    from crypto.tx_verify import verify_signed
+    r = verify_signed(raw_hex, chain="btc", network=network, prevouts=info["prevouts"])
+    if not r["ok"]:
+        raise PsbtError("Final tx failed verification: " + "; ".join(r["problems"][:3]))
+
+def sign_psbt_file(source, out_path, privkeys, *, network: str = "mainnet",
+                   finalize: bool = False, as_base64: bool = True) -> dict:
+    """
+    File/QR text in, file out (written via a temp file + rename).
+    PSBT output is base64 (or binary with as_base64=False); a final tx is written as
+    hex, and only after it passes tx_verify (nothing is written otherwise).
+    """
+    out_path = Path(out_path)
+    src = open_psbt(source)
+    try:
+        with _spool() as tmp:
+            info = sign_psbt(src, tmp, privkeys, network=network, finalize=finalize)
+            part = out_path.with_name(out_path.name + ".part")
+            if finalize:
+                tmp.seek(0)
+                _check_final(tmp.read().hex(), info, network)
+                with open(part, "w") as out:
+                    tmp.seek(0)
+                    for b in iter(lambda: tmp.read(_CHUNK), b""): out.write(b.hex())
+                    out.write("\n")
+            elif as_base64:
+                with open(part, "w") as out: write_base64(tmp, out)
+            else:
+                with open(part, "wb") as out:
+                    tmp.seek(0)
+                    for b in iter(lambda: tmp.read(_CHUNK), b""): out.write(b)
+            os.replace(part, out_path)
+    finally:
+        src.close()
+    info["path"] = str(out_path)
+    return info
@@ -0,0 +1,319 @@
+# tx_verify.py
+# Offline check of signed outputs before they leave the device (and for audits):
+# decode the blob, recover/verify the signer, compare fields with the unsigned tx.
+#   EVM: RLP legacy / EIP-2930 / EIP-1559, signer recovered from (v, r, s)
+#   BTC: segwit raw tx, P2WPKH witnesses verified against BIP143 digests (needs the
+#        spent amounts: without --unsigned every BTC blob fails)
+#   XRP: binary codec, TxnSignature verified against SigningPubKey
+# CLI: python -m crypto.tx_verify <file|dir> [--unsigned unsigned_tx.json] [--workers N]
+import hashlib, json, struct, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+def _hex(s) -> bytes:
+    s = s.strip() if isinstance(s, str) else s
+    if isinstance(s, (bytes, bytearray)): return bytes(s)
+    return bytes.fromhex(s[2:] if s.lower().startswith("0x") else s)
+
+def detect(blob: str) -> str:
+    """'evm' | 'btc' | 'xrp' from the shape of a signed blob."""
+    s = blob.strip()
+    b = _hex(s[:16])
+    if len(b) < 6: raise ValueError("Signed blob too short")
+    if b[0] >= 0xC0 or (b[0] in (1, 2) and b[1] >= 0xC0):
+        return "evm"                       # RLP list, or typed-tx byte + RLP list
+    if b[1:4] == b"\x00\x00\x00":
+        return "btc"                       # little-endian version 1/2
+    if b[0] == 0x12:
+        return "xrp"                       # XRPL TransactionType field header
+    raise ValueError("Unrecognised signed blob")
+
+def _result(chain, fields, signer=None, ok=True, problems=None, tx_hash=None):
+    return {"chain": chain, "ok": ok and not problems, "signer": signer, "hash": tx_hash,
+            "fields": fields, "problems": list(problems or [])}
+
+# ---------------- EVM ----------------
+def decode_evm(raw_hex: str) -> dict:
+    from eth_utils import keccak
+    from eth_keys import keys
+    from crypto.evm_rlp import decode, encode, to_int
+    raw = _hex(raw_hex)
+    problems = []
+    if raw[0] >= 0xC0:
+        items = decode(raw)
+        if len(items) != 9: raise ValueError("Legacy tx must have 9 fields")
+        nonce, gp, gas, to, value, data, v, r, s = items
+        v = to_int(v)
+        if v in (27, 28):
+            chain_id, recid = None, v - 27
+            msg = encode(items[:6])
+        else:
+            chain_id, recid = (v - 35) // 2, (v - 35) % 2
+            msg = encode(items[:6] + [chain_id, 0, 0])
+        fields = {"type": 0, "nonce": to_int(nonce), "gasPrice": to_int(gp), "gas": to_int(gas)}
+    else:
+        t = raw[0]
+        if t not in (1, 2): raise ValueError(f"Unsupported typed tx 0x{t:02x}")
+        items = decode(raw[1:])
+        if len(items) != (11 if t == 1 else 12): raise ValueError("Typed tx has wrong field count")
+        msg = raw[:1] + encode(items[:-3])
+        recid, r, s = to_int(items[-3]), items[-2], items[-1]
+        chain_id = to_int(items[0])
+        fields = {"type": t, "nonce": to_int(items[1])}
+        if t == 1:
+            fields["gasPrice"] = to_int(items[2]); rest = items[3:]
+        else:
+            fields["maxPriorityFeePerGas"] = to_int(items[2]); fields["maxFeePerGas"] = to_int(items[3]); rest = items[4:]
+        gas, to, value, data = rest[0], rest[1], rest[2], rest[3]
+        fields["gas"] = to_int(gas)
+        fields["accessList"] = [{"address": "0x" + a.hex(), "storageKeys": ["0x" + k.hex() for k in ks]}
+                                for a, ks in rest[4]]
+    r, s = to_int(r), to_int(s)
+    fields.update({"chainId": chain_id, "to": ("0x" + to.hex()) if to else None,
+                   "value": to_int(value), "data": "0x" + data.hex()})
+    if s > _N // 2: problems.append("high-s signature (EIP-2)")
+    if recid not in (0, 1): problems.append(f"bad recovery id {recid}")
+    signer = None
+    try:
+        pub = keys.Signature(vrs=(recid, r, s)).recover_public_key_from_msg_hash(keccak(msg))
+        signer = pub.to_checksum_address()
+    except Exception as e:
+        problems.append(f"signer recovery failed: {e}")
+    return _result("evm", fields, signer, problems=problems, tx_hash="0x" + keccak(raw).hex())
+
+def _compare_evm(fields: dict, unsigned: dict, problems: list):
+    from crypto.evm_signer import normalize_tx
+    u = normalize_tx(unsigned)
+    for k in ("nonce", "gas", "value", "chainId", "gasPrice", "maxFeePerGas", "maxPriorityFeePerGas"):
+        if k in u and fields.get(k) != u[k]:
+            problems.append(f"{k}: signed {fields.get(k)} != unsigned {u[k]}")
+    if (u.get("to") or "").lower() != (fields.get("to") or "").lower():
+        problems.append(f"to: signed {fields.get('to')} != unsigned {u.get('to')}")
+    if _hex(u.get("data") or "0x") != _hex(fields["data"]):
+        problems.append("data differs")
+    if int(u.get("type") or 0) != fields["type"]:
+        problems.append(f"type: signed {fields['type']} != unsigned {u.get('type') or 0}")
+
+# ---------------- BTC ----------------
+def _read_varint(b: bytes, i: int):
+    p = b[i]
+    if p < 0xFD: return p, i + 1
+    n = {0xFD: 2, 0xFE: 4, 0xFF: 8}[p]
+    return int.from_bytes(b[i + 1:i + 1 + n], "little"), i + 1 + n
+
+def parse_btc(raw_hex: str) -> dict:
+    """Segwit (or legacy) raw tx -> {"version", "inputs", "outputs", "witnesses", "locktime", "txid", ...}"""
+    b = _hex(raw_hex); i = 4
+    version = struct.unpack("<I", b[:4])[0]
+    segwit = b[4:6] == b"\x00\x01"
+    if segwit: i = 6
+    body_start = i
+    n_in, i = _read_varint(b, i); ins = []
+    for _ in range(n_in):
+        outpoint = b[i:i + 36]; i += 36
+        sl, i = _read_varint(b, i); script = b[i:i + sl]; i += sl
+        ins.append({"outpoint": outpoint, "txid": outpoint[:32][::-1].hex(),
+                    "vout": struct.unpack("<I", outpoint[32:])[0], "script_sig": script,
+                    "sequence": struct.unpack("<I", b[i:i + 4])[0]}); i += 4
+    n_out, i = _read_varint(b, i); outs_start = i; outs = []
+    for _ in range(n_out):
+        amount = struct.unpack("<Q", b[i:i + 8])[0]; i += 8
+        sl, i = _read_varint(b, i); outs.append({"amount_sats": amount, "spk": b[i:i + sl]}); i += sl
+    outs_end = i; wits = []
+    if segwit:
+        for _ in range(n_in):
+            k, i = _read_varint(b, i); stack = []
+            for _ in range(k):
+                ln, i = _read_varint(b, i); stack.append(b[i:i + ln]); i += ln
+            wits.append(stack)
+    locktime = struct.unpack("<I", b[i:i + 4])[0]; i += 4
+    if i != len(b): raise ValueError("Trailing bytes after BTC tx")
+    stripped = b[:4] + b[body_start:outs_end] + b[-4:]
+    return {"version": version, "inputs": ins, "outputs": outs, "witnesses": wits, "locktime": locktime,
+            "outputs_raw": b[outs_start:outs_end],
+            "txid": hashlib.sha256(hashlib.sha256(stripped).digest()).digest()[::-1].hex()}
+
+def _btc_unsigned_io(unsigned: dict):
+    """unsigned_tx.json BTC formats -> (inputs, outputs) lists."""
+    if "utxos" in unsigned:
+        return unsigned["utxos"], unsigned["outputs"]
+    u = unsigned["utxo"]
+    outs = [{"address": unsigned["to"], "amount_sats": int(unsigned["send_amount_sats"])}]
+    change = int(u["amount_sats"]) - int(unsigned["send_amount_sats"]) - int(unsigned["fee_sats"])
+    if change > 0:
+        outs.append({"address": unsigned.get("change_address") or u["address"], "amount_sats": change})
+    return [u], outs
+
+def verify_btc(raw_hex: str, unsigned: dict | None = None, network: str = "mainnet",
+               prevouts: list | None = None) -> dict:
+    """
+    Every input signature is checked against the amount and scriptPubKey it spends,
+    taken from `prevouts` [(amount_sats, spk bytes) | None per input] or from the
+    unsigned tx. An input whose amount is unknown is a problem, never a pass.
+    """
+    from crypto.btc_signer import (Bip143Midstate, address_to_script_pubkey, ecdsa_verify_der,
+                                   p2wpkh_script_pubkey)
+    tx = parse_btc(raw_hex); problems = []
+    sha = lambda x: hashlib.sha256(hashlib.sha256(x).digest()).digest()
+    mid = Bip143Midstate(tx["version"], sha(b"".join(i["outpoint"] for i in tx["inputs"])),
+                         sha(b"".join(struct.pack("<I", i["sequence"]) for i in tx["inputs"])),
+                         sha(tx["outputs_raw"]), tx["locktime"])
+    u_ins = u_outs = None
+    if unsigned is not None:
+        u_ins, u_outs = _btc_unsigned_io(unsigned)
+        if len(u_ins) != len(tx["inputs"]): problems.append("input count differs from unsigned")
+        if len(u_outs) != len(tx["outputs"]): problems.append("output count differs from unsigned")
+        for n, (o, uo) in enumerate(zip(tx["outputs"], u_outs)):
+            if o["amount_sats"] != int(uo["amount_sats"]) or o["spk"] != address_to_script_pubkey(uo["address"], network):
+                problems.append(f"output {n} differs from unsigned")
+    signers = []; verified = 0
+    for n, inp in enumerate(tx["inputs"]):
+        stack = tx["witnesses"][n] if tx["witnesses"] else []
+        if len(stack) != 2 or len(stack[1]) != 33:
+            problems.append(f"input {n}: not a P2WPKH witness"); signers.append(None); continue
+        sig, pub = stack
+        spk = p2wpkh_script_pubkey(pub); signers.append(pub.hex())
+        if sig[-1] != 1: problems.append(f"input {n}: sighash type {sig[-1]} (expected ALL)")
+        if prevouts is not None:
+            prev = prevouts[n] if n < len(prevouts) else None
+            if prev is None:
+                problems.append(f"input {n}: amount unknown, signature not checked"); continue
+            amount, owner = int(prev[0]), bytes(prev[1])
+            if spk != owner:
+                problems.append(f"input {n}: signed by a key that does not own the spent output"); continue
+        elif u_ins is not None and n < len(u_ins):
+            ui = u_ins[n]
+            if (ui["txid"].lower(), int(ui["vout"])) != (inp["txid"], inp["vout"]):
+                problems.append(f"input {n}: outpoint differs from unsigned"); continue
+            if spk != address_to_script_pubkey(ui["address"], network):
+                problems.append(f"input {n}: signed by a key that does not own {ui['address']}"); continue
+            amount = int(ui["amount_sats"])
+        else:
+            problems.append(f"input {n}: amount unknown, signature not checked"); continue
+        digest = mid.p2wpkh_digest(inp["outpoint"], spk, amount, inp["sequence"])
+        if ecdsa_verify_der(digest, sig[:-1], pub): verified += 1
+        else: problems.append(f"input {n}: bad signature")
+    fields = {"inputs": [{"txid": i["txid"], "vout": i["vout"]} for i in tx["inputs"]],
+              "outputs": [{"amount_sats": o["amount_sats"], "spk": o["spk"].hex()} for o in tx["outputs"]],
+              "verified_inputs": verified}
+    return _result("btc", fields, signers, problems=problems, tx_hash=tx["txid"])
+
+# ---------------- XRP ----------------
+def verify_xrp(blob_hex: str, unsigned: dict | None = None) -> dict:
+    from xrpl.core.binarycodec import decode, encode_for_signing
+    from xrpl.core.keypairs import is_valid_message, derive_classic_address
+    from crypto.xrp_signer import tx_hash
+    tx = decode(blob_hex.strip()); problems = []
+    pub = tx.get("SigningPubKey"); sig = tx.get("TxnSignature")
+    signer = None
+    if not pub or not sig:
+        problems.append("missing SigningPubKey/TxnSignature")
+    else:
+        signer = derive_classic_address(pub)
+        if signer != tx.get("Account"): problems.append(f"SigningPubKey belongs to {signer}, not {tx.get('Account')}")
+        unsigned_tx = {k: v for k, v in tx.items() if k != "TxnSignature"}
+        if not is_valid_message(bytes.fromhex(encode_for_signing(unsigned_tx)), bytes.fromhex(sig), pub):
+            problems.append("bad TxnSignature")
+    if unsigned is not None:
+        for k in ("TransactionType", "Account", "Destination", "Amount", "Sequence", "Fee", "Flags", "NetworkID"):
+            if k in unsigned and str(unsigned[k]) != str(tx.get(k)):
+                problems.append(f"{k}: signed {tx.get(k)} != unsigned {unsigned[k]}")
+    return _result("xrp", tx, signer, problems=problems, tx_hash=tx_hash(_hex(blob_hex)))
+
+# ---------------- entry points ----------------
+def verify_signed(blob: str, unsigned: dict | None = None, expected_signer: str | None = None,
+                  chain: str | None = None, network: str = "mainnet", prevouts: list | None = None) -> dict:
+    """
+    Decode + verify one signed blob. expected_signer: EVM/XRP address, or a BTC
+    compressed pubkey hex. BTC needs the spent amounts (unsigned tx or prevouts),
+    otherwise it fails. Never raises: failures are reported in result["problems"].
+    """
+    try:
+        chain = chain or detect(blob)
+        if chain == "evm":
+            r = decode_evm(blob)
+            if unsigned is not None: _compare_evm(r["fields"], unsigned, r["problems"])
+        elif chain == "btc":
+            r = verify_btc(blob, unsigned, network, prevouts)
+        elif chain == "xrp":
+            r = verify_xrp(blob, unsigned)
+        else:
+            raise ValueError(f"Unknown chain {chain}")
+    except Exception as e:
+        return _result(chain, {}, ok=False, problems=[f"decode failed: {type(e).__name__}: {e}"])
+    if expected_signer:
+        got = r["signer"] if isinstance(r["signer"], list) else [r["signer"]]
+        if any((g or "").lower() != expected_signer.lower() for g in got):
+            r["problems"].append(f"signer {r['signer']} != expected {expected_signer}")
+    r["ok"] = not r["problems"]
+    return r
+
+def _blobs_in(path: Path):
+    """Signed blobs stored in one output file (txt lines, signed_batch.json, ladder bundles)."""
+    text = path.read_text().strip()
+    if not text: return []
+    if text[0] in "[{":
+        obj = json.loads(text)
+        if isinstance(obj, dict) and "tiers" in obj:
+            return [t["raw"] for t in obj["tiers"]]
+        if isinstance(obj, dict):
+            obj = [obj]
+        out = []
+        for o in obj:
+            if isinstance(o, str): out.append(o)
+            elif isinstance(o, dict) and o.get("signed"): out.append(o["signed"])
+        return out
+    return [l.strip() for l in text.splitlines() if l.strip()]
+
+def _verify_chunk(jobs):
+    return [dict(verify_signed(blob, unsigned), file=f, item=i) for f, i, blob, unsigned in jobs]
+
+def verify_paths(paths, unsigned: dict | None = None, workers: int | None = None, chunk: int = 64):
+    """
+    Verify every signed blob in the given files / directories.
+    Blobs are shipped to workers in chunks so per-task overhead is amortised
+    across many hashes. Yields one result per blob in file order.
+    """
+    jobs = []
+    for p in paths:
+        p = Path(p)
+        files = sorted(x for x in p.rglob("*") if x.suffix in (".txt", ".hex", ".json")) if p.is_dir() else [p]
+        for f in files:
+            if f.name.startswith("unsigned"): continue
+            try:
+                blobs = _blobs_in(f)
+            except Exception as e:
+                yield {"file": str(f), "item": None, "ok": False, "chain": None, "problems": [f"unreadable: {e}"]}
+                continue
+            jobs.extend((str(f), i, b, unsigned) for i, b in enumerate(blobs))
+    chunks = [jobs[i:i + chunk] for i in range(0, len(jobs), chunk)]
+    if workers and workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            for res in ex.map(_verify_chunk, chunks):
+                yield from res
+    else:
+        for c in chunks:
+            yield from _verify_chunk(c)
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    unsigned = None; workers = None
+    if "--unsigned" in argv:
+        i = argv.index("--unsigned"); unsigned = json.loads(Path(argv[i + 1]).read_text()); del argv[i:i + 2]
+    if "--workers" in argv:
+        i = argv.index("--workers"); workers = int(argv[i + 1]); del argv[i:i + 2]
+    if not argv:
+        print("usage: python -m crypto.tx_verify <file|dir> [--unsigned unsigned_tx.json] [--workers N]"); return 2
+    t0 = time.perf_counter(); total = bad = 0
+    for r in verify_paths(argv, unsigned, workers):
+        total += 1
+        if not r["ok"]:
+            bad += 1; print(f"FAIL {r['file']}#{r['item']}: {'; '.join(r['problems'])}")
+    dt = time.perf_counter() - t0
+    print(f"{total} checked, {bad} failed in {dt:.2f}s ({total/dt if dt else 0:.0f}/s)")
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
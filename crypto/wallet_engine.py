@@ -1,16 +1,145 @@
 # wallet_engine.py
+import os, hmac, hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from mnemonic import Mnemonic
+from crypto.derivation_path import HARDENED, compile_path, bind, split_account, to_str
 from bip_utils import (
     Bip39SeedGenerator,
-    Bip44, Bip44Coins,
-    Bip49, Bip49Coins,
-    Bip84, Bip84Coins,
-    Bip44Changes,
+    Bip44Coins, Bip49Coins, Bip84Coins,
+    Bip44ConfGetter, Bip49ConfGetter, Bip84ConfGetter,
+    Bip44PublicKey, Bip44PrivateKey,
+    Bip32Slip10Secp256k1,
 )
 
+# address_type -> (default path template, coin conf used for address/WIF encoding)
+_UTXO_CONFS = {
+    "P2WPKH":      ("m/84'/{coin}'/0'/0/{index}", lambda: Bip84ConfGetter.GetConfig(Bip84Coins.BITCOIN)),   # Native SegWit (BIP84)
+    "P2SH-P2WPKH": ("m/49'/{coin}'/0'/0/{index}", lambda: Bip49ConfGetter.GetConfig(Bip49Coins.BITCOIN)),   # Nested SegWit (BIP49)
+    "P2PKH":       ("m/44'/{coin}'/0'/0/{index}", lambda: Bip44ConfGetter.GetConfig(Bip44Coins.BITCOIN)),   # Legacy (BIP44)
+}
+_EVM_CONF = lambda: Bip44ConfGetter.GetConfig(Bip44Coins.ETHEREUM)
+_XRP_CONF = lambda: Bip44ConfGetter.GetConfig(Bip44Coins.RIPPLE)
+_DEFAULT_PATHS = {"evm": "m/44'/60'/0'/0/{index}", "xrp": "m/44'/144'/0'/0/{index}"}
+
+def _conf_for(kind: str):
+    """kind: 'evm', 'xrp' or a UTXO address_type."""
+    if kind == "evm": return _EVM_CONF()
+    if kind == "xrp": return _XRP_CONF()
+    return _UTXO_CONFS.get(kind, _UTXO_CONFS["P2PKH"])[1]()
+
+def _default_path(kind: str, coin_type: int = 0) -> str:
+    if kind in _DEFAULT_PATHS: return _DEFAULT_PATHS[kind]
+    return _UTXO_CONFS.get(kind, _UTXO_CONFS["P2PKH"])[0].replace("{coin}", str(int(coin_type or 0)))
+
+def _network_kind(network: dict) -> str:
+    t = (network.get("type") or "evm").lower()
+    if t in ("evm", "xrp"): return t
+    return (network.get("address_type") or "P2WPKH").upper()
+
+def _bind_tail(tail: tuple, change: int, index: int) -> tuple:
+    """Bind the non-hardened tail; a literal first step of a 2-step tail is the change branch."""
+    if change and len(tail) >= 2 and not isinstance(tail[0][0], str):
+        tail = ((change, False),) + tail[1:]
+    return bind(tail, change=change, index=index)
+
+def _child_xpub(xpub: str, index: int) -> str:
+    return Bip32Slip10Secp256k1.FromExtendedKey(xpub).ChildKey(index).PublicKey().ToExtended()
+
+def _derive_public_chunk(xpub: str, kind: str, start: int, count: int):
+    """Public-only derivation of children start..start+count-1 below an extended public key.
+    Module-level so it can run in a worker process; never sees private material."""
+    parent = Bip32Slip10Secp256k1.FromExtendedKey(xpub)
+    conf = _conf_for(kind)
+    uncompressed = (kind == "evm")
+    addrs = []; pubs = []
+    for i in range(start, start + count):
+        pub = Bip44PublicKey(parent.ChildKey(i).PublicKey(), conf)
+        addrs.append(pub.ToAddress())
+        pubs.append((pub.RawUncompressed() if uncompressed else pub.RawCompressed()).ToHex())
+    return addrs, pubs
+
+class AddressRange:
+    """Columnar result of WalletEngine.derive_range(): parallel lists, no per-item dicts."""
+    __slots__ = ("network_key", "change", "start", "addresses", "public_keys")
+
+    def __init__(self, network_key, change, start, addresses, public_keys):
+        self.network_key = network_key; self.change = change; self.start = start
+        self.addresses = addresses; self.public_keys = public_keys
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def index_of(self, address: str):
+        """Child index of address within this range, or None."""
+        try:
+            return self.start + self.addresses.index(address)
+        except ValueError:
+            return None
+
+class NodeCache:
+    """
+    Bounded LRU of BIP32 nodes keyed by (seed fingerprint, hardened path prefix).
+    The fingerprint is an HMAC under a per-process random key, so the cache
+    never stores or exposes the seed itself. Only hardened prefixes (and the
+    master) are cached; non-hardened tail steps are cheap and recomputed.
+    """
+    def __init__(self, max_nodes: int = 64):
+        self.max_nodes = max_nodes
+        self._fp_key = os.urandom(32)
+        self._nodes = OrderedDict()
+        self.hits = 0; self.misses = 0
+
+    def fingerprint(self, seed: bytes) -> bytes:
+        return hmac.new(self._fp_key, bytes(seed), hashlib.sha256).digest()
+
+    def _put(self, key, node):
+        self._nodes[key] = node
+        self._nodes.move_to_end(key)
+        while len(self._nodes) > self.max_nodes:
+            self._nodes.popitem(last=False)
+
+    def node(self, seed: bytes, steps: tuple):
+        """Return the node at `steps` (raw child indexes, hardened bit already applied)."""
+        fp = self.fingerprint(seed)
+        # longest cached hardened prefix
+        cut = 0
+        for i, idx in enumerate(steps):
+            if idx & HARDENED: cut = i + 1
+            else: break
+        node = None; start = 0
+        for k in range(cut, -1, -1):
+            key = (fp, steps[:k])
+            cached = self._nodes.get(key)
+            if cached is not None:
+                self._nodes.move_to_end(key)
+                node, start = cached, k
+                break
+        if node is None:
+            self.misses += 1
+            node = Bip32Slip10Secp256k1.FromSeed(bytes(seed))
+            self._put((fp, ()), node)
+        else:
+            self.hits += 1
+        for k in range(start, len(steps)):
+            node = node.ChildKey(steps[k])
+            if k < cut:
+                self._put((fp, steps[:k + 1]), node)
+        return node
+
+    def wipe(self, seed: bytes | None = None):
+        """Drop every cached node, or only those derived from `seed`."""
+        if seed is None:
+            self._nodes.clear()
+        else:
+            fp = self.fingerprint(seed)
+            for key in [k for k in self._nodes if k[0] == fp]:
+                del self._nodes[key]
+
 class WalletEngine:
-    def __init__(self, lang="english"):
+    def __init__(self, lang="english", node_cache_size=64):
         self.mnemo = Mnemonic(lang)
+        self.nodes = NodeCache(node_cache_size)
 
     # --- Seed & validation ---
     def generate_mnemonic(self, words=12) -> str:
@@ -23,35 +152,107 @@ class WalletEngine:
     def mnemonic_to_seed(self, mnemonic: str, passphrase: str = "") -> bytes:
         return Bip39SeedGenerator(mnemonic.strip()).Generate(passphrase)
 
+    def wipe_cache(self, seed: bytes | None = None):
+        self.nodes.wipe(seed)
+
+    # --- Paths ---
+    def _account_spec(self, network: dict):
+        """(raw hardened account steps, compiled non-hardened tail, kind) for a network entry."""
+        kind = _network_kind(network)
+        template = network.get("derivation_path") or _default_path(kind, network.get("coin_type", 0))
+        prefix, tail = split_account(compile_path(template))
+        return bind(prefix), tail, kind
+
+    def _walk(self, seed: bytes, derivation_path: str, index: int = 0):
+        """Node at a concrete path or template ({index} bound); hardened prefix comes from the cache."""
+        steps = bind(compile_path(derivation_path), index=index)
+        return self.nodes.node(seed, steps), steps
+
+    # --- Batch derivation ---
+    def derive_range(self, seed: bytes | None, network: dict, start: int = 0, count: int = 20,
+                     change: bool = False, workers: int | None = None,
+                     xpub: str | None = None) -> AddressRange:
+        """
+        Derive `count` consecutive receive (or change) addresses from `start`.
+        The account/change node comes from the node cache once (or from the stored
+        account-level `xpub` when seed is None); children are derived public-only,
+        optionally fanned out across `workers` processes.
+        """
+        if count <= 0:
+            return AddressRange(network.get("key"), change, start, [], [])
+        steps, tail, kind = self._account_spec(network)
+        if not tail:
+            raise ValueError("Derivation path has no non-hardened index step")
+        branch = _bind_tail(tail, 1 if change else 0, 0)[:-1]
+        if seed is None:
+            if not xpub: raise ValueError("derive_range needs a seed or an account xpub")
+            for i in branch: xpub = _child_xpub(xpub, i)
+        else:
+            xpub = self.nodes.node(seed, steps + branch).PublicKey().ToExtended()
+
+        if not workers or workers <= 1 or count < 2 * workers:
+            addrs, pubs = _derive_public_chunk(xpub, kind, start, count)
+        else:
+            per = -(-count // workers)
+            spans = [(s, min(per, start + count - s)) for s in range(start, start + count, per)]
+            addrs = []; pubs = []
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                futs = [ex.submit(_derive_public_chunk, xpub, kind, s, n) for s, n in spans]
+                for f in futs:
+                    a, p = f.result(); addrs.extend(a); pubs.extend(p)
+        return AddressRange(network.get("key"), change, start, addrs, pubs)
+
+    # --- Watch-only (account xpubs) ---
+    def account_path(self, network: dict) -> str:
+        return to_str(self._account_spec(network)[0])
+
+    def account_xpub(self, seed: bytes, network: dict) -> dict:
+        """{"path", "xpub"} of the account-level node; safe to store next to the accounts."""
+        steps = self._account_spec(network)[0]
+        return {"path": to_str(steps), "xpub": self.nodes.node(seed, steps).PublicKey().ToExtended()}
+
+    def xpub_for(self, network: dict, xpubs: dict | None):
+        """Stored xpub for network: by key, else any entry on the same account path (e.g. new EVM chains)."""
+        if not xpubs: return None
+        e = xpubs.get((network.get("key") or "").upper())
+        if e: return e.get("xpub")
+        path = self.account_path(network)
+        return next((e.get("xpub") for e in xpubs.values() if isinstance(e, dict) and e.get("path") == path), None)
+
+    def derive_from_xpub(self, xpub: str, network: dict, index: int = 0, change: bool = False) -> dict:
+        """Public-only derivation: {address, public_key, derivation_path, index} (no private_key)."""
+        steps, tail, kind = self._account_spec(network)
+        rel = _bind_tail(tail, 1 if change else 0, int(index))
+        for i in rel[:-1]: xpub = _child_xpub(xpub, i)
+        addrs, pubs = _derive_public_chunk(xpub, kind, rel[-1], 1)
+        return {
+            "address": addrs[0],
+            "public_key": pubs[0],
+            "derivation_path": to_str(steps + rel),
+            "index": rel[-1],
+        }
+
     # --- EVM derivation (ETH & EVM-like) ---
     def derive_evm_account(self, seed: bytes, derivation_path: str = "m/44'/60'/0'/0/0"):
         """
         Returns dict:
           {private_key, public_key, address, derivation_path, index}
         public_key: uncompressed hex (starts with '04').
+        The full path is honored (custom coin types / accounts); {index} binds to 0.
         """
-        # Best-effort leaf index parsing from path
-        index = 0
-        try:
-            index = int(derivation_path.split("/")[-1])
-        except Exception:
-            index = 0
+        node, steps = self._walk(seed, derivation_path)
+        pub = Bip44PublicKey(node.PublicKey(), _EVM_CONF())
 
-        acct = (
-            Bip44.FromSeed(seed, Bip44Coins.ETHEREUM)
-            .Purpose().Coin().Account(0).Change(Bip44Changes.CHAIN_EXT).AddressIndex(index)
-        )
-
-        priv_hex = acct.PrivateKey().Raw().ToHex()
-        pub_uncompressed_hex = acct.PublicKey().RawUncompressed().ToHex()  # '04' + X + Y
-        address = acct.PublicKey().ToAddress()
+        priv_hex = node.PrivateKey().Raw().ToHex()
+        pub_uncompressed_hex = pub.RawUncompressed().ToHex()  # '04' + X + Y
+        address = pub.ToAddress()
 
         return {
             "private_key": priv_hex,
             "public_key": pub_uncompressed_hex,
             "address": address,
-            "derivation_path": derivation_path,
-            "index": index,
+            "derivation_path": to_str(steps),
+            "index": steps[-1] if steps else 0,
         }
 
     # --- BTC/UTXO derivation ---
@@ -59,7 +260,7 @@ class WalletEngine:
         self,
         seed: bytes,
         address_type: str = "P2WPKH",
-        coin_type: int = 0,  # reserved for future use
+        coin_type: int = 0,  # used only when derivation_path is empty
         derivation_path: str = "m/84'/0'/0'/0/0",
     ):
         """
@@ -68,40 +269,49 @@ class WalletEngine:
           {private_key (WIF), public_key (compressed hex), address, derivation_path, index}
         """
         addr_type = (address_type or "P2WPKH").upper()
-
-        if addr_type == "P2WPKH":
-            # Native SegWit (BIP84)
-            acct = (
-                Bip84.FromSeed(seed, Bip84Coins.BITCOIN)
-                .Purpose().Coin().Account(0).Change(Bip44Changes.CHAIN_EXT).AddressIndex(0)
-            )
-        elif addr_type == "P2SH-P2WPKH":
-            # Nested SegWit (BIP49)
-            acct = (
-                Bip49.FromSeed(seed, Bip49Coins.BITCOIN)
-                .Purpose().Coin().Account(0).Change(Bip44Changes.CHAIN_EXT).AddressIndex(0)
-            )
-        else:
-            # Legacy (BIP44)
-            acct = (
-                Bip44.FromSeed(seed, Bip44Coins.BITCOIN)
-                .Purpose().Coin().Account(0).Change(Bip44Changes.CHAIN_EXT).AddressIndex(0)
-            )
-
-        address = acct.PublicKey().ToAddress()
-        pub_comp_hex = acct.PublicKey().RawCompressed().ToHex()
+        conf = _conf_for(addr_type)
+        node, steps = self._walk(seed, derivation_path or _default_path(addr_type, coin_type))
+        pub = Bip44PublicKey(node.PublicKey(), conf)
+        address = pub.ToAddress()
+        pub_comp_hex = pub.RawCompressed().ToHex()
 
         # Get WIF directly from the private key (handles net + version internally)
+        priv = Bip44PrivateKey(node.PrivateKey(), conf)
         try:
-            wif = acct.PrivateKey().ToWif(compressed=True)
+            wif = priv.ToWif(compressed=True)
         except TypeError:
             # some versions use no argument
-            wif = acct.PrivateKey().ToWif()
+            wif = priv.ToWif()
 
         return {
             "private_key": wif,
             "public_key": pub_comp_hex,
             "address": address,
-            "derivation_path": derivation_path,
-            "index": 0,
+            "derivation_path": to_str(steps),
+            "index": steps[-1] if steps else 0,
         }
+
+    # --- XRP derivation ---
+    def derive_xrp_account(self, seed: bytes, derivation_path: str = "m/44'/144'/0'/0/0"):
+        """
+        Returns dict:
+          {private_key (raw hex), public_key (compressed hex), address (r...), derivation_path, index}
+        """
+        node, steps = self._walk(seed, derivation_path or _DEFAULT_PATHS["xrp"])
+        pub = Bip44PublicKey(node.PublicKey(), _XRP_CONF())
+        return {
+            "private_key": node.PrivateKey().Raw().ToHex(),
+            "public_key": pub.RawCompressed().ToHex(),
+            "address": pub.ToAddress(),
+            "derivation_path": to_str(steps),
+            "index": steps[-1] if steps else 0,
+        }
+
+    def derive_account(self, seed: bytes, network: dict, index: int = 0) -> dict:
+        """Derive the account for any network entry (evm / utxo / xrp) at `index`."""
+        kind = _network_kind(network)
+        steps, tail, _ = self._account_spec(network)
+        path = to_str(steps + _bind_tail(tail, 0, index))
+        if kind == "evm": return self.derive_evm_account(seed, path)
+        if kind == "xrp": return self.derive_xrp_account(seed, path)
+        return self.derive_utxo_account(seed, kind, network.get("coin_type", 0), path)
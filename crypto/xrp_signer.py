@@ -1,6 +1,140 @@
 # pip install xrpl-py
-from xrpl.core.binarycodec import encode
-from xrpl.core.keypairs import sign, derive_keypair
+# XRP signing with a cached secp256k1 keypair. For runs of Payments that differ
+# only in Sequence, the binary-codec blob is encoded once and reused: the
+# Sequence bytes are patched in place and TxnSignature is spliced in after
+# SigningPubKey (field order 0x73 < 0x74 in the canonical encoding).
+import hashlib, time
+from concurrent.futures import ProcessPoolExecutor
+from xrpl.core.binarycodec import encode, encode_for_signing
+from xrpl.core.keypairs import sign, derive_classic_address
+from bip_utils import Secp256k1PrivateKey
+
+TF_FULLY_CANONICAL_SIG = 2147483648
+_SIGNING_PREFIX = b"STX\x00"
+_TXN_PREFIX = b"TXN\x00"
+_TXN_SIGNATURE = b"\x74"          # Blob type 7, field 4
+
+def _xrpl_private_key(privkey_hex: str) -> str:
+    """xrpl-py wants secp256k1 keys as 66 hex chars with a 00 prefix."""
+    h = privkey_hex.strip()
+    h = h[2:] if h.lower().startswith("0x") else h
+    if len(h) == 64: h = "00" + h
+    if len(h) != 66: raise ValueError("XRP private key must be 32 bytes (hex)")
+    return h.upper()
+
+def _vl(n: int) -> bytes:
+    if n <= 192: return bytes([n])
+    n -= 193
+    return bytes([193 + (n >> 8), n & 0xFF])
+
+def tx_hash(blob: bytes) -> str:
+    return hashlib.sha512(_TXN_PREFIX + blob).digest()[:32].hex().upper()
+
+class _Template:
+    """Unsigned blob with the offsets needed to stamp a Sequence and a signature."""
+    __slots__ = ("blob", "seq_off", "sig_off")
+
+    def __init__(self, tx: dict, public_key: str):
+        a = dict(tx, SigningPubKey=public_key, Sequence=0x01020304)
+        b = dict(a, Sequence=0xFAFBFCFD)
+        ea, eb = bytes.fromhex(encode(a)), bytes.fromhex(encode(b))
+        diff = [i for i in range(len(ea)) if ea[i] != eb[i]]
+        if len(ea) != len(eb) or len(diff) != 4 or diff[3] - diff[0] != 3:
+            raise ValueError("Cannot locate Sequence in encoded tx")
+        self.seq_off = diff[0]
+        pk = bytes.fromhex(public_key)
+        marker = b"\x73" + _vl(len(pk)) + pk
+        at = ea.find(marker)
+        if at < 0 or ea.find(marker, at + 1) >= 0:
+            raise ValueError("Cannot locate SigningPubKey in encoded tx")
+        self.sig_off = at + len(marker)
+        self.blob = ea
+
+    def signing_blob(self, sequence: int) -> bytes:
+        b = bytearray(self.blob)
+        b[self.seq_off:self.seq_off + 4] = int(sequence).to_bytes(4, "big")
+        return bytes(b)
+
+    def signed_blob(self, unsigned: bytes, signature: bytes) -> bytes:
+        return unsigned[:self.sig_off] + _TXN_SIGNATURE + _vl(len(signature)) + signature + unsigned[self.sig_off:]
+
+# ---- per-process state for pooled range signing ----
+_W = {}
+
+def _init_worker(private_key: str, template: _Template):
+    _W["key"] = private_key; _W["tpl"] = template
+
+def _sign_sequence(sequence: int) -> dict:
+    t0 = time.perf_counter()
+    tpl = _W["tpl"]
+    unsigned = tpl.signing_blob(sequence)
+    sig = bytes.fromhex(sign(_SIGNING_PREFIX + unsigned, _W["key"]))
+    blob = tpl.signed_blob(unsigned, sig)
+    return {"sequence": int(sequence), "blob": blob.hex().upper(), "hash": tx_hash(blob),
+            "ms": (time.perf_counter() - t0) * 1000}
+
+class XrpSigner:
+    """
+    signer = XrpSigner(privkey_hex)         # keypair derived once
+    signer.sign(tx_json)                    -> signed blob hex
+    signer.sign_sequence_range(tx, 100, 50) -> 50 signed blobs for Sequence 100..149
+    """
+    def __init__(self, privkey_hex: str, public_key_hex: str | None = None):
+        self._key = _xrpl_private_key(privkey_hex)
+        if public_key_hex is None:
+            prv = Secp256k1PrivateKey.FromBytes(bytes.fromhex(self._key[2:]))
+            public_key_hex = prv.PublicKey().RawCompressed().ToHex()
+        self.public_key = public_key_hex.upper()
+        self._address = None
+
+    @property
+    def address(self) -> str:
+        if self._address is None:
+            self._address = derive_classic_address(self.public_key)
+        return self._address
+
+    def payment(self, destination: str, amount_drops: int, fee_drops: int, sequence: int = 0,
+                flags: int = TF_FULLY_CANONICAL_SIG, network_id: int | None = None, account: str | None = None) -> dict:
+        tx = {
+            "TransactionType": "Payment",
+            "Account": account or self.address,
+            "Destination": destination,
+            "Amount": str(int(amount_drops)),
+            "Sequence": int(sequence),
+            "Fee": str(int(fee_drops)),
+            "Flags": int(flags),
+        }
+        if network_id is not None: tx["NetworkID"] = int(network_id)
+        return tx
+
+    def sign(self, tx: dict) -> str:
+        """Any XRPL tx JSON -> signed blob hex (no 0x)."""
+        tx = dict(tx, SigningPubKey=self.public_key)
+        tx.pop("TxnSignature", None)
+        tx["TxnSignature"] = sign(bytes.fromhex(encode_for_signing(tx)), self._key)
+        return encode(tx)
+
+    def sign_sequence_range(self, tx: dict, start_sequence: int, count: int, workers: int | None = None) -> dict:
+        """
+        Pre-sign `count` copies of tx with Sequence = start_sequence, start_sequence+1, ...
+        Returns {"signed": [{"sequence", "blob", "hash", "ms"}, ...], "template_ms", "total_ms"}
+        """
+        t0 = time.perf_counter()
+        tx = {k: v for k, v in tx.items() if k not in ("TxnSignature", "network")}
+        tpl = _Template(tx, self.public_key)
+        template_ms = (time.perf_counter() - t0) * 1000
+        seqs = range(int(start_sequence), int(start_sequence) + int(count))
+        if workers and workers > 1 and count >= 2 * workers:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self._key, tpl)) as ex:
+                signed = list(ex.map(_sign_sequence, seqs, chunksize=max(1, count // (4 * workers))))
+        else:
+            _init_worker(self._key, tpl)
+            try:
+                signed = [_sign_sequence(s) for s in seqs]
+            finally:
+                _W.clear()
+        return {"signed": signed, "template_ms": template_ms, "total_ms": (time.perf_counter() - t0) * 1000}
 
 def sign_xrp_payment_tx(
     privkey_hex: str,
@@ -9,21 +143,9 @@ def sign_xrp_payment_tx(
     amount_drops: int,
     sequence: int,
     fee_drops: int,
-    flags: int = 2147483648,  # tfFullyCanonicalSig
+    flags: int = TF_FULLY_CANONICAL_SIG,
     network_id: int | None = None,
 ) -> str:
-    pubkey_hex, _ = derive_keypair(privkey_hex)
-    tx = {
-        "TransactionType": "Payment",
-        "Account": account,
-        "Destination": destination,
-        "Amount": str(int(amount_drops)),
-        "Sequence": int(sequence),
-        "Fee": str(int(fee_drops)),
-        "Flags": int(flags),
-        "SigningPubKey": pubkey_hex,
-    }
-    if network_id is not None: tx["NetworkID"] = int(network_id)
-    unsigned_blob = encode(tx)
-    tx["TxnSignature"] = sign(unsigned_blob, privkey_hex)
-    return encode(tx)  # signed blob hex (no 0x)
+    """One-shot helper; keep an XrpSigner when signing more than once."""
+    s = XrpSigner(privkey_hex)
+    return s.sign(s.payment(destination, amount_drops, fee_drops, sequence, flags, network_id, account=account))
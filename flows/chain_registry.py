@@ -0,0 +1,49 @@
+# chain_registry.py
+# Network type -> chain plugin. Plugins are imported the first time a network
+# using them is opened, so an ETH send never loads the BTC or XRP crypto stacks.
+#
+# A plugin module provides:
+#   FIELDS                     form schema: [{"name", "label", "kind", "default"?, "when"?}, ...]
+#                              kind: "numeric" | "text" | "address" | "utxos" | "choice"
+#   check(net, account)        optional; error string if this network/account can't be signed here
+#   build_unsigned(net, account, form) -> unsigned tx dict (raises ValueError; must not modify form)
+#   sign(session, net, account, unsigned, form) -> {
+#       "items":   [(blob, unsigned_for_blob), ...]   verified offline before export
+#       "signer":  expected signer address or None
+#       "payload": text shown as QR
+#       "path"?:   output file (default signed_tx.txt), "text"?: file content (default payload)
+#       "note"?:   message shown before the QR
+#   }
+import importlib
+
+_MODULES = {
+    "evm":  "flows.chains.evm",
+    "utxo": "flows.chains.utxo",
+    "xrp":  "flows.chains.xrp",
+}
+_loaded = {}
+
+def register(name: str, module_path: str):
+    """Add or replace a plugin; module_path is imported on first use."""
+    name = name.lower()
+    _MODULES[name] = module_path
+    _loaded.pop(name, None)
+
+def known_plugins() -> list:
+    return sorted(_MODULES)
+
+def plugin_name(net: dict) -> str:
+    """Networks name their plugin; older entries fall back to their type."""
+    return (net.get("plugin") or net.get("type") or "").lower()
+
+def get_plugin(name: str):
+    p = _loaded.get(name)
+    if p is None:
+        path = _MODULES.get(name)
+        if path is None:
+            raise KeyError(f"No chain plugin for '{name}'")
+        p = _loaded[name] = importlib.import_module(path)
+    return p
+
+def plugin_for(net: dict):
+    return get_plugin(plugin_name(net))
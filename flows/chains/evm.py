@@ -0,0 +1,98 @@
+# evm.py
+# EVM chain plugin: legacy transfer to the default receiver, single tx or fee-bump ladder.
+import json
+from pathlib import Path
+
+SIGNED_LADDER_PATH = Path("signed_ladder.json")
+
+# --- Default EVM receiver so you don't need to type/scan ---
+DEFAULT_EVM_RECEIVER = "0xb922645E90e9fCAea54029be2434EA10eE9Ef47e"
+
+# Optional convenience map; falls back to network['chain_id']
+CHAIN_IDS = {
+    "XDC": 50,
+    "ETHEREUM": 11155111,  # Sepolia
+}
+
+# Fixed gas settings to mirror the previous script
+GAS_LIMIT = 21000
+GAS_PRICE_WEI = 12_500_000_000  # 12.5 Gwei
+
+FIELDS = [
+    {"name": "amount", "label": "Amount ({symbol})", "kind": "numeric"},
+    {"name": "nonce", "label": "Nonce", "kind": "numeric"},
+    {"name": "mode", "label": "Signing mode", "kind": "choice",
+     "options": ["Single tx (12.5 Gwei)", "Fee-bump ladder"]},
+    {"name": "tiers", "label": "Tiers", "kind": "numeric", "default": "5", "when": ("mode", 1)},
+    {"name": "bump", "label": "Bump per tier (%)", "kind": "numeric", "default": "25", "when": ("mode", 1)},
+]
+
+def validate_receiver(receiver_address: str):
+    if not isinstance(receiver_address, str) or not receiver_address.strip():
+        raise ValueError("Receiver address is empty")
+    ra = receiver_address.strip()
+    if not ra.startswith("0x") or len(ra) != 42:
+        raise ValueError("Receiver address format invalid")
+    # ensure hex body
+    int(ra[2:], 16)
+
+def chain_id_for_net(net: dict) -> int:
+    key = (net.get("key") or "").upper()
+    name = (net.get("name") or "").upper()
+    if key in CHAIN_IDS: return CHAIN_IDS[key]
+    if name in CHAIN_IDS: return CHAIN_IDS[name]
+    return int(net.get("chain_id", 1))
+
+def build_unsigned(net: dict, account: dict, form: dict) -> dict:
+    validate_receiver(DEFAULT_EVM_RECEIVER)
+    try:
+        value_wei = int(float(form["amount"]) * 1e18)  # float*1e18 like the original script
+    except Exception:
+        raise ValueError("Invalid amount")
+    try:
+        nonce = int(form["nonce"])
+    except Exception:
+        raise ValueError("Invalid nonce")
+    # JSON-friendly; data MUST be "0x"
+    return {
+        "nonce": nonce,
+        "to": DEFAULT_EVM_RECEIVER,
+        "value": value_wei,
+        "gas": GAS_LIMIT,
+        "gasPrice": GAS_PRICE_WEI,
+        "chainId": chain_id_for_net(net),
+        "data": "0x"
+    }
+
+def _ladder(signer, unsigned: dict, form: dict) -> dict:
+    """Same nonce/to/value signed at rising gas prices; exported as one bundle."""
+    from crypto.fee_ladder import legacy_tiers, make_bundle, MIN_BUMP
+    try:
+        count = max(1, min(20, int(form["tiers"])))
+        tiers = legacy_tiers(unsigned["gasPrice"], count, 1 + float(form["bump"]) / 100)
+    except Exception as e:
+        raise ValueError(f"Invalid ladder:\n{e}\n(min bump {int(round((MIN_BUMP-1)*100))}%)")
+    bundle = make_bundle(signer, unsigned, tiers)
+    top = bundle["tiers"][-1]["gasPrice"] / 1e9
+    return {
+        "items": [(t["raw"], {**unsigned, "gasPrice": t["gasPrice"]}) for t in bundle["tiers"]],
+        "signer": signer.address,
+        "payload": json.dumps(bundle, separators=(",", ":")),
+        "path": SIGNED_LADDER_PATH,
+        "text": json.dumps(bundle, indent=2),
+        "note": f"Signed {count} tiers\n{tiers[0]['gasPrice']/1e9:.2f} → {top:.2f} Gwei",
+    }
+
+def sign(session, net: dict, account: dict, unsigned: dict, form: dict) -> dict:
+    # Session-cached EvmSigner (returns 0x-hex string)
+    from crypto.evm_signer import EvmSigner
+    signer = session.signer(net["key"], "evm", EvmSigner)
+    if signer is None:
+        raise ValueError("No private key for this network")
+    if form.get("mode") == 1:
+        return _ladder(signer, unsigned, form)
+    raw_hex = signer.sign_legacy(unsigned["to"], unsigned["value"], unsigned["nonce"],
+                                 unsigned["gas"], unsigned["gasPrice"], unsigned["chainId"])
+    if not isinstance(raw_hex, str): raw_hex = str(raw_hex)
+    if not raw_hex.startswith("0x"): raw_hex = "0x" + raw_hex
+    return {"items": [(raw_hex, unsigned)], "signer": account.get("address"), "payload": raw_hex}
@@ -0,0 +1,44 @@
+# utxo.py
+# Bitcoin (P2WPKH) chain plugin: manual UTXO entry, change back to our address.
+FIELDS = [
+    {"name": "recipient", "label": "BTC receiver", "kind": "address"},
+    {"name": "amount", "label": "Amount (BTC)", "kind": "numeric"},
+    {"name": "utxos", "label": "UTXOs", "kind": "utxos"},
+    {"name": "change_address", "label": "Change address", "kind": "text", "default": "{address}"},
+    {"name": "fee", "label": "Fee (sats)", "kind": "numeric"},
+]
+
+def check(net: dict, account: dict | None = None):
+    if (net.get("address_type") or "P2WPKH").upper() != "P2WPKH":
+        return "Only P2WPKH (bc1q) inputs can be signed"
+    return None
+
+def build_unsigned(net: dict, account: dict, form: dict) -> dict:
+    try:
+        value = int(round(float(form["amount"]) * 1e8))
+        fee = int(form["fee"])
+    except Exception:
+        raise ValueError("Invalid numeric BTC inputs")
+    utxos = form["utxos"]
+    total = sum(u["amount_sats"] for u in utxos)
+    change = total - value - fee
+    if change < 0:
+        raise ValueError("Value + Fee exceeds available UTXOs")
+    outputs = [{"address": form["recipient"], "amount_sats": value}]
+    if change > 0:
+        outputs.append({"address": form["change_address"], "amount_sats": change})
+    return {
+        "network": net["key"],
+        "utxos": utxos,
+        "outputs": outputs,
+        "fee_sats": fee,
+        "change_address": form["change_address"]
+    }
+
+def sign(session, net: dict, account: dict, unsigned: dict, form: dict) -> dict:
+    from crypto.btc_signer import sign_p2wpkh
+    pk = session.private_key(net["key"])
+    if not pk:
+        raise ValueError("No private key for BTC")
+    res = sign_p2wpkh(unsigned["utxos"], unsigned["outputs"], pk, network="mainnet")
+    return {"items": [(res["hex"], unsigned)], "signer": None, "payload": res["hex"]}
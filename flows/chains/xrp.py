@@ -0,0 +1,61 @@
+# xrp.py
+# XRP Ledger chain plugin: Payment, optionally pre-signed for a run of Sequences.
+import json
+
+FIELDS = [
+    {"name": "destination", "label": "XRP destination", "kind": "address"},
+    {"name": "amount", "label": "Amount (XRP)", "kind": "numeric"},
+    {"name": "sequence", "label": "Sequence", "kind": "numeric"},
+    {"name": "fee", "label": "Fee (drops)", "kind": "numeric"},
+    {"name": "count", "label": "How many (consecutive Sequence)", "kind": "numeric", "default": "1"},
+]
+
+def check(net: dict, account: dict | None = None):
+    from stores.session import is_legacy_xrp_account
+    if account and is_legacy_xrp_account(account, net):
+        return "XRP account is from an older version.\nRe-derive it: Settings → Add Wallet → Restore."
+    return None
+
+def _count(form: dict) -> int:
+    return max(1, int(form.get("count") or 1))
+
+def build_unsigned(net: dict, account: dict, form: dict) -> dict:
+    try:
+        amount_drops = int(round(float(form["amount"]) * 1_000_000))  # 1 XRP = 1e6 drops
+        sequence = int(form["sequence"])
+        fee = int(form["fee"])
+        _count(form)
+    except Exception:
+        raise ValueError("Invalid XRP number")
+    return {
+        "network": net["key"],
+        "TransactionType": "Payment",
+        "Account": account["address"],
+        "Destination": form["destination"],
+        "Amount": amount_drops,
+        "Sequence": sequence,
+        "Fee": fee,
+        "Flags": 2147483648
+    }
+
+def sign(session, net: dict, account: dict, unsigned: dict, form: dict) -> dict:
+    # Session-cached XrpSigner (hex blobs without 0x)
+    from crypto.xrp_signer import XrpSigner
+    signer = session.signer(net["key"], "xrp", XrpSigner)
+    if signer is None:
+        raise ValueError("No private key for XRP")
+    seq, count = unsigned["Sequence"], _count(form)
+    tx = signer.payment(unsigned["Destination"], unsigned["Amount"], unsigned["Fee"], seq,
+                        account=unsigned["Account"])
+    if count == 1:
+        blob = signer.sign(tx)
+        return {"items": [(blob, unsigned)], "signer": unsigned["Account"], "payload": blob}
+    run = signer.sign_sequence_range(tx, seq, count)
+    blobs = [r["blob"] for r in run["signed"]]
+    return {
+        "items": [(b, dict(unsigned, Sequence=seq + i)) for i, b in enumerate(blobs)],
+        "signer": unsigned["Account"],
+        "payload": json.dumps(blobs, separators=(",", ":")),
+        "text": "\n".join(blobs) + "\n",
+        "note": f"Signed Sequence {seq}..{seq+count-1}\n{run['total_ms']:.0f} ms total",
+    }
@@ -2,30 +2,20 @@
 import pygame
 from stores.settings import get_display_mode
 from stores.network_store import list_networks
-from stores.wallet_store import load_wallet
-import qrcode
-from PIL import Image
-from qr.qr_scanner import QRScanner
+from stores.session import current_session, SessionLocked
+from qr.qr_render import qr_surface
 
 WHITE=(255,255,255); BLACK=(0,0,0); OUT=(0,0,0); BG=(238,238,238)
 
-def _qr_surface(data, size=180):
-    qr=qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_Q, box_size=4, border=1)
-    qr.add_data(data); qr.make(fit=True)
-    img=qr.make_image(fill_color="black", back_color="white").convert("RGB")
-    img=img.resize((size,size), Image.NEAREST)
-    mode,size,data2=img.mode,img.size,img.tobytes()
-    import pygame as pg
-    return pg.image.fromstring(data2, size, mode)
-
 class ReceiveFlow:
     """
     RECEIVE:
       - Show my address QR
       - New: 'Scan Invoice' (webcam) to parse simple payment URIs (EIP-681 / BIP-21)
     """
-    def __init__(self, screen, renderer, title_font, body_font):
+    def __init__(self, screen, renderer, title_font, body_font, engine=None):
         self.sc=screen; self.r=renderer; self.tf=title_font; self.bf=body_font
+        self.eng=engine
         self.sw,self.sh=screen.get_size()
 
     def run(self):
@@ -40,43 +30,89 @@ class ReceiveFlow:
                     if hit is None: break
                     if hit==len(labels)-1: return
                     self._show_for_network(nets[hit])
+                    if current_session() is None: return   # locked meanwhile: back to the PIN gate
 
     def _show_for_network(self, net):
-        w=load_wallet()
-        acct=next((a for a in w["accounts"] if a["network_key"]==net["key"]), None)
-        self.sc.fill(WHITE)
-        self.sc.blit(self.tf.render(f"{net['name']} Receive", True, BLACK),(8,6))
+        s=current_session()
+        try:
+            acct=s.account(net["key"]) if s is not None else None
+            xpubs=s.xpubs() if s is not None else None
+        except SessionLocked:
+            s=None
+        if s is None:
+            return self._locked()
+        xpub=self.eng.xpub_for(net, xpubs) if self.eng is not None else None
+        if not acct and xpub:
+            # network added after the wallet was created: derive watch-only from the stored xpub
+            acct=self.eng.derive_from_xpub(xpub, net, 0)
         if not acct:
+            self.sc.fill(WHITE)
+            self.sc.blit(self.tf.render(f"{net['name']} Receive", True, BLACK),(8,6))
             self.sc.blit(self.bf.render("No account found. Create/Restore first.", True, BLACK),(8,28))
             pygame.display.flip(); self._wait_back(); return
         addr=acct["address"]; pub=acct["public_key"]
-        # address block
-        box=pygame.Rect(8, 28, self.sw-16, 46)
-        pygame.draw.rect(self.sc, BG, box, border_radius=8); pygame.draw.rect(self.sc, OUT, box, 1, border_radius=8)
-        self.sc.blit(self.bf.render(addr, True, BLACK), (box.x+6, box.y+14))
-        qr=_qr_surface(addr, 120); rect=qr.get_rect(center=(self.sw//2, self.sh//2+4))
-        self.sc.blit(qr, rect)
-        # buttons
         btn_pub   = pygame.Rect(8, self.sh-26, 84, 20)
         btn_scan  = pygame.Rect(98, self.sh-26, 92, 20)
+        btn_list  = pygame.Rect(196, self.sh-26, 56, 20)
         btn_back  = pygame.Rect(self.sw-60, self.sh-26, 52, 20)
-        for r,l in ((btn_pub,"PubKey QR"), (btn_scan,"Scan Invoice"), (btn_back,"Back")):
-            pygame.draw.rect(self.sc, (220,220,220), r, border_radius=6); pygame.draw.rect(self.sc, OUT, r, 1, border_radius=6)
-            self.sc.blit(self.bf.render(l, True, BLACK),(r.x+6, r.y+2))
-        pygame.display.flip()
+        buttons = [(btn_pub,"PubKey QR"), (btn_scan,"Scan Invoice"), (btn_back,"Back")]
+        if xpub: buttons.append((btn_list,"List"))
 
-        # loop
+        # account is loaded once; each sub-screen returns here and the page is redrawn
         while True:
-            for ev in pygame.event.get():
+            self.sc.fill(WHITE)
+            self.sc.blit(self.tf.render(f"{net['name']} Receive", True, BLACK),(8,6))
+            # address block
+            box=pygame.Rect(8, 28, self.sw-16, 46)
+            pygame.draw.rect(self.sc, BG, box, border_radius=8); pygame.draw.rect(self.sc, OUT, box, 1, border_radius=8)
+            self.sc.blit(self.bf.render(addr, True, BLACK), (box.x+6, box.y+14))
+            qr=qr_surface(addr, 120); rect=qr.get_rect(center=(self.sw//2, self.sh//2+4))
+            self.sc.blit(qr, rect)
+            for r,l in buttons:
+                pygame.draw.rect(self.sc, (220,220,220), r, border_radius=6); pygame.draw.rect(self.sc, OUT, r, 1, border_radius=6)
+                self.sc.blit(self.bf.render(l, True, BLACK),(r.x+6, r.y+2))
+            pygame.display.flip()
+
+            # sleeps until input
+            while True:
+                ev=pygame.event.wait()
                 if ev.type==pygame.QUIT: return
-                if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1:
-                    if btn_back.collidepoint(ev.pos): return
-                    if btn_pub.collidepoint(ev.pos):
-                        self._qr_modal(pub, "Public Key")
-                    if btn_scan.collidepoint(ev.pos):
-                        data = QRScanner(self.sc, self.tf, self.bf).scan()
-                        if data:
-                            self._show_invoice_info(net, data)
+                if ev.type!=pygame.MOUSEBUTTONDOWN or ev.button!=1: continue
+                if btn_back.collidepoint(ev.pos): return
+                if btn_pub.collidepoint(ev.pos):
+                    self._qr_modal(pub, "Public Key"); break
+                if xpub and btn_list.collidepoint(ev.pos):
+                    self._address_list(net, xpub); break
+                if btn_scan.collidepoint(ev.pos):
+                    from qr.qr_scanner import QRScanner
+                    data = QRScanner(self.sc, self.tf, self.bf).scan()
+                    if data:
+                        self._show_invoice_info(net, data)
+                    break
+            if current_session() is None: return   # locked while a sub-screen was open
+
+    def _address_list(self, net, xpub, per_page=8):
+        """Watch-only listing of receive addresses derived from the account xpub."""
+        page=0
+        while True:
+            rng=self.eng.derive_range(None, net, page*per_page, per_page, xpub=xpub)
+            self.sc.fill(WHITE)
+            self.sc.blit(self.tf.render(f"{net['name']} addresses", True, BLACK),(8,6))
+            y=28
+            for i, addr in enumerate(rng.addresses):
+                self.sc.blit(self.bf.render(f"{rng.start+i:>3} {addr}", True, BLACK),(6,y)); y+=20
+            prev=pygame.Rect(8, self.sh-26, 52, 20); nxt=pygame.Rect(66, self.sh-26, 52, 20)
+            back=pygame.Rect(self.sw-60, self.sh-26, 52, 20)
+            for r,l in ((prev,"Prev"), (nxt,"Next"), (back,"Back")):
+                pygame.draw.rect(self.sc,(220,220,220),r,border_radius=6); pygame.draw.rect(self.sc,OUT,r,1,border_radius=6)
+                self.sc.blit(self.bf.render(l, True, BLACK),(r.x+8, r.y+2))
+            pygame.display.flip()
+            ev=pygame.event.wait()
+            if ev.type==pygame.QUIT: return
+            if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1:
+                if back.collidepoint(ev.pos): return
+                if prev.collidepoint(ev.pos) and page>0: page-=1
+                if nxt.collidepoint(ev.pos): page+=1
 
     def _show_invoice_info(self, net, raw):
         """Very small parser for ethereum:/bitcoin: URIs; shows results."""
@@ -118,18 +154,25 @@ class ReceiveFlow:
                     return
 
     def _qr_modal(self, text, title):
+        self.sc.fill(WHITE)
+        self.sc.blit(self.tf.render(title, True, BLACK),(8,6))
+        qr=qr_surface(text, 180); rect=qr.get_rect(center=(self.sw//2, self.sh//2))
+        self.sc.blit(qr, rect)
+        btn=pygame.Rect(self.sw-60, 6, 52, 20)
+        pygame.draw.rect(self.sc, (220,220,220), btn, border_radius=6); pygame.draw.rect(self.sc, OUT, btn, 1, border_radius=6)
+        self.sc.blit(self.bf.render("Close", True, BLACK),(btn.x+6, btn.y+2))
+        pygame.display.flip()
         while True:
-            self.sc.fill(WHITE)
-            self.sc.blit(self.tf.render(title, True, BLACK),(8,6))
-            qr=_qr_surface(text, 180); rect=qr.get_rect(center=(self.sw//2, self.sh//2))
-            self.sc.blit(qr, rect)
-            btn=pygame.Rect(self.sw-60, 6, 52, 20)
-            pygame.draw.rect(self.sc, (220,220,220), btn, border_radius=6); pygame.draw.rect(self.sc, OUT, btn, 1, border_radius=6)
-            self.sc.blit(self.bf.render("Close", True, BLACK),(btn.x+6, btn.y+2))
-            pygame.display.flip()
-            for ev in pygame.event.get():
-                if ev.type==pygame.QUIT: return
-                if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1 and btn.collidepoint(ev.pos): return
+            ev=pygame.event.wait()
+            if ev.type==pygame.QUIT: return
+            if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1 and btn.collidepoint(ev.pos): return
+
+    def _locked(self):
+        self.sc.fill(WHITE)
+        self.sc.blit(self.tf.render("Notice", True, BLACK),(8,6))
+        self.sc.blit(self.bf.render("Session locked.", True, BLACK),(8,34))
+        self.sc.blit(self.bf.render("Enter PIN again.", True, BLACK),(8,50))
+        pygame.display.flip(); self._wait_back()
 
     def _wait_back(self):
         btn=pygame.Rect(self.sw-60, self.sh-26, 52, 20)
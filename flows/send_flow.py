@@ -6,36 +6,31 @@ from pathlib import Path
 from ui.on_screen_keyboard import OnScreenKeyboard
 from ui.numeric_keyboard import NumericKeyboard
 from stores.settings import get_display_mode
-from stores.network_store import list_networks
-from stores.wallet_store import load_wallet
-from qr.qr_chunker import show_paged
-from qr.qr_scanner import QRScanner
+from stores.network_store import list_networks, find_network_by_chain_id
+from stores.session import current_session, SessionLocked
+from flows.chain_registry import plugin_for
 
-# Signers
-from crypto.evm_signer import sign_legacy_tx            # ETH/XDC/EVM (legacy)
-# from btc_signer import sign_p2wpkh_single_input  # BTC P2WPKH
-from crypto.xrp_signer import sign_xrp_payment_tx       # XRP Payment
+# Per-chain forms/builders/signers live in flows/chains/* and are loaded by
+# chain_registry on first use. Batch/PSBT signers, tx_verify, qr.qr_chunker and
+# qr.qr_scanner are imported where they are first used.
 
 WHITE=(255,255,255); BLACK=(0,0,0); OUT=(0,0,0); BG=(238,238,238)
 
 UNSIGNED_PATH = Path("unsigned_tx.json")
 SIGNED_PATH   = Path("signed_tx.txt")
-
-# --- Default EVM receiver so you don't need to type/scan ---
-DEFAULT_EVM_RECEIVER = "0xb922645E90e9fCAea54029be2434EA10eE9Ef47e"
-
-# Optional convenience map; falls back to network['chain_id']
-CHAIN_IDS = {
-    "XDC": 50,
-    "ETHEREUM": 11155111,  # Sepolia
-}
+SIGNED_BATCH_PATH = Path("signed_batch.json")
+BATCH_LABEL   = "Batch (unsigned_tx.json)"
+PSBT_IN_PATH  = Path("unsigned.psbt")
+PSBT_OUT_PATH = Path("signed.psbt")
+PSBT_LABEL    = "BTC PSBT (file / QR)"
+QR_FPS        = 8     # animated (fountain) mode frame rate
+PSBT_PREVIEW  = 16    # outputs listed on the PSBT review pages
 
 class SendFlow:
-    """SEND aligned with your previous flow:
-       - EVM: strict 0x address validation, float->wei, fixed gas=21000 & 12.5 Gwei (editable if you prefer).
-       - BTC/XRP: collect fields, sign offline (btclib / xrpl-py).
-       Always writes unsigned_tx.json (first) and signed_tx.txt.
-       Uses DEFAULT_EVM_RECEIVER automatically.
+    """SEND: pick a network, then its chain plugin (flows/chains/*) supplies the
+       form, builds the unsigned tx and signs it offline.
+       Always writes unsigned_tx.json (first) and signed_tx.txt (or the plugin's file),
+       after an offline verification of every signed blob.
     """
     def __init__(self, screen, renderer, engine, title_font, body_font):
         self.sc=screen; self.r=renderer; self.eng=engine
@@ -44,7 +39,8 @@ class SendFlow:
 
     def run(self):
         nets=list_networks()
-        labels=[f"{n['name']} ({n['type']})" for n in nets]+["Back"]
+        extras=[(PSBT_LABEL, self._sign_psbt), (BATCH_LABEL, self._sign_batch_file)]
+        labels=[f"{n['name']} ({n['type']})" for n in nets]+[l for l,_ in extras]+["Back"]
         rects=self.r.draw_menu("Send → Select Network", labels, get_display_mode(self.r.settings))
         while True:
             for ev in pygame.event.get():
@@ -53,12 +49,8 @@ class SendFlow:
                     hit=self.r.hit_test(rects, ev.pos)
                     if hit is None: break
                     if hit==len(labels)-1: return
-                    net=nets[hit]
-                    t=(net.get("type") or "").lower()
-                    if t=="evm": self._send_evm_legacy_like_before(net)
-                    # elif t=="utxo": self._send_btc_sign(net)
-                    elif t=="xrp": self._send_xrp_sign(net)
-                    else: self._alert(f"Unsupported network type: {t}")
+                    if hit>=len(nets): extras[hit-len(nets)][1](); return
+                    self._send(nets[hit])
             pygame.time.Clock().tick(30)
 
     # ---------------- Helpers ----------------
@@ -78,255 +70,273 @@ class SendFlow:
                 if ev.type==pygame.QUIT: return
                 if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1 and btn.collidepoint(ev.pos): return
 
-    def _validate_evm_receiver_or_raise(self, receiver_address: str):
-        if not isinstance(receiver_address, str) or not receiver_address.strip():
-            raise ValueError("Receiver address is empty")
-        ra = receiver_address.strip()
-        if not ra.startswith("0x") or len(ra) != 42:
-            raise ValueError("Receiver address format invalid")
-        # ensure hex body
-        int(ra[2:], 16)
-
-    def _chain_id_for_net(self, net):
-        key = (net.get("key") or "").upper()
-        name = (net.get("name") or "").upper()
-        if key in CHAIN_IDS: return CHAIN_IDS[key]
-        if name in CHAIN_IDS: return CHAIN_IDS[name]
-        return int(net.get("chain_id", 1))
-
-    # ---------------- EVM (legacy-style, auto default receiver) ----------------
-    def _send_evm_legacy_like_before(self, net):
-        w=load_wallet()
-        acct=next((a for a in w.get("accounts", []) if (a.get("network_key") or "").upper()==(net["key"] or "").upper()), None)
-        if not acct:
-            self._alert("No account for this network.\nCreate/Restore wallet first.")
-            return
-
-        # Use your default receiver automatically
-        recv = DEFAULT_EVM_RECEIVER
-
-        # Validate receiver (0x + 40 hex)
-        try:
-            self._validate_evm_receiver_or_raise(recv)
-        except Exception as e:
-            self._alert(e); return
-
-        # Amount ETH → wei (float*1e18 like your code)
-        amt_str = NumericKeyboard(self.sc, f"Amount ({net.get('symbol','')})", "").run()
-        if amt_str is None: return
-        try:
-            value_wei = int(float(amt_str) * 1e18)
-        except Exception:
-            self._alert("Invalid amount"); return
-
-        # Nonce (int)
-        nonce_txt = NumericKeyboard(self.sc, "Nonce", "").run()
-        if nonce_txt is None: return
-        try:
-            nonce = int(nonce_txt)
-        except Exception:
-            self._alert("Invalid nonce"); return
-
-        # Fixed gas settings to mirror your previous script
-        gas = 21000
-        gas_price = 12_500_000_000  # 12.5 Gwei
-
-        chain_id = self._chain_id_for_net(net)
-
-        # Build unsigned tx (JSON-friendly; data MUST be "0x")
-        unsigned_tx = {
-            "nonce": nonce,
-            "to": recv,
-            "value": value_wei,
-            "gas": gas,
-            "gasPrice": gas_price,
-            "chainId": chain_id,
-            "data": "0x"
-        }
-
-        # Save unsigned BEFORE signing
-        try:
-            if UNSIGNED_PATH.exists(): UNSIGNED_PATH.unlink()
-        except Exception:
-            pass
-        UNSIGNED_PATH.write_text(json.dumps(unsigned_tx, indent=2))
-
-        # Sign (returns 0x-hex string; do NOT access .rawTransaction)
-        try:
-            raw_hex = sign_legacy_tx(
-                acct["private_key"], recv, value_wei, nonce, gas, gas_price, chain_id
-            )
-        except Exception as e:
-            self._alert(f"Sign error:\n{e}"); return
-
-        if not isinstance(raw_hex, str): raw_hex = str(raw_hex)
-        if not raw_hex.startswith("0x"): raw_hex = "0x"+raw_hex
-
-        SIGNED_PATH.write_text(raw_hex + ("\n" if not raw_hex.endswith("\n") else ""))
-        show_paged(self.sc, raw_hex, self.tf, self.bf, chunk_size=350)
-
-    # ---------------- BTC (collect + sign) ----------------
-    def _send_btc_sign(self, net):
-        # Destination & fee
-        recipient = self._ask_receiver_btc()
-        if not recipient: return
-        amt_btc = NumericKeyboard(self.sc, "Amount (BTC)", "").run()
-        if amt_btc is None: return
-
-        # UTXO info
-        utxo_txid = OnScreenKeyboard(self.sc, "Prev TXID (hex)", input_type="hex").run()
-        if not utxo_txid: return
-        utxo_index = NumericKeyboard(self.sc, "Prev Vout", "0").run()
-        if utxo_index is None: return
-        utxo_value = NumericKeyboard(self.sc, "UTXO Value (sats)", "").run()
-        if utxo_value is None: return
-
-        # Change (default: our BTC address)
-        w = load_wallet()
-        acc = next((a for a in w.get("accounts", []) if (a.get("network_key") or "").upper()=="BTC"), None)
-        if not acc:
-            self._alert("No BTC account; create/restore wallet first."); return
-        change_address = OnScreenKeyboard(self.sc, "Change address", default_text=acc["address"]).run()
-        if not change_address: return
-        fee_sats = NumericKeyboard(self.sc, "Fee (sats)", "").run()
-        if fee_sats is None: return
-
-        try:
-            value = int(float(amt_btc) * 1e8)
-            utxo_index = int(utxo_index)
-            utxo_value = int(utxo_value)
-            fee = int(fee_sats)
-        except Exception:
-            self._alert("Invalid numeric BTC inputs"); return
-
-        if value + fee > utxo_value:
-            self._alert("Value + Fee exceeds available UTXO"); return
-
-        unsigned = {
-            "network": "BTC",
-            "utxo": {"txid": utxo_txid, "vout": utxo_index, "amount_sats": utxo_value, "address": acc["address"]},
-            "to": recipient,
-            "send_amount_sats": value,
-            "fee_sats": fee,
-            "change_address": change_address
-        }
-
-        try:
-            if UNSIGNED_PATH.exists(): UNSIGNED_PATH.unlink()
-        except Exception:
-            pass
-        UNSIGNED_PATH.write_text(json.dumps(unsigned, indent=2))
-
-        # # Sign (single-input P2WPKH)
-        # try:
-        #     raw_hex = sign_p2wpkh_single_input(
-        #         privkey_hex=acc["private_key"],
-        #         utxo_txid_be_hex=utxo_txid,
-        #         utxo_vout=utxo_index,
-        #         utxo_amount_sats=utxo_value,
-        #         utxo_address=acc["address"],  # input owner script
-        #         recipient_address=recipient,
-        #         send_amount_sats=value,
-        #         fee_sats=fee,
-        #         change_address=change_address,
-        #         network="mainnet"
-        #     )
-        # except Exception as e:
-        #     self._alert(f"BTC sign error:\n{e}"); return
-
-        # SIGNED_PATH.write_text(raw_hex + ("\n" if not raw_hex.endswith("\n") else ""))
-        # show_paged(self.sc, raw_hex, self.tf, self.bf, chunk_size=350)
-
-    def _ask_receiver_btc(self):
-        # enter/scan BTC address
-        btn_scan=pygame.Rect(16, self.sh-30, 120, 22)
-        btn_manual=pygame.Rect(self.sw-140, self.sh-30, 120, 22)
+    def _choose(self, title, options):
+        """Vertical button list; returns the chosen index or None."""
+        rects=[pygame.Rect(16, 34+i*28, self.sw-32, 22) for i in range(len(options))]
+        self.sc.fill(WHITE)
+        self.sc.blit(self.tf.render(title, True, BLACK),(8,6))
+        for r,l in zip(rects, options):
+            pygame.draw.rect(self.sc,(220,220,220),r,border_radius=6)
+            pygame.draw.rect(self.sc,OUT,r,1,border_radius=6)
+            self.sc.blit(self.bf.render(l, True, BLACK),(r.x+6, r.y+2))
+        pygame.display.flip()
+        while True:
+            ev=pygame.event.wait()
+            if ev.type==pygame.QUIT: return None
+            if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1:
+                for i,r in enumerate(rects):
+                    if r.collidepoint(ev.pos): return i
+
+    def _review(self, title, lines):
+        """Read-only summary, paged to fit the screen; True once the last page is accepted."""
+        per = max(1, (self.sh - 64) // 16)
+        pages = [lines[i:i + per] for i in range(0, len(lines), per)] or [[]]
+        back = pygame.Rect(8, self.sh-26, 60, 20); nxt = pygame.Rect(self.sw-68, self.sh-26, 60, 20)
+        page = 0
         while True:
             self.sc.fill(WHITE)
-            self.sc.blit(self.tf.render("BTC receiver", True, BLACK),(8,6))
-            self.sc.blit(self.bf.render("Choose input method", True, BLACK),(8,28))
-            for r,l in ((btn_scan,"Scan QR (webcam)"), (btn_manual,"Manual Input")):
+            self.sc.blit(self.tf.render(f"{title} {page+1}/{len(pages)}" if len(pages) > 1 else title, True, BLACK),(8,6))
+            y = 30
+            for line in pages[page]:
+                self.sc.blit(self.bf.render(line, True, BLACK),(8,y)); y += 16
+            for r,l in ((back, "Cancel" if page == 0 else "Back"), (nxt, "Next")):
                 pygame.draw.rect(self.sc,(220,220,220),r,border_radius=6)
                 pygame.draw.rect(self.sc,OUT,r,1,border_radius=6)
                 self.sc.blit(self.bf.render(l, True, BLACK),(r.x+6, r.y+2))
             pygame.display.flip()
-            for ev in pygame.event.get():
-                if ev.type==pygame.QUIT: return None
-                if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1:
-                    if btn_scan.collidepoint(ev.pos):
-                        try:
-                            data = QRScanner(self.sc, self.tf, self.bf).scan()
-                        except TypeError:
-                            data = QRScanner(self.sc).scan()
-                        return data.strip() if data else None
-                    if btn_manual.collidepoint(ev.pos):
-                        addr = OnScreenKeyboard(self.sc, "").run()
-                        return addr.strip() if addr else None
-
-    # ---------------- XRP (collect + sign) ----------------
-    def _send_xrp_sign(self, net):
-        # Active XRP account
-        w = load_wallet()
-        acc = next((a for a in w.get("accounts", []) if (a.get("network_key") or "").upper()=="XRP"), None)
-        if not acc:
-            self._alert("No XRP account; create/restore wallet first."); return
-        account_addr = acc["address"]
-
-        destination = self._ask_receiver_xrp()
-        if not destination: return
-        amount_xrp = NumericKeyboard(self.sc, "Amount (XRP)", "").run()
-        if amount_xrp is None: return
-        sequence = NumericKeyboard(self.sc, "Sequence", "").run()
-        if sequence is None: return
-        fee_drops = NumericKeyboard(self.sc, "Fee (drops)", "").run()
-        if fee_drops is None: return
-
+            ev = pygame.event.wait()
+            if ev.type == pygame.QUIT: return False
+            if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
+                if back.collidepoint(ev.pos):
+                    if page == 0: return False
+                    page -= 1
+                elif nxt.collidepoint(ev.pos):
+                    if page == len(pages) - 1: return True
+                    page += 1
+
+    def _show_qr(self, payload):
+        from qr.qr_chunker import show_paged, show_animated, plan_pages
+        if len(plan_pages(payload)[0]) > 1:
+            mode = self._choose("Show QR", ["Animated (any order)", "Paged (Prev/Next)"])
+            if mode is None: return
+            if mode == 0:
+                show_animated(self.sc, payload, self.tf, self.bf, fps=QR_FPS); return
+        show_paged(self.sc, payload, self.tf, self.bf)
+
+    def _scan_qr(self):
+        from qr.qr_scanner import QRScanner
         try:
-            amount_drops = int(float(amount_xrp) * 1_000_000)  # 1 XRP = 1e6 drops
-            sequence_i = int(sequence)
-            fee_i = int(fee_drops)
-        except Exception:
-            self._alert("Invalid XRP number"); return
-
-        unsigned = {
-            "network": "XRP",
-            "TransactionType": "Payment",
-            "Account": account_addr,
-            "Destination": destination,
-            "Amount": amount_drops,
-            "Sequence": sequence_i,
-            "Fee": fee_i,
-            "Flags": 2147483648
-        }
-
+            return QRScanner(self.sc, self.tf, self.bf).scan()
+        except TypeError:
+            return QRScanner(self.sc).scan()
+
+    def _verified(self, blob, unsigned, expected_signer=None):
+        """Offline decode + signer check before a signed blob is exported."""
+        from crypto.tx_verify import verify_signed
+        r = verify_signed(blob, unsigned, expected_signer)
+        if not r["ok"]:
+            self._alert("Verification failed:\n" + "\n".join(p[:44] for p in r["problems"][:6])
+                        + "\nNothing exported.")
+        return r["ok"]
+
+    def _session_account(self, network_key):
+        """(session, public account) for network_key; alerts and returns (None, None) if unavailable."""
+        s = current_session()
+        try:
+            acct = s.account(network_key) if s is not None else None
+        except SessionLocked:
+            s = None
+        if s is None:
+            self._alert("Session locked.\nEnter PIN again."); return None, None
+        return s, acct
+
+    def _write_unsigned(self, unsigned):
+        """Save unsigned BEFORE signing."""
         try:
             if UNSIGNED_PATH.exists(): UNSIGNED_PATH.unlink()
         except Exception:
             pass
         UNSIGNED_PATH.write_text(json.dumps(unsigned, indent=2))
 
-        # Sign (returns hex blob without 0x)
+    # ---------------- Per-network send (chain plugins) ----------------
+    def _send(self, net):
         try:
-            blob_hex = sign_xrp_payment_tx(
-                privkey_hex=acc["private_key"],
-                account_address=account_addr,
-                destination=destination,
-                amount_drops=amount_drops,
-                sequence=sequence_i,
-                fee_drops=fee_i
-            )
+            plugin = plugin_for(net)
         except Exception as e:
-            self._alert(f"XRP sign error:\n{e}"); return
-
-        SIGNED_PATH.write_text(blob_hex + ("\n" if not blob_hex.endswith("\n") else ""))
-        show_paged(self.sc, blob_hex, self.tf, self.bf, chunk_size=350)
+            self._alert(f"Unsupported network:\n{e}"); return
+        sess, acct = self._session_account(net["key"])
+        if sess is None: return
+        if not acct:
+            self._alert("No account for this network.\nCreate/Restore wallet first."); return
+        check = getattr(plugin, "check", None)
+        err = check(net, acct) if check else None
+        if err:
+            self._alert(err); return
+
+        form = self._form(plugin.FIELDS, net, acct)
+        if form is None: return
+        try:
+            unsigned = plugin.build_unsigned(net, acct, form)
+        except ValueError as e:
+            self._alert(e); return
+        self._write_unsigned(unsigned)
 
-    def _ask_receiver_xrp(self):
+        try:
+            res = plugin.sign(sess, net, acct, unsigned, form)
+        except Exception as e:
+            self._alert(f"Sign error:\n{e}"); return
+        for blob, expected in res["items"]:
+            if not self._verified(blob, expected, res.get("signer")): return
+        path = Path(res.get("path") or SIGNED_PATH)
+        text = res.get("text") or res["payload"]
+        path.write_text(text if text.endswith("\n") else text + "\n")
+        if res.get("note"):
+            self._alert(f"{res['note']}\nSaved {path}")
+        self._show_qr(res["payload"])
+
+    def _form(self, fields, net, acct):
+        """Collect a plugin's FIELDS into {name: value}; None if the user backs out."""
+        fmt = {"symbol": "", **net, **acct}
+        form = {}
+        for f in fields:
+            when = f.get("when")
+            if when and form.get(when[0]) != when[1]: continue
+            label = f["label"].format(**fmt)
+            default = f.get("default", "").format(**fmt)
+            kind = f["kind"]
+            if kind == "numeric":
+                v = NumericKeyboard(self.sc, label, default).run()
+            elif kind == "text":
+                v = OnScreenKeyboard(self.sc, label, default_text=default).run() or None
+            elif kind == "address":
+                v = self._ask_receiver(label)
+            elif kind == "utxos":
+                v = self._ask_utxos(acct["address"]) or None
+            elif kind == "choice":
+                v = self._choose(label, f["options"] + ["Cancel"])
+                if v == len(f["options"]): v = None
+            else:
+                self._alert(f"Unknown field kind: {kind}"); return None
+            if v is None: return None
+            form[f["name"]] = v
+        return form
+
+    # ---------------- Batch (array in unsigned_tx.json) ----------------
+    def _batch_key_for(self, sess):
+        def key_for(tx, chain):
+            if chain == "evm":
+                net = find_network_by_chain_id(tx.get("chainId"))
+                key = (tx.get("network") or (net or {}).get("key") or "ETH").upper()
+            else:
+                key = chain.upper()
+            return key, sess.private_key(key)
+        return key_for
+
+    def _sign_batch_file(self):
+        try:
+            txs = json.loads(UNSIGNED_PATH.read_text())
+        except Exception as e:
+            self._alert(f"Cannot read {UNSIGNED_PATH}:\n{e}"); return
+        if isinstance(txs, dict): txs = [txs]
+        sess, _ = self._session_account("ETH")
+        if sess is None: return
+        addresses = {(a.get("network_key") or "").upper(): a.get("address") for a in sess.accounts()}
+        results = []; ok = 0
+        from crypto.batch_signer import sign_batch
+        from crypto.tx_verify import verify_signed
+        for r in sign_batch(txs, self._batch_key_for(sess)):
+            item = {k: r.get(k) for k in ("index", "ok", "chain", "signed", "error")}
+            if r["ok"]:
+                # same offline check as a single send; a failing item is dropped, not exported
+                tx = txs[r["index"]]
+                v = verify_signed(r["signed"], tx, None if r["chain"] == "btc" else addresses.get(r["account"]),
+                                  network=tx.get("btc_network", "mainnet"))
+                if not v["ok"]:
+                    item.update(ok=False, signed=None, error="verify: " + "; ".join(v["problems"][:2]))
+            results.append(item)
+            ok += bool(item["ok"])
+        SIGNED_BATCH_PATH.write_text(json.dumps(results, indent=2))
+        failed = [r for r in results if not r["ok"]]
+        msg = f"Signed {ok}/{len(results)}"
+        if failed:
+            msg += "\n" + "\n".join(f"#{r['index']}: {r['error'][:40]}" for r in failed[:6])
+        self._alert(msg)
+        signed = [r["signed"] for r in results if r["ok"]]
+        if signed:
+            self._show_qr(json.dumps(signed, separators=(",", ":")))
+
+    # ---------------- BTC PSBT (file or QR) ----------------
+    def _sign_psbt(self):
+        from crypto.psbt_stream import open_psbt, summarize, sign_psbt_file
+        src = self._choose("PSBT source", [f"File ({PSBT_IN_PATH})", "Scan QR (webcam)", "Back"])
+        if src is None or src == 2: return
+        if src == 0:
+            source = PSBT_IN_PATH
+        else:
+            source = self._scan_qr()
+            if not source: return
+            source = source.strip()
+        sess, acc = self._session_account("BTC")
+        if sess is None: return
+        if not acc:
+            self._alert("No BTC account; create/restore wallet first."); return
+        try:
+            f = open_psbt(source)
+            try:
+                s = summarize(f, preview=PSBT_PREVIEW)
+            finally:
+                f.close()
+        except Exception as e:
+            self._alert(f"Cannot read PSBT:\n{e}"); return
+        fee = s["fee_sats"]
+        lines = [f"{s['inputs']} inputs / {s['outputs']} outputs", f"Out: {s['out_sats']/1e8:.8f} BTC",
+                 "Fee: unknown (input amounts missing)" if fee is None
+                 else f"Fee: {fee} sats" if s["fee_verified"]
+                 else f"Fee: {fee} sats UNVERIFIED (no prev tx)"]
+        for a, addr in s["preview"]:
+            lines.append(f"{a/1e8:.8f} BTC" + (" (change)" if addr == acc["address"] else ""))
+            lines += [f"  {addr[i:i+40]}" for i in range(0, len(addr), 40)]   # full address, wrapped
+        if s["outputs"] > len(s["preview"]):
+            lines.append(f"+{s['outputs'] - len(s['preview'])} more outputs not shown")
+        if not self._review("Review PSBT", lines): return
+        mode = self._choose("Sign PSBT?", ["Sign → PSBT", "Sign → final tx", "Cancel"])
+        if mode is None or mode == 2: return
+        finalize = mode == 1
+        try:
+            info = sign_psbt_file(source, SIGNED_PATH if finalize else PSBT_OUT_PATH,
+                                  {acc["address"]: sess.private_key("BTC")}, finalize=finalize)
+        except Exception as e:
+            self._alert(f"PSBT sign error:\n{e}"); return
+        fee = info["fee_sats"]
+        fee_line = "" if fee is None else f"\nFee: {fee} sats" + ("" if info["fee_verified"] else " (unverified)")
+        self._alert(f"Signed {len(info['signed'])}/{info['inputs']} inputs{fee_line}\nSaved {info['path']}")
+        payload = Path(info["path"]).read_text().strip()
+        self._show_qr(payload)
+
+    # ---------------- Shared inputs ----------------
+    def _ask_utxos(self, address):
+        """Prompt for UTXOs until an empty TXID is entered."""
+        utxos = []
+        while True:
+            txid = OnScreenKeyboard(self.sc, f"Prev TXID #{len(utxos)+1} (blank = done)", input_type="hex").run()
+            if not txid: return utxos
+            vout = NumericKeyboard(self.sc, "Prev Vout", "0").run()
+            if vout is None: return utxos
+            value = NumericKeyboard(self.sc, "UTXO Value (sats)", "").run()
+            if value is None: return utxos
+            try:
+                if len(bytes.fromhex(txid.strip())) != 32: raise ValueError("TXID must be 64 hex chars")
+                utxos.append({"txid": txid.strip(), "vout": int(vout), "amount_sats": int(value), "address": address})
+            except Exception:
+                self._alert("Invalid UTXO; skipped")
+
+    def _ask_receiver(self, title):
+        # enter/scan receiver address
         btn_scan=pygame.Rect(16, self.sh-30, 120, 22)
         btn_manual=pygame.Rect(self.sw-140, self.sh-30, 120, 22)
         while True:
             self.sc.fill(WHITE)
-            self.sc.blit(self.tf.render("XRP destination", True, BLACK),(8,6))
+            self.sc.blit(self.tf.render(title, True, BLACK),(8,6))
             self.sc.blit(self.bf.render("Choose input method", True, BLACK),(8,28))
             for r,l in ((btn_scan,"Scan QR (webcam)"), (btn_manual,"Manual Input")):
                 pygame.draw.rect(self.sc,(220,220,220),r,border_radius=6)
@@ -337,10 +347,7 @@ class SendFlow:
                 if ev.type==pygame.QUIT: return None
                 if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1:
                     if btn_scan.collidepoint(ev.pos):
-                        try:
-                            data = QRScanner(self.sc, self.tf, self.bf).scan()
-                        except TypeError:
-                            data = QRScanner(self.sc).scan()
+                        data = self._scan_qr()
                         return data.strip() if data else None
                     if btn_manual.collidepoint(ev.pos):
                         addr = OnScreenKeyboard(self.sc, "").run()
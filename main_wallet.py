@@ -1,17 +1,16 @@
 # main_wallet.py
+# Only what the PIN gate and menus need is imported here; the wallet engine
+# (bip_utils/mnemonic), signers, QR and camera code load on first use.
 import sys, pygame
 from ui.ui_modes_demo import SimpleApp
-from crypto.wallet_engine import WalletEngine
-from ui.wallet_screens import WalletScreens
 from ui.on_screen_keyboard import OnScreenKeyboard
 from ui.network_forms import AddNetworkForm
 from ui.networks_screen import NetworksScreen
 from ui.pin_screen import PinScreen
-from flows.send_flow import SendFlow
-from flows.receive_flow import ReceiveFlow
 from ui.info_screen import InfoScreen
 from stores.file_ops import wipe_files
 from stores.wallet_store import load_wallet
+from stores.session import unlock, current_session, lock_session, SessionLocked
 from ui.wallet_manager import WalletManagerScreen
 from ui.add_wallet_screen import AddWalletScreen
 from ui.ui_mode_picker import UiModePicker
@@ -21,8 +20,8 @@ from ui.theme_store import theme_color
 class WalletApp(SimpleApp):
     def __init__(self):
         super().__init__()
-        self.engine = WalletEngine()
-        self.wscreens = WalletScreens(self.screen, self.renderer, self.engine)
+        self._engine = None
+        self._wscreens = None
         self.title_font = pygame.font.SysFont("dejavusans", 16, bold=True)
         self.body_font  = pygame.font.SysFont("dejavusans", 12)
 
@@ -31,11 +30,32 @@ class WalletApp(SimpleApp):
         self.first_run_items = ["Create Wallet", "Restore Wallet", "Settings", "Exit"]
         self.menu_items = ["Send", "Receive", "Add Custom Network", "Settings", "Info", "Delete"]
 
+    @property
+    def engine(self):
+        if self._engine is None:
+            from crypto.wallet_engine import WalletEngine
+            self._engine = WalletEngine()
+        return self._engine
+
+    @property
+    def wscreens(self):
+        if self._wscreens is None:
+            from ui.wallet_screens import WalletScreens
+            self._wscreens = WalletScreens(self.screen, self.renderer, self.engine)
+        return self._wscreens
+
     def run(self):
         while True:
+            # idle timeout: zeroise secrets and go back to the PIN gate
+            if self.state != "PIN":
+                s = current_session()
+                if s is None or s.expired():
+                    lock_session(); self.state = "PIN"
+
             if self.state == "PIN":
                 if not PinScreen(self.screen, self.title_font, self.body_font).gate():
                     pygame.quit(); sys.exit()
+                unlock(self.engine)
                 w=load_wallet(); self.state = "MENU" if w.get("seed_phrase") else "FIRST_RUN"
 
             elif self.state == "FIRST_RUN":
@@ -56,17 +76,19 @@ class WalletApp(SimpleApp):
             elif self.state == "NETWORKS":
                 ns = NetworksScreen(self.screen, self.renderer, self.engine,
                                     self.title_font, self.body_font,
-                                    last_seed_getter=lambda: self.wscreens.last_seed)
+                                    last_seed_getter=self._session_seed)
                 ns.run(); self.state="MENU"
 
             elif self.state == "ADD_NET":
                 AddNetworkForm(self.screen, self.title_font, self.body_font).run(); self.state="MENU"
 
             elif self.state == "SEND":
+                from flows.send_flow import SendFlow
                 SendFlow(self.screen, self.renderer, self.engine, self.title_font, self.body_font).run(); self.state="MENU"
 
             elif self.state == "RECEIVE":
-                ReceiveFlow(self.screen, self.renderer, self.title_font, self.body_font).run(); self.state="MENU"
+                from flows.receive_flow import ReceiveFlow
+                ReceiveFlow(self.screen, self.renderer, self.title_font, self.body_font, self.engine).run(); self.state="MENU"
 
             elif self.state == "INFO":
                 InfoScreen(self.screen, self.title_font, self.body_font).run(); self.state="MENU"
@@ -84,17 +106,28 @@ class WalletApp(SimpleApp):
                 ThemePicker(self.screen, self.renderer, self.title_font, self.body_font).run(); self.state="MENU"
 
             elif self.state == "DELETE":
-                self._confirm_delete(); self.state="PIN"
+                lock_session(); self._confirm_delete(); self.state="PIN"
 
             else:
                 pygame.quit(); sys.exit()
 
+    def _session_seed(self):
+        """Seed for NetworksScreen; raises SessionLocked once the session is gone."""
+        s = current_session()
+        if s is None: raise SessionLocked("Session locked")
+        return s.seed()
+
+    def _touch(self):
+        s = current_session()
+        if s is not None: s.touch()
+
     def _loop_first_run(self):
         from stores.settings import get_display_mode
         rects = self.renderer.draw_menu("Wallet: Create / Restore", self.first_run_items, get_display_mode(self.renderer.settings))
         for event in pygame.event.get():
             if event.type == pygame.QUIT: pygame.quit(); sys.exit()
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                self._touch()
                 hit = self.renderer.hit_test(rects, event.pos)
                 if hit is None: return
                 label = self.first_run_items[hit]
@@ -109,6 +142,7 @@ class WalletApp(SimpleApp):
         for event in pygame.event.get():
             if event.type == pygame.QUIT: pygame.quit(); sys.exit()
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                self._touch()
                 hit = self.renderer.hit_test(rects, event.pos)
                 if hit is None: return
                 label = self.menu_items[hit]
@@ -125,6 +159,7 @@ class WalletApp(SimpleApp):
             for event in pygame.event.get():
                 if event.type == pygame.QUIT: pygame.quit(); sys.exit()
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    self._touch()
                     hit = self.renderer.hit_test(rects, event.pos)
                     if hit is None: return
                     label = items[hit]
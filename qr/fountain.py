@@ -0,0 +1,156 @@
+# fountain.py
+# Fountain-coded (LT, UR-style) multi-frame QR transport. The payload is cut
+# into k equal fragments; frames 1..k carry them as-is, later frames carry the
+# XOR of a pseudo-random fragment set derived from (checksum, seq), so a reader
+# can rebuild the payload from any sufficient subset of frames in any order.
+#
+# Frame text (QR alphanumeric-safe):  UF/<seq>/<k>/<msg_len>/<crc32 hex>/<base43 part>
+import math, zlib
+from qr.payload_codec import b43encode, b43decode
+
+PREFIX = "UF/"
+DEFAULT_FRAGMENT_LEN = 200
+_MASK = (1 << 64) - 1
+
+class FountainError(ValueError):
+    pass
+
+class _Rng:
+    """splitmix64: tiny and identical on every platform (random.Random is not guaranteed to be)."""
+    __slots__ = ("s",)
+
+    def __init__(self, seed: int):
+        self.s = seed & _MASK
+
+    def next(self) -> int:
+        self.s = (self.s + 0x9E3779B97F4A7C15) & _MASK
+        z = self.s
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+        return z ^ (z >> 31)
+
+    def random(self) -> float:
+        return (self.next() >> 11) / float(1 << 53)
+
+def _degree(rng: _Rng, k: int) -> int:
+    """Ideal soliton: P(1) = 1/k, P(d) = 1/(d(d-1))."""
+    u = rng.random()
+    if u < 1 / k: return 1
+    return min(k, max(2, math.ceil(1 / (1 + 1 / k - u))))
+
+def part_indexes(seq: int, k: int, checksum: int) -> list:
+    """Fragment indexes mixed into frame `seq` (1-based); the first k frames are systematic."""
+    if seq <= k:
+        return [seq - 1]
+    rng = _Rng((checksum << 32) ^ seq)
+    d = _degree(rng, k)
+    idx = list(range(k))
+    for i in range(d):                       # partial Fisher-Yates
+        j = i + rng.next() % (k - i)
+        idx[i], idx[j] = idx[j], idx[i]
+    return sorted(idx[:d])
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, "big") ^ int.from_bytes(b, "big")).to_bytes(len(a), "big")
+
+def fragment_len_for(msg_len: int, k: int) -> int:
+    return -(-msg_len // k) if k else 0
+
+def is_frame(text) -> bool:
+    return isinstance(text, str) and text.startswith(PREFIX)
+
+def parse_frame(text: str):
+    """-> (seq, k, msg_len, checksum, part bytes)"""
+    try:
+        seq, k, msg_len, crc, body = text[len(PREFIX):].split("/", 4)
+        seq, k, msg_len, crc = int(seq), int(k), int(msg_len), int(crc, 16)
+        part = b43decode(body)
+    except Exception:
+        raise FountainError("Not a fountain QR frame")
+    if seq < 1 or k < 1 or len(part) != fragment_len_for(msg_len, k):
+        raise FountainError("Malformed fountain QR frame")
+    return seq, k, msg_len, crc, part
+
+class FountainEncoder:
+    """
+    enc = FountainEncoder(payload, fragment_len=200)
+    enc.frames()   -> frame texts for one animation cycle (k systematic + extra mixed)
+    enc.frame(seq) -> any single frame; seq can grow without bound
+    """
+    def __init__(self, data, fragment_len: int = DEFAULT_FRAGMENT_LEN):
+        data = data.encode("utf-8") if isinstance(data, str) else bytes(data)
+        self.msg_len = len(data)
+        self.checksum = zlib.crc32(data)
+        self.k = max(1, -(-len(data) // max(1, int(fragment_len))))
+        n = fragment_len_for(len(data), self.k)
+        data += b"\0" * (self.k * n - len(data))
+        self.fragments = [data[i * n:(i + 1) * n] for i in range(self.k)]
+
+    def part(self, seq: int) -> bytes:
+        idx = part_indexes(seq, self.k, self.checksum)
+        out = self.fragments[idx[0]]
+        for i in idx[1:]:
+            out = _xor(out, self.fragments[i])
+        return out
+
+    def frame(self, seq: int) -> str:
+        return f"{PREFIX}{seq}/{self.k}/{self.msg_len}/{self.checksum:08X}/{b43encode(self.part(seq))}"
+
+    def frames(self, extra: float = 0.5) -> list:
+        """One cycle: the k fragments plus ceil(k*extra) mixed frames (none for a single fragment)."""
+        n = self.k if self.k == 1 else self.k + max(2, math.ceil(self.k * extra))
+        return [self.frame(s) for s in range(1, n + 1)]
+
+class FountainDecoder:
+    """
+    dec = FountainDecoder()
+    dec.receive(frame_text) -> True once complete; dec.result is then the payload bytes
+    """
+    def __init__(self):
+        self.k = None; self.msg_len = None; self.checksum = None
+        self.solved = {}
+        self.pending = []          # [(set of fragment indexes, xor of those fragments)]
+        self.seen = set()
+        self.result = None
+
+    @property
+    def complete(self) -> bool:
+        return self.result is not None
+
+    @property
+    def progress(self) -> float:
+        return len(self.solved) / self.k if self.k else 0.0
+
+    def receive(self, text: str) -> bool:
+        seq, k, msg_len, crc, part = parse_frame(text)
+        if self.k is None:
+            self.k, self.msg_len, self.checksum = k, msg_len, crc
+        elif (k, msg_len, crc) != (self.k, self.msg_len, self.checksum):
+            raise FountainError("Frame belongs to a different payload")
+        if self.complete or seq in self.seen:
+            return self.complete
+        self.seen.add(seq)
+        self._reduce(set(part_indexes(seq, k, crc)), part)
+        if len(self.solved) == self.k:
+            data = b"".join(self.solved[i] for i in range(self.k))[:self.msg_len]
+            if zlib.crc32(data) != self.checksum:
+                raise FountainError("Checksum mismatch after reassembly")
+            self.result = data
+        return self.complete
+
+    def _reduce(self, idx: set, part: bytes):
+        queue = [(idx, part)]
+        while queue:
+            idx, part = queue.pop()
+            for i in [i for i in idx if i in self.solved]:
+                part = _xor(part, self.solved[i]); idx.discard(i)
+            if not idx:
+                continue
+            if len(idx) > 1:
+                self.pending.append((idx, part)); continue
+            i = idx.pop()
+            self.solved[i] = part
+            still = []
+            for p in self.pending:
+                (queue if i in p[0] else still).append(p)
+            self.pending = still
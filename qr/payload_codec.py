@@ -0,0 +1,142 @@
+# payload_codec.py
+# Compact framed envelope for QR export/import.
+#   envelope = MAGIC | type | flags | body | crc32(big-endian, over everything before it)
+# Hex blobs travel as raw bytes (half the size of their text), base64 (PSBT) as
+# its bytes, JSON as CBOR (if cbor2 is installed) or compact JSON; the body is
+# zlib'd when that makes it smaller. For the QR itself the envelope is written in
+# base43 and shown in QR alphanumeric mode (5.5 bits/char). Binary byte mode would
+# be ~8% denser, but cv2's decoder hands back str and mangles non-UTF-8 bytes.
+import base64, binascii, json, zlib
+
+MAGIC = 0x57
+QR_PREFIX = "WQ1:"
+B43 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ$*+-./:"   # QR alphanumeric minus space and %
+
+T_HEX, T_JSON, T_TEXT, T_BASE64 = 1, 2, 3, 4
+F_ZLIB, F_CBOR, F_0X, F_UPPER = 1, 2, 4, 8
+
+class PayloadError(ValueError):
+    pass
+
+def _cbor():
+    try:
+        import cbor2
+        return cbor2
+    except ImportError:
+        return None
+
+# ---- base43, RFC 9285 style: 2 bytes -> 3 chars, a trailing byte -> 2 chars ----
+_B43_INDEX = {c: i for i, c in enumerate(B43)}
+
+def b43encode(data: bytes) -> str:
+    out = []
+    for i in range(0, len(data) - 1, 2):
+        n = data[i] << 8 | data[i + 1]
+        out += (B43[n % 43], B43[n // 43 % 43], B43[n // 1849])
+    if len(data) % 2:
+        n = data[-1]
+        out += (B43[n % 43], B43[n // 43])
+    return "".join(out)
+
+def b43decode(text: str) -> bytes:
+    if len(text) % 3 == 1:
+        raise PayloadError("Bad base43 length")
+    try:
+        v = [_B43_INDEX[c] for c in text]
+    except KeyError:
+        raise PayloadError("Bad base43 character")
+    out = bytearray()
+    for i in range(0, len(v) - 2, 3):
+        n = v[i] + v[i + 1] * 43 + v[i + 2] * 1849
+        if n > 0xFFFF: raise PayloadError("Bad base43 block")
+        out += n.to_bytes(2, "big")
+    if len(v) % 3:
+        n = v[-2] + v[-1] * 43
+        if n > 0xFF: raise PayloadError("Bad base43 block")
+        out.append(n)
+    return bytes(out)
+
+# ---- envelope ----
+def _classify(text: str):
+    """-> (type, flags, body bytes) for the most compact exact representation of text."""
+    prefixed = text[:2] == "0x"
+    h = text[2:] if prefixed else text
+    if h and len(h) % 2 == 0 and h in (h.lower(), h.upper()):
+        try:
+            body = bytes.fromhex(h)
+        except ValueError:
+            body = None
+        if body is not None and body.hex() == h.lower():      # fromhex skips whitespace
+            return T_HEX, (F_0X if prefixed else 0) | (F_UPPER if h != h.lower() else 0), body
+    if text[:1] in ("{", "["):
+        try:
+            obj = json.loads(text)
+        except ValueError:
+            obj = None
+        if obj is not None:
+            cbor = _cbor()
+            if cbor is not None:
+                return T_JSON, F_CBOR, cbor.dumps(obj)
+            return T_JSON, 0, json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    if len(text) >= 16 and len(text) % 4 == 0:
+        try:
+            body = base64.b64decode(text, validate=True)
+            if base64.b64encode(body).decode("ascii") == text:
+                return T_BASE64, 0, body
+        except (binascii.Error, ValueError):
+            pass
+    return T_TEXT, 0, text.encode("utf-8")
+
+def pack(payload) -> bytes:
+    """str (hex / JSON / base64 / text) or a JSON-able dict/list -> envelope bytes."""
+    if not isinstance(payload, str):
+        payload = json.dumps(payload, separators=(",", ":"))
+    kind, flags, body = _classify(payload)
+    z = zlib.compress(body, 9)
+    if len(z) < len(body):
+        body, flags = z, flags | F_ZLIB
+    head = bytes((MAGIC, kind, flags)) + body
+    return head + zlib.crc32(head).to_bytes(4, "big")
+
+def unpack(env: bytes) -> str:
+    """Envelope bytes -> the payload text (JSON comes back compact)."""
+    if len(env) < 7 or env[0] != MAGIC:
+        raise PayloadError("Not a payload envelope")
+    if zlib.crc32(env[:-4]) != int.from_bytes(env[-4:], "big"):
+        raise PayloadError("Payload checksum mismatch")
+    kind, flags, body = env[1], env[2], env[3:-4]
+    if flags & F_ZLIB:
+        body = zlib.decompress(body)
+    if kind == T_HEX:
+        h = body.hex()
+        return ("0x" if flags & F_0X else "") + (h.upper() if flags & F_UPPER else h)
+    if kind == T_JSON:
+        if flags & F_CBOR:
+            cbor = _cbor()
+            if cbor is None:
+                raise PayloadError("CBOR payload needs the cbor2 package")
+            obj = cbor.loads(body)
+        else:
+            obj = json.loads(body)
+        return json.dumps(obj, separators=(",", ":"))
+    if kind == T_BASE64:
+        return base64.b64encode(body).decode("ascii")
+    if kind == T_TEXT:
+        return body.decode("utf-8")
+    raise PayloadError(f"Unknown payload type {kind}")
+
+# ---- QR text ----
+def to_qr_text(payload) -> str:
+    return QR_PREFIX + b43encode(pack(payload))
+
+def is_qr_text(text) -> bool:
+    return isinstance(text, str) and text.startswith(QR_PREFIX)
+
+def from_qr_text(text: str) -> str:
+    if not is_qr_text(text):
+        raise PayloadError("Not an encoded QR payload")
+    return unpack(b43decode(text[len(QR_PREFIX):]))
+
+def decode_scanned(text: str) -> str:
+    """Scanner output -> payload text; anything not produced by to_qr_text passes through."""
+    return from_qr_text(text) if is_qr_text(text) else text
@@ -0,0 +1,116 @@
+# qr_assembler.py
+# Multi-part QR import. Two framings are recognised:
+#   WP/<i>/<n>/<crc32 hex>/<chunk>   sequence-numbered pages from qr_chunker.show_paged
+#   UF/...                           fountain frames from qr_chunker.show_animated
+# Parts may arrive in any order and repeatedly; what has been received is kept
+# as a bitmap, so a missed page is simply picked up when it comes round again.
+# Anything else is a single-QR payload and completes immediately.
+import zlib
+from qr.payload_codec import decode_scanned, unpack, PayloadError
+from qr.fountain import FountainDecoder, FountainError, is_frame, parse_frame
+
+PART_PREFIX = "WP/"
+PART_HEADER_MAX = 24         # "WP/9999/9999/XXXXXXXX/"
+
+def make_parts(text: str, chunk: int) -> list:
+    """Cut text into sequence-numbered parts of `chunk` chars (one plain part if it fits)."""
+    if len(text) <= chunk:
+        return [text]
+    chunks = [text[i:i + chunk] for i in range(0, len(text), chunk)]
+    crc = zlib.crc32(text.encode("utf-8"))
+    return [f"{PART_PREFIX}{i}/{len(chunks)}/{crc:08X}/{c}" for i, c in enumerate(chunks, 1)]
+
+def is_part(text) -> bool:
+    return isinstance(text, str) and text.startswith(PART_PREFIX)
+
+def parse_part(text: str):
+    """-> (index 1..n, n, crc32, chunk)"""
+    try:
+        i, n, crc, chunk = text[len(PART_PREFIX):].split("/", 3)
+        i, n, crc = int(i), int(n), int(crc, 16)
+    except ValueError:
+        raise PayloadError("Malformed QR part")
+    if not 1 <= i <= n:
+        raise PayloadError("QR part index out of range")
+    return i, n, crc, chunk
+
+class QrAssembler:
+    """
+    asm = QrAssembler()
+    asm.add(scanned_text) -> True once complete; asm.result is the payload text
+    asm.received, asm.total   for a progress bar (0, 0 until a multi-part scan starts)
+    """
+    def __init__(self):
+        self.reset()
+        self.duplicates = 0
+
+    def reset(self):
+        self.mode = None             # None | "parts" | "fountain"
+        self.key = None              # identifies the payload being assembled
+        self.total = 0
+        self.bitmap = 0              # bit i-1 set once part/fragment i is known
+        self.chunks = {}
+        self.fountain = None
+        self.result = None
+        self._last = None
+
+    @property
+    def received(self) -> int:
+        return bin(self.bitmap).count("1")
+
+    @property
+    def progress(self) -> float:
+        return self.received / self.total if self.total else 0.0
+
+    def add(self, text: str) -> bool:
+        if self.result is not None:
+            return True
+        if text == self._last:                     # camera sees the same code every frame
+            self.duplicates += 1
+            return False
+        self._last = text
+        try:
+            if is_part(text):
+                self._add_part(text)
+            elif is_frame(text):
+                self._add_frame(text)
+            elif self.mode is None:
+                self.result = decode_scanned(text)
+        except ValueError:
+            pass                                   # unreadable or foreign code: keep scanning
+        return self.result is not None
+
+    def _start(self, mode, key, total):
+        if (mode, key) != (self.mode, self.key):   # a different payload is being shown
+            self.reset()
+            self.mode, self.key, self.total = mode, key, total
+
+    def _add_part(self, text):
+        i, n, crc, chunk = parse_part(text)
+        self._start("parts", (n, crc), n)
+        bit = 1 << (i - 1)
+        if self.bitmap & bit:
+            self.duplicates += 1; return
+        self.bitmap |= bit; self.chunks[i] = chunk
+        if self.bitmap == (1 << n) - 1:
+            joined = "".join(self.chunks[j] for j in range(1, n + 1))
+            if zlib.crc32(joined.encode("utf-8")) != crc:
+                self.reset(); raise PayloadError("QR parts checksum mismatch")
+            self.result = decode_scanned(joined)
+
+    def _add_frame(self, text):
+        _, k, msg_len, crc, _ = parse_frame(text)      # a malformed frame raises here
+        self._start("fountain", (k, msg_len, crc), k)
+        if self.fountain is None:
+            self.fountain = FountainDecoder()
+        try:
+            self.fountain.receive(text)
+        except FountainError:                          # reassembled data failed its crc
+            self.reset(); raise
+        for i in self.fountain.solved:
+            self.bitmap |= 1 << i
+        if self.fountain.complete:
+            try:
+                self.result = unpack(self.fountain.result)
+            except PayloadError:
+                self.reset(); raise
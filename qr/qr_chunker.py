@@ -1,43 +1,127 @@
 # qr_chunker.py
-import pygame, qrcode
-from PIL import Image
+from functools import lru_cache
+import pygame
+from qr.qr_render import qr_surface, render_qr, ecc_level, BORDER
+from qr.payload_codec import pack, to_qr_text
+from qr.qr_assembler import make_parts, PART_HEADER_MAX
+from ui.theme_store import get_qr_ecc, get_qr_min_module_px
 WHITE=(255,255,255); BLACK=(0,0,0); OUT=(0,0,0)
+QR_SIZE=180                      # on-screen QR size (px) on the 320x240 panel
+_ALNUM=frozenset("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:")
+_FRAME_HEADER=40                 # worst-case "UF/seq/k/len/crc/" prefix of a fountain frame
 
-def _to_surface(img: Image.Image):
-    mode,size,data=img.mode,img.size,img.tobytes()
-    import pygame as pg
-    return pg.image.fromstring(data,size,mode)
+# ---- capacity planning ----
+@lru_cache(maxsize=None)
+def capacities(mode: str, ecc: str) -> tuple:
+    """Characters one symbol holds for versions 1..40 (index 0 unused); mode 'alnum' or 'byte'."""
+    from qrcode import util
+    m=util.MODE_ALPHA_NUM if mode=="alnum" else util.MODE_8BIT_BYTE
+    caps=[0]
+    for v in range(1, 41):
+        bits=util.BIT_LIMIT_TABLE[ecc_level(ecc)][v]-4-util.length_in_bits(m, v)
+        caps.append(bits//11*2+(bits%11>=6) if mode=="alnum" else bits//8)
+    return tuple(caps)
 
-def _qr(data, size=180):
-    qr=qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_Q, box_size=4, border=1)
-    qr.add_data(data); qr.make(fit=True)
-    img=qr.make_image(fill_color="black", back_color="white").convert("RGB")
-    img=img.resize((size,size), Image.NEAREST)
-    return _to_surface(img)
+def max_version(size_px: int, min_module_px: int) -> int:
+    """Largest version whose modules (plus quiet zone) are still min_module_px wide at size_px."""
+    return max(1, min(40, (size_px//min_module_px-2*BORDER-17)//4))
 
-def show_paged(screen, text:str, title_font, body_font, chunk_size=350):
-    """Split long text into chunks and page with Prev/Next."""
-    chunks=[text[i:i+chunk_size] for i in range(0,len(text),chunk_size)] or [text]
-    i=0; clock=pygame.time.Clock()
+@lru_cache(maxsize=256)
+def plan(n: int, mode: str="alnum", size_px: int=QR_SIZE, ecc: str="Q", min_module_px: int=2):
+    """
+    -> (version, chunk_len, pages) for n characters: fewest pages at a scannable
+    version, then the smallest version that still holds the (equal) chunks.
+    Multi-page plans leave room for the qr_assembler part header on every page.
+    """
+    caps=capacities(mode, ecc); top=max_version(size_px, min_module_px)
+    reserve=0 if n<=caps[top] else PART_HEADER_MAX
+    pages=max(1, -(-n//(caps[top]-reserve)))
+    chunk=-(-n//pages)
+    return next(v for v in range(1, 41) if caps[v]-reserve>=chunk), chunk, pages
+
+def plan_pages(text: str, encoded=True, size_px: int=QR_SIZE):
+    """-> (page texts, version) exactly as show_paged will display them."""
+    if encoded: text=to_qr_text(text)
+    ecc, min_px=get_qr_ecc(), get_qr_min_module_px()
+    if _ALNUM.issuperset(text):
+        version, chunk, _=plan(len(text), "alnum", size_px, ecc, min_px)
+    else:
+        width=max((len(c.encode("utf-8")) for c in text), default=1)   # byte mode counts UTF-8 bytes
+        version, chunk, _=plan(len(text)*width, "byte", size_px, ecc, min_px)
+        chunk=max(1, chunk//width)
+    return make_parts(text, max(1, chunk)), version
+
+def show_paged(screen, text:str, title_font, body_font, chunk_size=None, encoded=True):
+    """
+    Split long text into chunks and page with Prev/Next. Redraws only on input.
+    encoded: send the payload_codec envelope (base43, QR alphanumeric mode).
+    chunk_size=None plans pages from the QR capacity tables (plan_pages) so every
+    page is the same, scannable version; an explicit chunk_size keeps fit=True.
+    Multi-page output is sequence-numbered for qr_assembler.
+    """
+    if chunk_size is None:
+        chunks, version=plan_pages(text, encoded, QR_SIZE)
+    else:
+        version=None
+        chunks=make_parts(to_qr_text(text) if encoded else text, chunk_size)
+    ecc=get_qr_ecc()
+    i=0
+    prev=pygame.Rect(8, screen.get_height()-26, 48, 20)
+    nxt =pygame.Rect(screen.get_width()-56, screen.get_height()-26, 48, 20)
+    cls =pygame.Rect(screen.get_width()-56, 6, 48, 20)
     while True:
         screen.fill(WHITE)
         screen.blit(title_font.render("Signed Tx (QR pages)", True, BLACK),(8,6))
         screen.blit(body_font.render(f"Page {i+1}/{len(chunks)}", True, BLACK),(8,26))
-        qr=_qr(chunks[i], 180); rect=qr.get_rect(center=(screen.get_width()//2, screen.get_height()//2+8))
+        qr=qr_surface(chunks[i], QR_SIZE, ecc, version=version); rect=qr.get_rect(center=(screen.get_width()//2, screen.get_height()//2+8))
         screen.blit(qr, rect)
         # buttons
-        prev=pygame.Rect(8, screen.get_height()-26, 48, 20)
-        nxt =pygame.Rect(screen.get_width()-56, screen.get_height()-26, 48, 20)
-        cls =pygame.Rect(screen.get_width()-56, 6, 48, 20)
         for r,l in ((prev,"Prev"), (nxt,"Next"), (cls,"Close")):
             pygame.draw.rect(screen, (220,220,220), r, border_radius=6)
             pygame.draw.rect(screen, OUT, r, 1, border_radius=6)
             screen.blit(body_font.render(l, True, BLACK),(r.x+6, r.y+2))
         pygame.display.flip()
-        for ev in pygame.event.get():
+        while True:
+            ev=pygame.event.wait()
             if ev.type==pygame.QUIT: return
             if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1:
-                if prev.collidepoint(ev.pos) and i>0: i-=1
-                elif nxt.collidepoint(ev.pos) and i<len(chunks)-1: i+=1
+                if prev.collidepoint(ev.pos) and i>0: i-=1; break
+                elif nxt.collidepoint(ev.pos) and i<len(chunks)-1: i+=1; break
                 elif cls.collidepoint(ev.pos): return
-        clock.tick(30)
+
+def show_animated(screen, text:str, title_font, body_font, fps=8, fragment_len=None):
+    """
+    Cycle fountain-coded frames (qr.fountain) at `fps`; a reader can rebuild the
+    payload from any sufficient subset. Each frame is rendered once, on first show.
+    fragment_len=None fills the largest scannable version (base43: 3 chars / 2 bytes).
+    """
+    from qr.fountain import FountainEncoder
+    ecc=get_qr_ecc(); version=None
+    if fragment_len is None:
+        version=max_version(QR_SIZE, get_qr_min_module_px())
+        fragment_len=max(16, (capacities("alnum", ecc)[version]-_FRAME_HEADER)*2//3)
+    enc=FountainEncoder(pack(text), fragment_len)   # frames carry the payload_codec envelope
+    frames=enc.frames(); surfs=[None]*len(frames)
+    slower=pygame.Rect(8, screen.get_height()-26, 28, 20)
+    faster=pygame.Rect(40, screen.get_height()-26, 28, 20)
+    cls   =pygame.Rect(screen.get_width()-56, 6, 48, 20)
+    i=0; clock=pygame.time.Clock()
+    while True:
+        for ev in pygame.event.get():
+            if ev.type==pygame.QUIT: return
+            if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1:
+                if cls.collidepoint(ev.pos): return
+                if slower.collidepoint(ev.pos): fps=max(1, fps-1)
+                if faster.collidepoint(ev.pos): fps=min(30, fps+1)
+        if surfs[i] is None: surfs[i]=render_qr(frames[i], QR_SIZE, ecc, version=version)
+        screen.fill(WHITE)
+        screen.blit(title_font.render("Signed Tx (animated QR)", True, BLACK),(8,6))
+        screen.blit(body_font.render(f"Frame {i+1}/{len(frames)}  ({enc.k} parts, {fps} fps)", True, BLACK),(8,26))
+        screen.blit(surfs[i], surfs[i].get_rect(center=(screen.get_width()//2, screen.get_height()//2+8)))
+        for r,l in ((slower,"-"), (faster,"+"), (cls,"Close")):
+            pygame.draw.rect(screen, (220,220,220), r, border_radius=6)
+            pygame.draw.rect(screen, OUT, r, 1, border_radius=6)
+            screen.blit(body_font.render(l, True, BLACK),(r.x+(r.w-body_font.size(l)[0])//2, r.y+2))
+        pygame.display.flip()
+        i=(i+1)%len(frames)
+        clock.tick(fps)
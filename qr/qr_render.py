@@ -0,0 +1,91 @@
+# qr_render.py
+# One QR rendering service for every screen. Encoding (version search + mask
+# selection) is the expensive part, so display-ready surfaces are kept in an
+# LRU keyed by (payload, size, ECC, colours, version); modal loops just blit. The module
+# matrix goes straight to a surface (NumPy repeat + surfarray), PIL is not used.
+# qrcode/numpy are imported on the first miss, never at startup.
+from collections import OrderedDict
+import pygame
+
+WHITE=(255,255,255); BLACK=(0,0,0)
+DEFAULT_ECC = "Q"
+BORDER = 1          # quiet zone, in modules
+
+def ecc_level(ecc: str) -> int:
+    import qrcode
+    return {"L": qrcode.constants.ERROR_CORRECT_L, "M": qrcode.constants.ERROR_CORRECT_M,
+            "Q": qrcode.constants.ERROR_CORRECT_Q, "H": qrcode.constants.ERROR_CORRECT_H}[ecc]
+
+def _encode(data, ecc, version=None):
+    """version=None searches for the smallest fitting version; otherwise it is fixed."""
+    import qrcode
+    qr = qrcode.QRCode(version=version, error_correction=ecc_level(ecc), box_size=1, border=BORDER)
+    # fixed version: one segment in one mode, exactly what qr_chunker.capacities() counts
+    qr.add_data(data, optimize=0 if version else 20); qr.make(fit=version is None)
+    return qr
+
+def matrix_to_surface(matrix, size, fg=BLACK, bg=WHITE):
+    """
+    Module matrix (rows of bools, quiet zone included) -> size x size surface.
+    Modules are scaled by a whole number of pixels and centred, so every module
+    has the same width; no PIL image, resize or byte round-trip.
+    """
+    n = len(matrix)
+    k = max(1, size // n)
+    side = max(size, n * k)
+    try:
+        import numpy as np
+        m = np.asarray(matrix, dtype=bool)
+        px = np.repeat(np.repeat(m, k, axis=0), k, axis=1)
+        rgb = np.where(px[..., None], np.array(fg, np.uint8), np.array(bg, np.uint8))
+        code = pygame.surfarray.make_surface(rgb.transpose(1, 0, 2))   # surfarray is (x, y)
+    except ImportError:
+        dark, light = bytes(fg), bytes(bg)
+        raw = b"".join(dark if v else light for row in matrix for v in row)
+        code = pygame.transform.scale(pygame.image.frombuffer(raw, (n, n), "RGB"), (n * k, n * k))
+    surf = pygame.Surface((side, side)); surf.fill(bg)
+    off = (side - n * k) // 2
+    surf.blit(code, (off, off))
+    # match the display's pixel format once so every later blit is a plain copy
+    return surf.convert() if pygame.display.get_surface() is not None else surf
+
+def render_qr(data: str, size: int = 180, ecc: str = DEFAULT_ECC, fg=BLACK, bg=WHITE, version=None):
+    """Uncached render, for callers that keep their own frames (e.g. animated QR)."""
+    return matrix_to_surface(_encode(data, ecc, version).get_matrix(), size, fg, bg)
+
+class QrRenderer:
+    """
+    r = QrRenderer(max_entries=32)
+    r.surface("bc1q...", 180)   -> pygame.Surface (cached; do not draw on it)
+    """
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self.hits = 0; self.misses = 0
+
+    def surface(self, data: str, size: int = 180, ecc: str = DEFAULT_ECC, fg=BLACK, bg=WHITE, version=None):
+        key = (data, int(size), ecc, tuple(fg), tuple(bg), version)
+        s = self._cache.get(key)
+        if s is not None:
+            self._cache.move_to_end(key); self.hits += 1
+            return s
+        self.misses += 1
+        s = self._cache[key] = render_qr(data, int(size), ecc, tuple(fg), tuple(bg), version)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return s
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+_renderer = QrRenderer()
+
+def qr_renderer() -> QrRenderer:
+    return _renderer
+
+def qr_surface(data: str, size: int = 180, ecc: str = DEFAULT_ECC, fg=BLACK, bg=WHITE, version=None):
+    """Cached display-ready QR surface shared by all screens."""
+    return _renderer.surface(data, size, ecc, fg, bg, version)
@@ -1,105 +1,244 @@
 # qr_scanner.py
+# Capture, decode and UI run on separate threads so a slow decode never stalls
+# the preview or swallows a Cancel click:
+#   capture thread -> FrameRing (bounded) -> decode worker(s) -> results queue -> pygame loop
+# Decoders always claim the newest frame and skip stale ones; the pygame loop
+# only converts/blits the latest frame when it is new.
+import queue, threading, time
+from collections import deque
 import pygame
 import cv2
 import numpy as np
+from qr.qr_assembler import QrAssembler
 
 WHITE=(255,255,255); BLACK=(0,0,0); OUT=(0,0,0)
 
+class _Rate:
+    """Events per second over the last `window` seconds (append/popleft are thread-safe)."""
+    def __init__(self, window=2.0):
+        self.window = window
+        self._t = deque()
+
+    def tick(self):
+        now = time.monotonic()
+        self._t.append(now)
+        while self._t and now - self._t[0] > self.window:
+            self._t.popleft()
+
+    def rate(self) -> float:
+        t = list(self._t)
+        if len(t) < 2 or time.monotonic() - t[-1] > self.window: return 0.0
+        return (len(t) - 1) / max(1e-6, t[-1] - t[0])
+
+class FrameRing:
+    """
+    Bounded ring of (seq, captured_at, frame). The writer never blocks; readers
+    get the newest frame. claim() hands each frame to at most one decoder and
+    counts the frames that no decoder took.
+    """
+    def __init__(self, size=3):
+        self._buf = deque(maxlen=size)
+        self._cv = threading.Condition()
+        self._seq = 0; self._claimed = 0
+        self.skipped = 0
+        self.closed = False
+
+    def put(self, frame):
+        with self._cv:
+            self._seq += 1
+            self._buf.append((self._seq, time.monotonic(), frame))
+            self._cv.notify_all()
+
+    def latest(self):
+        with self._cv:
+            return self._buf[-1] if self._buf else None
+
+    def claim(self, timeout=0.1):
+        """Newest frame not yet given to a decoder, or None on timeout/close."""
+        with self._cv:
+            self._cv.wait_for(lambda: self.closed or self._seq > self._claimed, timeout)
+            if self.closed or not self._buf or self._buf[-1][0] <= self._claimed:
+                return None
+            item = self._buf[-1]
+            self.skipped += item[0] - self._claimed - 1
+            self._claimed = item[0]
+            return item
+
+    def close(self):
+        with self._cv:
+            self.closed = True
+            self._cv.notify_all()
+
 class QRScanner:
     """
     Webcam QR scanner embedded in the 320x240 pygame UI.
     - Mouse-only: 'Cancel' button to exit
+    - Multi-part codes (numbered pages or animated fountain frames) are assembled
+      in any order with a progress bar; single codes return at once
     - Returns the decoded string, or None if cancelled
+    - stats(): capture/preview/decode FPS and decode latency (live or after scan)
     """
-    def __init__(self, screen, title_font, body_font, camera_index=0):
+    def __init__(self, screen, title_font, body_font, camera_index=0,
+                 decode_workers=1, ring_size=3, show_stats=False):
         self.sc = screen
         self.tf = title_font
         self.bf = body_font
         self.sw, self.sh = screen.get_size()
         self.cam_index = camera_index
-        self.detector = cv2.QRCodeDetector()
+        self.decode_workers = max(1, int(decode_workers))
+        self.ring_size = max(1, int(ring_size))
+        self.show_stats = show_stats
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self._capture_rate = _Rate(); self._preview_rate = _Rate(); self._decode_rate = _Rate()
+        self._latency_ms = deque(maxlen=64)
+        self._ring = None; self._asm = None
+
+    def stats(self) -> dict:
+        lat = sorted(self._latency_ms)
+        return {
+            "capture_fps": round(self._capture_rate.rate(), 1),
+            "preview_fps": round(self._preview_rate.rate(), 1),
+            "decode_fps": round(self._decode_rate.rate(), 1),
+            "decode_ms_last": round(self._latency_ms[-1], 1) if lat else None,
+            "decode_ms_avg": round(sum(lat) / len(lat), 1) if lat else None,
+            "decode_ms_p95": round(lat[int(0.95 * (len(lat) - 1))], 1) if lat else None,
+            "frames_skipped": self._ring.skipped if self._ring else 0,
+            "duplicates": self._asm.duplicates if self._asm else 0,
+        }
+
+    # ---- threads ----
+    def _capture(self, cap, ring, stop, failed):
+        """Sole owner of `cap` once started: it is released here, never while read() may be running."""
+        try:
+            while not stop.is_set():
+                ok, frame = cap.read()
+                if not ok:
+                    failed.set(); break
+                ring.put(frame)
+                self._capture_rate.tick()
+        finally:
+            ring.close()
+            cap.release()
 
+    def _decode(self, ring, results, stop):
+        detector = cv2.QRCodeDetector()          # one per thread; detectors are not shared
+        multi = hasattr(detector, "detectAndDecodeMulti")
+        while not stop.is_set():
+            item = ring.claim()
+            if item is None:
+                if ring.closed: return
+                continue
+            _, captured_at, frame = item
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            try:
+                # Prefer detectAndDecodeMulti if available, else fallback
+                if multi:
+                    _, data_list, _, _ = detector.detectAndDecodeMulti(gray)
+                    data = [d for d in data_list if d]
+                else:
+                    d, _, _ = detector.detectAndDecode(gray)
+                    data = [d] if d else []
+            except Exception:
+                data = []
+            self._latency_ms.append((time.monotonic() - captured_at) * 1000)
+            self._decode_rate.tick()
+            for d in data:
+                results.put(d)
+
+    # ---- UI ----
     def scan(self, timeout_ms=0):
         cap = cv2.VideoCapture(self.cam_index, cv2.CAP_DSHOW)  # CAP_DSHOW helps on Windows
         if not cap.isOpened():
+            cap.release()
             self._alert("Camera not available.\nTry a different index (0 or 1).")
             return None
         # try to reduce load
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
 
+        self._reset_stats()
+        ring = self._ring = FrameRing(self.ring_size)
+        asm = self._asm = QrAssembler()
+        results = queue.Queue(); stop = threading.Event(); failed = threading.Event()
+        threads = [threading.Thread(target=self._capture, args=(cap, ring, stop, failed), name="qr-capture", daemon=True)]
+        threads += [threading.Thread(target=self._decode, args=(ring, results, stop), name=f"qr-decode-{i}", daemon=True)
+                    for i in range(self.decode_workers)]
+        for t in threads: t.start()
+
+        btn = pygame.Rect(self.sw-68, 6, 60, 20)
+        target_h = self.sh - 40
         clock = pygame.time.Clock()
         start_ticks = pygame.time.get_ticks()
-
-        decoded = None
-        while True:
-            ok, frame = cap.read()
-            if not ok:
-                decoded = None
-                break
-
-            # Detect + decode
-            try:
-                # Prefer detectAndDecodeMulti if available, else fallback
-                if hasattr(self.detector, "detectAndDecodeMulti"):
-                    data_list, pts, _ = self.detector.detectAndDecodeMulti(frame)
-                    decoded = next((d for d in data_list if d), None)
-                else:
-                    decoded, pts, _ = self.detector.detectAndDecode(frame)
-            except Exception:
-                decoded = None
-                pts = None
-
-            # draw to pygame
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            surf = pygame.image.frombuffer(frame_rgb.tobytes(), frame_rgb.shape[1::-1], "RGB")
-            # scale to fit 320x200 area
-            target_h = self.sh - 40
-            scale = min(self.sw / surf.get_width(), target_h / surf.get_height())
-            disp_w = int(surf.get_width()*scale)
-            disp_h = int(surf.get_height()*scale)
-            surf = pygame.transform.smoothscale(surf, (disp_w, disp_h))
-
-            self.sc.fill(WHITE)
-            self.sc.blit(self.tf.render("QR Scanner", True, BLACK), (8, 6))
-            x = (self.sw - disp_w)//2
-            y = 28 + (target_h - disp_h)//2
-            self.sc.blit(surf, (x, y))
-
-            # cancel button
-            btn = pygame.Rect(self.sw-68, 6, 60, 20)
-            pygame.draw.rect(self.sc, (220,220,220), btn, border_radius=6)
-            pygame.draw.rect(self.sc, OUT, btn, 1, border_radius=6)
-            self.sc.blit(self.bf.render("Cancel", True, BLACK), (btn.x+6, btn.y+2))
-
-            # helper hint
-            self.sc.blit(self.bf.render("Hold QR code in front of camera", True, BLACK), (8, self.sh-18))
-
-            pygame.display.flip()
-
-            # finish if decoded
-            if decoded:
-                break
-
-            # cancel / timeout
-            for ev in pygame.event.get():
-                if ev.type == pygame.QUIT:
-                    decoded = None
+        shown_seq = 0; preview = None; decoded = None
+        try:
+            while decoded is None:
+                # cancel / quit are handled first, every tick
+                if any(ev.type == pygame.QUIT or (ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1
+                                                  and btn.collidepoint(ev.pos)) for ev in pygame.event.get()):
+                    break
+                if failed.is_set():
+                    break
+                if timeout_ms and pygame.time.get_ticks() - start_ticks > timeout_ms:
                     break
-                if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
-                    if btn.collidepoint(ev.pos):
-                        decoded = None
+
+                # decoded strings -> assembler (multi-part payloads finish here)
+                while True:
+                    try:
+                        text = results.get_nowait()
+                    except queue.Empty:
                         break
+                    if asm.add(text):
+                        decoded = asm.result; break
+
+                # preview: convert only a frame we have not shown yet, at display size
+                latest = ring.latest()
+                if latest is not None and latest[0] != shown_seq:
+                    shown_seq, _, frame = latest
+                    h, w = frame.shape[:2]
+                    scale = min(self.sw / w, target_h / h)
+                    small = cv2.resize(frame, (int(w*scale), int(h*scale)), interpolation=cv2.INTER_AREA)
+                    rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+                    preview = pygame.image.frombuffer(rgb.tobytes(), rgb.shape[1::-1], "RGB")
+                    self._preview_rate.tick()
 
-            if decoded is None and timeout_ms and (pygame.time.get_ticks() - start_ticks > timeout_ms):
-                break
+                self.sc.fill(WHITE)
+                self.sc.blit(self.tf.render("QR Scanner", True, BLACK), (8, 6))
+                if preview is not None:
+                    self.sc.blit(preview, ((self.sw - preview.get_width())//2, 28 + (target_h - preview.get_height())//2))
 
-            clock.tick(30)
+                # cancel button
+                pygame.draw.rect(self.sc, (220,220,220), btn, border_radius=6)
+                pygame.draw.rect(self.sc, OUT, btn, 1, border_radius=6)
+                self.sc.blit(self.bf.render("Cancel", True, BLACK), (btn.x+6, btn.y+2))
 
-        cap.release()
-        cv2.destroyAllWindows()
+                # helper hint / multi-part progress
+                if asm.total:
+                    self._progress(asm)
+                else:
+                    self.sc.blit(self.bf.render("Hold QR code in front of camera", True, BLACK), (8, self.sh-18))
+                if self.show_stats:
+                    s = self.stats()
+                    self.sc.blit(self.bf.render(f"cap {s['capture_fps']:.0f} dec {s['decode_fps']:.0f} fps "
+                                                f"{s['decode_ms_avg'] or 0:.0f} ms", True, BLACK), (8, 24))
+                pygame.display.flip()
+                clock.tick(30)
+        finally:
+            stop.set(); ring.close()
+            # the capture thread releases the camera itself once its read() returns
+            for t in threads: t.join(timeout=1.0)
+            cv2.destroyAllWindows()
         return decoded
 
+    def _progress(self, asm):
+        bar = pygame.Rect(8, self.sh-14, self.sw-16, 8)
+        self.sc.blit(self.bf.render(f"Parts {asm.received}/{asm.total} - any order", True, BLACK), (8, self.sh-30))
+        pygame.draw.rect(self.sc, (220,220,220), bar, border_radius=4)
+        fill = bar.copy(); fill.w = int(bar.w * asm.progress)
+        if fill.w: pygame.draw.rect(self.sc, BLACK, fill, border_radius=4)
+        pygame.draw.rect(self.sc, OUT, bar, 1, border_radius=4)
+
     def _alert(self, msg):
         self.sc.fill(WHITE)
         self.sc.blit(self.tf.render("QR Scanner", True, BLACK), (8, 6))
@@ -1,5 +1,5 @@
 # network_store.py
-import json
+import json, copy
 from pathlib import Path
 
 NETWORKS_PATH = Path("networks.json")
@@ -12,6 +12,7 @@ _DEFAULTS = {
             "key": "ETH",
             "name": "Ethereum",
             "type": "evm",
+            "plugin": "evm",
             "symbol": "ETH",
             "chain_id": 1,  # change to 11155111 if you want Sepolia by default
             "derivation_path": "m/44'/60'/0'/0/{index}"
@@ -20,6 +21,7 @@ _DEFAULTS = {
             "key": "XDC",
             "name": "XDC Network",
             "type": "evm",
+            "plugin": "evm",
             "symbol": "XDC",
             "chain_id": 50,
             "derivation_path": "m/44'/60'/0'/0/{index}"
@@ -29,6 +31,7 @@ _DEFAULTS = {
             "key": "BTC",
             "name": "Bitcoin",
             "type": "utxo",
+            "plugin": "utxo",
             "symbol": "BTC",
             "address_type": "P2WPKH",
             "coin_type": 0,
@@ -39,6 +42,7 @@ _DEFAULTS = {
             "key": "XRP",
             "name": "XRP Ledger",
             "type": "xrp",
+            "plugin": "xrp",
             "symbol": "XRP",
             "derivation_path": "m/44'/144'/0'/0/{index}"
         }
@@ -59,33 +63,125 @@ def _merge_defaults(data: dict) -> dict:
     if not isinstance(nets, list):
         nets = []
     have = {n.get("key") for n in nets if isinstance(n, dict)}
+    for n in nets:
+        # every entry names its chain plugin (flows/chain_registry); older files lack it
+        if isinstance(n, dict) and not n.get("plugin") and n.get("type"):
+            n["plugin"] = str(n["type"]).lower()
     for b in _DEFAULTS["networks"]:
         if b["key"] not in have:
-            nets.append(b)
+            nets.append(dict(b))
     data["version"] = data.get("version", _DEFAULTS["version"])
     data["networks"] = nets
     return data
 
+class NetworkRegistry:
+    """
+    In-memory view of networks.json.
+    - Reads and normalizes once; re-reads only when the file's (mtime, size) changes.
+    - Writes back only if normalization actually changed the content.
+    - Keeps key -> network and chain_id -> network indexes for O(1) lookups.
+    """
+    def __init__(self, path: Path):
+        self.path = path
+        self._data = None
+        self._stamp = None
+        self._by_key = {}
+        self._by_chain = {}
+
+    def _file_stamp(self):
+        try:
+            st = self.path.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _reindex(self):
+        self._by_key = {}; self._by_chain = {}
+        for n in self._data["networks"]:
+            if not isinstance(n, dict): continue
+            key = (n.get("key") or "").upper()
+            if key: self._by_key.setdefault(key, n)
+            cid = n.get("chain_id")
+            if (n.get("type") or "").lower() == "evm" and cid is not None:
+                try: self._by_chain.setdefault(int(cid), n)
+                except (TypeError, ValueError): pass
+
+    def _store(self, data: dict, write: bool):
+        if write:
+            self.path.write_text(json.dumps(data, indent=2))
+        self._data = data
+        self._stamp = self._file_stamp()
+        self._reindex()
+
+    def data(self) -> dict:
+        stamp = self._file_stamp()
+        if self._data is not None and stamp == self._stamp:
+            return self._data
+        raw = None
+        if stamp is not None:
+            try:
+                raw = json.loads(self.path.read_text() or "{}")
+            except Exception:
+                raw = None
+        data = _merge_defaults(copy.deepcopy(raw) if isinstance(raw, dict) else {})
+        self._store(data, write=(data != raw))
+        return self._data
+
+    def get(self, key: str):
+        self.data()
+        return self._by_key.get((key or "").upper().strip())
+
+    def by_chain_id(self, chain_id):
+        self.data()
+        try: return self._by_chain.get(int(chain_id))
+        except (TypeError, ValueError): return None
+
+    def save(self, data: dict):
+        data = _merge_defaults(copy.deepcopy(data))
+        if data == self._data and self._file_stamp() == self._stamp:
+            return
+        self._store(data, write=True)
+
+    def upsert(self, net: dict):
+        data = copy.deepcopy(self.data())
+        key = net["key"]
+        nets = data["networks"]
+        existing = self._by_key.get(key)
+        if existing is not None:
+            nets[self._data["networks"].index(existing)] = net
+        else:
+            nets.append(net)
+        self._store(data, write=True)
+
+    def invalidate(self):
+        self._data = None; self._stamp = None
+
+_registry = NetworkRegistry(NETWORKS_PATH)
+
+def network_registry() -> NetworkRegistry:
+    return _registry
+
 def load_networks() -> dict:
-    if not NETWORKS_PATH.exists():
-        data = _merge_defaults({"version": _DEFAULTS["version"], "networks": []})
-        _save(data)
-        return data
-    try:
-        data = json.loads(NETWORKS_PATH.read_text() or "{}")
-    except Exception:
-        data = {}
-    data = _merge_defaults(data)
-    _save(data)  # keep file normalized
-    return data
+    """Normalized networks object (a copy; mutate via save_networks/add_network)."""
+    return copy.deepcopy(_registry.data())
 
 def save_networks(data: dict):
     """Overwrite the full object (use sparingly)."""
-    _save(_merge_defaults(data))
+    _registry.save(data)
 
 def list_networks() -> list:
     """Return the list of networks (built-ins + custom), normalized."""
-    return load_networks()["networks"]
+    return [dict(n) for n in _registry.data()["networks"]]
+
+def get_network(key: str):
+    """Network by key (case-insensitive) or None."""
+    n = _registry.get(key)
+    return dict(n) if n is not None else None
+
+def find_network_by_chain_id(chain_id):
+    """First EVM network declaring this chain_id, or None."""
+    n = _registry.by_chain_id(chain_id)
+    return dict(n) if n is not None else None
 
 def add_network(net: dict):
     """
@@ -126,28 +222,16 @@ def add_network(net: dict):
         "key": key,
         "name": name,
         "type": "evm",
+        "plugin": "evm",
         "symbol": symbol,
         "chain_id": chain_id,
         "derivation_path": derivation_path,
     }
 
-    data = load_networks()
-    nets = data["networks"]
-
     # If an entry with this key exists and is non-EVM (BTC/XRP), block it.
-    for existing in nets:
-        if (existing.get("key") or "").upper() == key and (existing.get("type") or "").lower() != "evm":
-            raise ValueError(f"Cannot replace non-EVM built-in '{key}'")
-
-    # Upsert by key
-    replaced = False
-    for i, existing in enumerate(nets):
-        if (existing.get("key") or "").upper() == key:
-            nets[i] = new_obj
-            replaced = True
-            break
-    if not replaced:
-        nets.append(new_obj)
+    existing = _registry.get(key)
+    if existing is not None and (existing.get("type") or "").lower() != "evm":
+        raise ValueError(f"Cannot replace non-EVM built-in '{key}'")
 
-    data["networks"] = nets
-    _save(data)
+    # Upsert by key (indexed)
+    _registry.upsert(new_obj)
@@ -0,0 +1,198 @@
+# session.py
+# Unlocked-session secret cache: created after the PIN gate succeeds, holds the
+# active wallet's seed and private keys in memory so signing/previews skip disk
+# reads and seed stretching. Secrets live in bytearrays that are overwritten on
+# lock(), wallet switch and idle timeout.
+import re, time
+from stores.wallet_store import get_active_wallet_name, load_wallet, save_wallet
+
+IDLE_TIMEOUT_S = 300
+_XRP_CLASSIC = re.compile(r"^r[1-9A-HJ-NP-Za-km-z]{24,34}$")
+
+def is_legacy_xrp_account(account: dict, net: dict | None = None) -> bool:
+    """
+    XRP account saved before XRP had its own derivation: stored as network_type
+    "utxo" with a bc1 address and WIF key, so the network decides, not the entry.
+    """
+    if _XRP_CLASSIC.match(account.get("address") or ""): return False
+    if (account.get("network_type") or "").lower() == "xrp": return True
+    if net is None:
+        from stores.network_store import get_network
+        net = get_network(account.get("network_key") or "") or {}
+    return (net.get("type") or "").lower() == "xrp"
+
+def _clear_qr_cache():
+    """Drop every cached QR surface; a secret rendered through the cache must not outlive the session."""
+    from qr.qr_render import qr_renderer
+    qr_renderer().clear()
+
+class SessionLocked(Exception):
+    pass
+
+def _wipe(buf):
+    if buf is not None:
+        for i in range(len(buf)): buf[i] = 0
+
+class UnlockedSession:
+    def __init__(self, engine, idle_timeout: float = IDLE_TIMEOUT_S):
+        self.engine = engine
+        self.idle_timeout = idle_timeout
+        self.wallet_name = None
+        self._mnemonic = None   # bytearray, dropped once the seed is stretched
+        self._seed = None       # bytearray
+        self._accounts = {}     # network_key -> account dict without private_key
+        self._xpubs = {}        # network_key -> {"path", "xpub"} (public)
+        self._keys = {}         # network_key -> bytearray(private key text)
+        self._signers = {}      # (network_key, kind) -> signer object
+        self._locked = False
+        self._last_used = time.monotonic()
+
+    # ---- lifecycle ----
+    def touch(self):
+        self._last_used = time.monotonic()
+
+    def expired(self) -> bool:
+        return bool(self.idle_timeout) and (time.monotonic() - self._last_used) > self.idle_timeout
+
+    @property
+    def locked(self) -> bool:
+        return self._locked
+
+    def _clear(self):
+        _wipe(self._mnemonic); _wipe(self._seed)
+        for b in self._keys.values(): _wipe(b)
+        self.engine.wipe_cache()   # cached BIP32 nodes carry private keys too
+        _clear_qr_cache()
+        self._mnemonic = None; self._seed = None
+        self._accounts = {}; self._keys = {}; self._signers = {}; self._xpubs = {}
+        self.wallet_name = None
+
+    def lock(self):
+        self._clear(); self._locked = True
+
+    def load_active(self, seed: bytes | None = None):
+        """(Re)load the active wallet; pass `seed` when it was just stretched to skip the KDF."""
+        self._clear()
+        self._locked = False
+        name = get_active_wallet_name()
+        w = load_wallet()
+        self.wallet_name = name
+        phrase = (w.get("seed_phrase") or "").strip()
+        self._mnemonic = bytearray(phrase.encode("utf-8")) if phrase else None
+        if seed is not None:
+            self._seed = bytearray(seed)
+            _wipe(self._mnemonic); self._mnemonic = None
+        self._xpubs = dict(w.get("xpubs") or {})
+        for a in w.get("accounts", []):
+            if not isinstance(a, dict): continue
+            key = (a.get("network_key") or "").upper()
+            if not key or key in self._accounts: continue
+            pk = a.get("private_key") or ""
+            self._accounts[key] = {k: v for k, v in a.items() if k != "private_key"}
+            self._keys[key] = bytearray(pk.encode("ascii"))
+        self.touch()
+        if any(is_legacy_xrp_account(a) for a in self._accounts.values()):
+            try:
+                self._migrate_xrp()
+            except Exception:
+                pass    # left as is; the XRP plugin's check() reports it before signing
+
+    def _migrate_xrp(self):
+        """Re-derive legacy XRP accounts (r-address + raw hex key) and save them back, once."""
+        from stores.network_store import get_network
+        seed = self.seed()
+        if seed is None: return
+        w = load_wallet(); accounts = w.get("accounts", [])
+        for a in accounts:
+            if not isinstance(a, dict) or not is_legacy_xrp_account(a): continue
+            key = (a.get("network_key") or "").upper()
+            acc = self.engine.derive_account(seed, get_network(key) or {"key": key, "type": "xrp"}, 0)
+            a.pop("address_type", None)
+            a.update({k: acc[k] for k in ("derivation_path", "index", "address", "public_key", "private_key")},
+                     network_type="xrp")
+            self._accounts[key] = {k: v for k, v in a.items() if k != "private_key"}
+            _wipe(self._keys.get(key)); self._keys[key] = bytearray(acc["private_key"].encode("ascii"))
+            self._signers = {k: v for k, v in self._signers.items() if k[0] != key}
+        save_wallet(w)
+
+    def _ensure(self):
+        if self._locked:
+            raise SessionLocked("Session locked")
+        if self.expired():
+            self.lock(); raise SessionLocked("Session timed out")
+        if self.wallet_name != get_active_wallet_name():
+            self.load_active()
+        self.touch()
+
+    # ---- API used by flows ----
+    def has_seed(self) -> bool:
+        self._ensure()
+        return self._seed is not None or self._mnemonic is not None
+
+    def seed(self) -> bytes | None:
+        """BIP39 seed for the active wallet; stretched once per session."""
+        self._ensure()
+        if self._seed is None and self._mnemonic:
+            self._seed = bytearray(self.engine.mnemonic_to_seed(self._mnemonic.decode("utf-8")))
+            _wipe(self._mnemonic); self._mnemonic = None
+        return bytes(self._seed) if self._seed is not None else None
+
+    def accounts(self) -> list:
+        self._ensure()
+        return [dict(a) for a in self._accounts.values()]
+
+    def account(self, network_key: str):
+        """Public account fields (no private key) or None."""
+        self._ensure()
+        a = self._accounts.get((network_key or "").upper())
+        return dict(a) if a is not None else None
+
+    def xpubs(self) -> dict:
+        self._ensure()
+        return dict(self._xpubs)
+
+    def private_key(self, network_key: str) -> str | None:
+        """Private key text (hex or WIF). The returned str is a copy that cannot be zeroised."""
+        self._ensure()
+        b = self._keys.get((network_key or "").upper())
+        return b.decode("ascii") if b else None
+
+    def signer(self, network_key: str, kind: str, factory):
+        """Per-session cached signer: factory(private_key_text) is called once per (network, kind)."""
+        self._ensure()
+        key = ((network_key or "").upper(), kind)
+        s = self._signers.get(key)
+        if s is None:
+            pk = self.private_key(network_key)
+            if not pk:
+                return None
+            s = self._signers[key] = factory(pk)
+        return s
+
+# ---- module-level current session ----
+_current = None
+
+def unlock(engine, idle_timeout: float = IDLE_TIMEOUT_S) -> UnlockedSession:
+    global _current
+    if _current is not None: _current.lock()
+    _current = UnlockedSession(engine, idle_timeout)
+    _current.load_active()
+    return _current
+
+def current_session() -> UnlockedSession | None:
+    """The unlocked session, or None once it is locked or idle past its timeout."""
+    if _current is None or _current.locked: return None
+    if _current.expired():
+        _current.lock(); return None
+    return _current
+
+def lock_session():
+    global _current
+    if _current is not None: _current.lock()
+    _current = None
+    _clear_qr_cache()
+
+def on_wallet_switched(seed: bytes | None = None):
+    """Zeroise the old wallet's secrets and load the newly active one."""
+    s = current_session()
+    if s is not None: s.load_active(seed)
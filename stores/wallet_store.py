@@ -1,5 +1,5 @@
 # wallet_store.py
-import json, shutil
+import json, shutil, copy
 from pathlib import Path
 from datetime import datetime
 
@@ -22,65 +22,189 @@ def _safe_write_json(path: Path, obj):
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(obj, indent=2))
 
-def _wallet_path(name: str) -> Path:
-    return WALLETS_DIR / f"{name}.json"
-
-def _load_meta():
-    WALLETS_DIR.mkdir(exist_ok=True)
-    meta = _safe_read_json(META_PATH, {})
-    existing = sorted([p.stem for p in WALLETS_DIR.glob("*.json")])
-    if not existing:
-        if LEGACY_PATH.exists():
-            try:
-                shutil.copy2(LEGACY_PATH, _wallet_path(DEFAULT_WALLET_NAME))
-            except Exception:
-                _safe_write_json(_wallet_path(DEFAULT_WALLET_NAME), {"seed_phrase":"", "accounts":[]})
-            meta["active"] = DEFAULT_WALLET_NAME
-            _safe_write_json(META_PATH, meta); return meta
-        _safe_write_json(_wallet_path(DEFAULT_WALLET_NAME), {"seed_phrase":"", "accounts":[]})
-        meta["active"] = DEFAULT_WALLET_NAME
-        _safe_write_json(META_PATH, meta); return meta
-    active = meta.get("active")
-    if not active or not _wallet_path(active).exists():
-        meta["active"] = existing[0]; _safe_write_json(META_PATH, meta)
-    return meta
-
-def _ensure_meta_ready(): return _load_meta()
+def _stamp(path: Path):
+    try:
+        st = path.stat()
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+def _empty_wallet():
+    return {"seed_phrase":"", "accounts":[]}
+
+class _CachedWallet:
+    """One parsed wallet file plus its account indexes."""
+    __slots__ = ("stamp", "data", "by_network", "by_address")
+
+    def __init__(self, stamp, data):
+        self.stamp = stamp
+        data = data if isinstance(data, dict) else {}
+        data.setdefault("seed_phrase",""); data.setdefault("accounts",[])
+        self.data = data
+        self.by_network = {}; self.by_address = {}
+        for a in data["accounts"]:
+            if not isinstance(a, dict): continue
+            key = (a.get("network_key") or "").upper()
+            if key: self.by_network.setdefault(key, a)
+            addr = (a.get("address") or "").strip()
+            if addr: self.by_address.setdefault(addr.lower(), a)
+
+class WalletRepository:
+    """
+    Cached view of wallets/*.json + wallet_meta.json.
+    - wallet catalogue is re-globbed only when the wallets/ directory changes
+    - active pointer is re-read only when wallet_meta.json changes
+    - each wallet file is parsed lazily, once per (mtime, size)
+    """
+    def __init__(self, wallets_dir: Path, meta_path: Path, legacy_path: Path):
+        self.dir = wallets_dir; self.meta_path = meta_path; self.legacy_path = legacy_path
+        self._dir_stamp = None; self._names = []
+        self._meta_stamp = None; self._meta = {}
+        self._wallets = {}   # name -> _CachedWallet
+
+    def _path(self, name: str) -> Path:
+        return self.dir / f"{name}.json"
+
+    # ---- catalogue / meta ----
+    def _refresh(self):
+        self.dir.mkdir(exist_ok=True)
+        dir_stamp = _stamp(self.dir); meta_stamp = _stamp(self.meta_path)
+        if dir_stamp == self._dir_stamp and meta_stamp == self._meta_stamp:
+            return
+        if dir_stamp != self._dir_stamp:
+            self._names = sorted(p.stem for p in self.dir.glob("*.json"))
+            self._wallets = {n: w for n, w in self._wallets.items() if n in self._names}
+        if meta_stamp != self._meta_stamp:
+            meta = _safe_read_json(self.meta_path, {})
+            self._meta = meta if isinstance(meta, dict) else {}
+        if not self._names:
+            # first run: migrate legacy wallet.json or create an empty default
+            if self.legacy_path.exists():
+                try:
+                    shutil.copy2(self.legacy_path, self._path(DEFAULT_WALLET_NAME))
+                except Exception:
+                    _safe_write_json(self._path(DEFAULT_WALLET_NAME), _empty_wallet())
+            else:
+                _safe_write_json(self._path(DEFAULT_WALLET_NAME), _empty_wallet())
+            self._names = [DEFAULT_WALLET_NAME]
+            self._write_meta(active=DEFAULT_WALLET_NAME)
+        elif self._meta.get("active") not in self._names:
+            self._write_meta(active=self._names[0])
+        self._dir_stamp = _stamp(self.dir); self._meta_stamp = _stamp(self.meta_path)
+
+    def _write_meta(self, **changes):
+        self._meta = {**self._meta, **changes}
+        _safe_write_json(self.meta_path, self._meta)
+        self._meta_stamp = _stamp(self.meta_path)
+
+    def names(self) -> list:
+        self._refresh(); return list(self._names)
+
+    def active_name(self) -> str:
+        self._refresh(); return self._meta.get("active", DEFAULT_WALLET_NAME)
+
+    def set_active(self, name: str):
+        self._refresh()
+        if name not in self._names:
+            self.ensure(name)
+        if self._meta.get("active") != name:
+            self._write_meta(active=name)
+
+    # ---- wallet files ----
+    def _cached(self, name: str) -> _CachedWallet:
+        p = self._path(name); st = _stamp(p)
+        cw = self._wallets.get(name)
+        if cw is None or cw.stamp != st:
+            cw = _CachedWallet(st, _safe_read_json(p, _empty_wallet()))
+            self._wallets[name] = cw
+        return cw
+
+    def load(self, name: str | None = None) -> dict:
+        name = name or self.active_name()
+        return copy.deepcopy(self._cached(name).data)
+
+    def save(self, name: str, data: dict):
+        p = self._path(name)
+        data = data or _empty_wallet()
+        _safe_write_json(p, data)
+        self._wallets[name] = _CachedWallet(_stamp(p), copy.deepcopy(data))
+        self._refresh()
+
+    def ensure(self, name: str):
+        p = self._path(name)
+        if not p.exists():
+            self.save(name, _empty_wallet())
+
+    def delete(self, name: str) -> bool:
+        self._refresh()
+        if name not in self._names: return False
+        try:
+            self._path(name).unlink()
+        except Exception:
+            return False
+        self._wallets.pop(name, None)
+        self._refresh()
+        return True
+
+    def rename(self, old: str, new: str) -> bool:
+        self._refresh()
+        src = self._path(old); dst = self._path(new)
+        if not src.exists() or dst.exists(): return False
+        try:
+            src.rename(dst)
+        except Exception:
+            return False
+        cw = self._wallets.pop(old, None)
+        if cw is not None: self._wallets[new] = cw
+        if self._meta.get("active") == old:
+            self._write_meta(active=new)
+        self._refresh()
+        return True
+
+    # ---- indexed account lookups ----
+    def account_for_network(self, network_key: str, name: str | None = None):
+        name = name or self.active_name()
+        a = self._cached(name).by_network.get((network_key or "").upper())
+        return dict(a) if a is not None else None
+
+    def account_for_address(self, address: str, name: str | None = None):
+        name = name or self.active_name()
+        a = self._cached(name).by_address.get((address or "").strip().lower())
+        return dict(a) if a is not None else None
+
+    def xpubs(self, name: str | None = None) -> dict:
+        name = name or self.active_name()
+        x = self._cached(name).data.get("xpubs")
+        return copy.deepcopy(x) if isinstance(x, dict) else {}
+
+    def invalidate(self):
+        self._dir_stamp = None; self._meta_stamp = None; self._wallets.clear()
+
+_repo = WalletRepository(WALLETS_DIR, META_PATH, LEGACY_PATH)
+
+def wallet_repository() -> WalletRepository:
+    return _repo
 
 # ---- Public API ----
 def list_wallets():
-    _ensure_meta_ready()
-    return sorted([p.stem for p in WALLETS_DIR.glob("*.json")])
+    return _repo.names()
 
 def get_active_wallet_name() -> str:
-    meta=_ensure_meta_ready(); return meta.get("active", DEFAULT_WALLET_NAME)
+    return _repo.active_name()
 
 def set_active_wallet(name: str):
     if not name: return
-    _ensure_meta_ready()
-    if not _wallet_path(name).exists():
-        _safe_write_json(_wallet_path(name), {"seed_phrase":"", "accounts":[]})
-    meta=_safe_read_json(META_PATH,{})
-    meta["active"]=name; _safe_write_json(META_PATH, meta)
+    _repo.set_active(name)
 
 def ensure_wallet_exists(name: str):
-    p=_wallet_path(name)
-    if not p.exists():
-        _safe_write_json(p, {"seed_phrase":"", "accounts":[]})
+    _repo.ensure(name)
 
 def delete_wallet(name: str) -> bool:
     name=(name or "").strip()
     if not name: return False
-    _ensure_meta_ready()
-    wallets = list_wallets()
-    if name not in wallets: return False
-    p=_wallet_path(name)
-    try:
-        p.unlink()
-    except Exception:
-        return False
-    remaining = list_wallets()
     active=get_active_wallet_name()
+    if not _repo.delete(name): return False
+    remaining = list_wallets()
     if not remaining:
         ensure_wallet_exists(DEFAULT_WALLET_NAME)
         set_active_wallet(DEFAULT_WALLET_NAME)
@@ -93,34 +217,32 @@ def rename_wallet(old: str, new: str) -> bool:
     old = (old or "").strip()
     new = (new or "").strip()
     if not old or not new: return False
-    _ensure_meta_ready()
-    src=_wallet_path(old); dst=_wallet_path(new)
-    if not src.exists(): return False
-    if dst.exists(): return False
-    try:
-        src.rename(dst)
-    except Exception:
-        return False
-    # update active reference if needed
-    meta=_safe_read_json(META_PATH,{})
-    if meta.get("active")==old:
-        meta["active"]=new; _safe_write_json(META_PATH, meta)
-    return True
+    return _repo.rename(old, new)
 
 def load_wallet():
-    name=get_active_wallet_name()
-    data=_safe_read_json(_wallet_path(name), {"seed_phrase":"", "accounts":[]})
-    data.setdefault("seed_phrase",""); data.setdefault("accounts",[])
-    return data
+    return _repo.load()
+
+def find_account(network_key: str):
+    """Active wallet's account for network_key (case-insensitive) or None."""
+    return _repo.account_for_network(network_key)
+
+def find_account_by_address(address: str):
+    """Active wallet's account owning address (case-insensitive) or None."""
+    return _repo.account_for_address(address)
+
+def load_xpubs() -> dict:
+    """Active wallet's stored account xpubs (public data only)."""
+    return _repo.xpubs()
 
 def save_wallet(data: dict):
-    name=get_active_wallet_name()
-    _safe_write_json(_wallet_path(name), data or {"seed_phrase":"", "accounts":[]})
+    _repo.save(get_active_wallet_name(), data)
 
-def upsert_wallet(seed_phrase: str, accounts: list):
+def upsert_wallet(seed_phrase: str, accounts: list, xpubs: dict | None = None):
+    """xpubs: {network_key: {"path": account path, "xpub": extended public key}}"""
     name=get_active_wallet_name()
-    current=_safe_read_json(_wallet_path(name), {})
+    current=_repo.load(name)
     current["seed_phrase"]=seed_phrase or current.get("seed_phrase","")
     current["accounts"]=accounts or current.get("accounts", [])
+    if xpubs: current["xpubs"]=xpubs
     current.setdefault("created_at", _now_iso()); current["updated_at"]=_now_iso()
-    _safe_write_json(_wallet_path(name), current)
+    _repo.save(name, current)
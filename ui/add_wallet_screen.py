@@ -1,8 +1,8 @@
 # add_wallet_screen.py
 import re, pygame
 from stores.wallet_store import ensure_wallet_exists, set_active_wallet
+from stores.session import on_wallet_switched
 from ui.on_screen_keyboard import OnScreenKeyboard
-from ui.wallet_screens import WalletScreens
 from stores.settings import get_display_mode
 
 class AddWalletScreen:
@@ -12,11 +12,12 @@ class AddWalletScreen:
         self.sw,self.sh=screen.get_size()
 
     def run(self):
+        from ui.wallet_screens import WalletScreens   # pulls in mnemonic; keep it out of startup
         # ask name
         name = OnScreenKeyboard(self.sc, "Wallet name").run()
         if not name: return
         safe = re.sub(r"[^A-Za-z0-9_\-]", "_", name).strip("_-")[:24] or "wallet"
-        ensure_wallet_exists(safe); set_active_wallet(safe)
+        ensure_wallet_exists(safe); set_active_wallet(safe); on_wallet_switched()
 
         items = ["Create Wallet", "Restore Wallet", "Back"]
         rects = self.r.draw_menu(f"Add Wallet: {safe}", items, get_display_mode(self.r.settings))
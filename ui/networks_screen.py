@@ -3,6 +3,7 @@ import pygame
 from stores.settings import get_display_mode
 from ui.display_modes import DisplayMode
 from stores.network_store import list_networks
+from stores.session import current_session, SessionLocked
 WHITE=(255,255,255); BLACK=(0,0,0); OUT=(0,0,0); BG=(238,238,238)
 
 class NetworksScreen:
@@ -28,32 +29,45 @@ class NetworksScreen:
                     if idx == len(labels)-1:  # Back
                         return
                     self._preview_network(nets[idx])
+                    if current_session() is None: return   # locked meanwhile: back to the PIN gate
 
     def _preview_network(self, net):
-        seed = self.get_seed()
+        s = current_session()
+        try:
+            xpub = self.engine.xpub_for(net, s.xpubs()) if s is not None else None
+            seed = None if xpub else self.get_seed()
+        except SessionLocked:
+            return self._locked()
         self.screen.fill(WHITE)
         self.screen.blit(self.title_font.render(net["name"], True, BLACK), (8,6))
 
         info = []
-        if not seed:
+        if xpub:
+            # watch-only preview: no seed stretching, no private keys
+            acc = self.engine.derive_from_xpub(xpub, net, 0)
+            info += [f"Type: {net['type'].upper()} (xpub)", f"Address: {acc['address']}"]
+        elif not seed:
             info.append("No seed loaded. Create/Restore first.")
         else:
-            # derive index 0 address only (preview)
-            if net["type"] == "evm":
-                acc = self.engine.derive_evm_account(seed, net.get("derivation_path","m/44'/60'/0'/0/0").replace("{index}","0"))
-                info += [f"Type: EVM", f"Address: {acc['address']}"]
-            else:
-                acc = self.engine.derive_utxo_account(seed,
-                                                      address_type=net.get("address_type","P2WPKH"),
-                                                      coin_type=net.get("coin_type",0),
-                                                      derivation_path=net.get("derivation_path","m/84'/0'/0'/0/0").replace("{index}","0"))
-                info += [f"Type: UTXO", f"Address: {acc['address']}"]
+            # derive index 0 address only (preview); node cache makes repeats cheap
+            acc = self.engine.derive_account(seed, net, 0)
+            info += [f"Type: {net['type'].upper()}", f"Address: {acc['address']}", f"Path: {acc['derivation_path']}"]
 
         y=28
         for line in info:
             self.screen.blit(self.body_font.render(line, True, BLACK), (8,y))
             y+=16
 
+        self._wait_back()
+
+    def _locked(self):
+        self.screen.fill(WHITE)
+        self.screen.blit(self.title_font.render("Notice", True, BLACK), (8,6))
+        self.screen.blit(self.body_font.render("Session locked.", True, BLACK), (8,34))
+        self.screen.blit(self.body_font.render("Enter PIN again.", True, BLACK), (8,50))
+        self._wait_back()
+
+    def _wait_back(self):
         btn_back = pygame.Rect(self.screen.get_width()-60, self.screen.get_height()-26, 52, 20)
         pygame.draw.rect(self.screen, (220,220,220), btn_back, border_radius=6)
         pygame.draw.rect(self.screen, OUT, btn_back, 1, border_radius=6)
@@ -13,10 +13,13 @@
 import pygame, time, re
 from ui.theme_store import theme_color, theme_radius
 
-try:
-    from mnemonic import Mnemonic
-except Exception:
-    Mnemonic = None
+def _bip39_words():
+    """Mnemonic is only needed for the BIP39 layout, so it is imported on first use."""
+    try:
+        from mnemonic import Mnemonic
+    except Exception:
+        return None
+    return Mnemonic("english")
 
 class OnScreenKeyboard:
     def __init__(self, screen, prompt_or_default="", default_text=None,
@@ -72,7 +75,7 @@ class OnScreenKeyboard:
         self.repeat_started = False
 
         # bip39 hints
-        self.mnemo = Mnemonic("english") if (self.input_type=="bip39" and Mnemonic is not None) else None
+        self.mnemo = _bip39_words() if self.input_type=="bip39" else None
         self.hints = []  # [(word, rect), ...]
 
     # ------------- public -------------
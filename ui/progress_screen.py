@@ -0,0 +1,97 @@
+# progress_screen.py
+# Runs a slow job (seed stretching, derivation, ...) on a worker thread while the
+# pygame loop keeps drawing a spinner + progress bar and stays responsive to Cancel.
+import math, threading, pygame
+from ui.theme_store import theme_color, theme_radius
+
+class Progress:
+    """Handle passed to the job: report progress, poll for cancellation."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fraction = 0.0
+        self._text = ""
+        self._cancel = threading.Event()
+
+    def report(self, fraction: float, text: str | None = None):
+        with self._lock:
+            self._fraction = max(0.0, min(1.0, float(fraction)))
+            if text is not None: self._text = text
+
+    def snapshot(self):
+        with self._lock:
+            return self._fraction, self._text
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+class ProgressScreen:
+    """
+    ProgressScreen(screen, tf, bf, "Deriving wallet").run(job)
+      job(progress) -> result ; runs on a daemon thread
+    Returns ("done", result) | ("cancelled", None) | ("error", exception).
+    Cancel keeps the spinner up until the job has returned, so a retry never runs
+    alongside it on shared state (e.g. the engine's node cache); its result is discarded.
+    """
+    def __init__(self, screen, title_font, body_font, title="Working…", cancellable=True):
+        self.sc=screen; self.tf=title_font; self.bf=body_font
+        self.sw,self.sh=screen.get_size()
+        self.title=title; self.cancellable=cancellable
+
+    def run(self, job):
+        progress = Progress()
+        box = {}
+        def worker():
+            try:
+                box["result"] = job(progress)
+            except Exception as e:
+                box["error"] = e
+        t = threading.Thread(target=worker, name="progress-job", daemon=True)
+        t.start()
+
+        btn = pygame.Rect(self.sw-68, self.sh-28, 60, 20)
+        clock = pygame.time.Clock(); angle = 0.0
+        while t.is_alive():
+            for ev in pygame.event.get():
+                if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1 and self.cancellable and btn.collidepoint(ev.pos):
+                    progress.cancel()
+                elif ev.type==pygame.QUIT and self.cancellable:
+                    progress.cancel()
+            self._draw(progress, angle, btn)
+            angle = (angle + 0.25) % (2*math.pi)
+            clock.tick(30)
+        t.join()
+        if progress.cancelled:
+            return "cancelled", None
+        if "error" in box:
+            return "error", box["error"]
+        return "done", box.get("result")
+
+    def _draw(self, progress, angle, btn):
+        fg, bg, card, border, acc = theme_color("fg"), theme_color("bg"), theme_color("card"), theme_color("border"), theme_color("accent")
+        frac, text = progress.snapshot()
+        if progress.cancelled: text = "Cancelling…"
+        self.sc.fill(bg)
+        self.sc.blit(self.tf.render(self.title, True, fg), (8,6))
+        # spinner
+        c = (self.sw//2, self.sh//2 - 16); r = 22
+        rect = pygame.Rect(c[0]-r, c[1]-r, 2*r, 2*r)
+        pygame.draw.circle(self.sc, card, c, r, 4)
+        pygame.draw.arc(self.sc, acc, rect, angle, angle + math.pi/2, 4)
+        # bar
+        bar = pygame.Rect(24, self.sh//2 + 20, self.sw-48, 10)
+        pygame.draw.rect(self.sc, card, bar, border_radius=4)
+        if frac > 0:
+            pygame.draw.rect(self.sc, acc, pygame.Rect(bar.x, bar.y, int(bar.w*frac), bar.h), border_radius=4)
+        pygame.draw.rect(self.sc, border, bar, 1, border_radius=4)
+        if text:
+            s = self.bf.render(text, True, fg)
+            self.sc.blit(s, ((self.sw - s.get_width())//2, bar.bottom + 6))
+        if self.cancellable and not progress.cancelled:
+            pygame.draw.rect(self.sc, card, btn, border_radius=theme_radius())
+            pygame.draw.rect(self.sc, border, btn, 1, border_radius=theme_radius())
+            self.sc.blit(self.bf.render("Cancel", True, fg), (btn.x+8, btn.y+2))
+        pygame.display.flip()
@@ -1,6 +1,6 @@
 # theme_store.py
 from pathlib import Path
-import json
+import json, time
 
 SETTINGS_PATH = Path("settings.json")
 
@@ -76,55 +76,141 @@ THEMES = {
 DEFAULTS = {
     "theme": "classic",
     "ui_mode": "grid",   # 'list' | 'grid' | 'compact'
+    "qr_ecc": "Q",       # 'L' | 'M' | 'Q' | 'H'
+    "qr_min_module_px": 2,  # smallest QR module our cameras still resolve on the panel
 }
 
-def _read_settings():
-    try:
-        if SETTINGS_PATH.exists():
-            data = json.loads(SETTINGS_PATH.read_text() or "{}")
-        else:
+class SettingsStore:
+    """
+    Process-wide settings.json cache.
+    Loads once, re-stats the file at most every STAT_INTERVAL seconds to pick up
+    external edits, writes through on set() and notifies subscribers on change.
+    """
+    STAT_INTERVAL = 0.5  # seconds between mtime checks (per-frame calls stay in memory)
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._data = None
+        self._stamp = None        # (mtime_ns, size) of the file we last loaded/wrote
+        self._checked_at = 0.0
+        self._listeners = []
+
+    def _file_stamp(self):
+        try:
+            st = self.path.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _load(self):
+        try:
+            if self.path.exists():
+                data = json.loads(self.path.read_text() or "{}")
+            else:
+                data = {}
+        except Exception:
+            data = {}
+        if not isinstance(data, dict):
             data = {}
-    except Exception:
-        data = {}
-    for k,v in DEFAULTS.items():
-        data.setdefault(k, v)
-    return data
+        for k,v in DEFAULTS.items():
+            data.setdefault(k, v)
+        return data
+
+    def data(self) -> dict:
+        now = time.monotonic()
+        if self._data is not None and now - self._checked_at < self.STAT_INTERVAL:
+            return self._data
+        self._checked_at = now
+        stamp = self._file_stamp()
+        if self._data is None or stamp != self._stamp:
+            old, self._data, self._stamp = self._data, self._load(), stamp
+            if old is not None and old != self._data:
+                self._notify()
+        return self._data
+
+    def get(self, key, default=None):
+        return self.data().get(key, default)
+
+    def update(self, **changes):
+        data = {**DEFAULTS, **self.data(), **changes}
+        if data == self._data:
+            return
+        self.path.write_text(json.dumps(data, indent=2))
+        self._data, self._stamp = data, self._file_stamp()
+        self._checked_at = time.monotonic()
+        self._notify()
+
+    def invalidate(self):
+        self._data = None; self._stamp = None
+
+    def subscribe(self, callback):
+        """callback(settings_dict) is called after any theme/ui_mode change."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self):
+        for cb in list(self._listeners):
+            try: cb(self._data)
+            except Exception: pass
+
+_store = SettingsStore(SETTINGS_PATH)
+
+def settings_store() -> SettingsStore:
+    return _store
+
+def on_settings_change(callback):
+    """Register callback(settings_dict); usable as a decorator."""
+    return _store.subscribe(callback)
+
+def _read_settings():
+    return dict(_store.data())
 
 def _write_settings(data):
-    data = {**DEFAULTS, **(data or {})}
-    SETTINGS_PATH.write_text(json.dumps(data, indent=2))
+    _store.update(**(data or {}))
 
 # ---- Theme API ----
 def list_themes():
     return [{"key": k, "name": v["name"]} for k,v in THEMES.items()]
 
 def get_theme_key():
-    return _read_settings().get("theme", DEFAULTS["theme"])
+    return _store.get("theme", DEFAULTS["theme"])
 
 def set_theme_key(key: str):
     if key not in THEMES:
         key = "classic"
-    data = _read_settings()
-    data["theme"] = key
-    _write_settings(data)
+    _store.update(theme=key)
+
+def _theme():
+    return THEMES.get(get_theme_key(), THEMES["classic"])
 
 def theme_color(name: str):
-    key = get_theme_key()
-    theme = THEMES.get(key, THEMES["classic"])
-    return theme["colors"].get(name, (0,0,0))
+    return _theme()["colors"].get(name, (0,0,0))
 
 def theme_radius():
-    key = get_theme_key()
-    return THEMES.get(key, THEMES["classic"]).get("radius", 8)
+    return _theme().get("radius", 8)
 
 # ---- UI Mode API ----
 def get_ui_mode() -> str:
-    return _read_settings().get("ui_mode", DEFAULTS["ui_mode"])
+    return _store.get("ui_mode", DEFAULTS["ui_mode"])
 
 def set_ui_mode(mode: str):
     mode = (mode or "").lower()
     if mode not in ("list", "grid", "compact"):
         mode = "grid"
-    data = _read_settings()
-    data["ui_mode"] = mode
-    _write_settings(data)
+    _store.update(ui_mode=mode)
+
+# ---- QR API ----
+def get_qr_ecc() -> str:
+    ecc = str(_store.get("qr_ecc", DEFAULTS["qr_ecc"])).upper()
+    return ecc if ecc in ("L", "M", "Q", "H") else DEFAULTS["qr_ecc"]
+
+def get_qr_min_module_px() -> int:
+    try:
+        return max(1, int(_store.get("qr_min_module_px", DEFAULTS["qr_min_module_px"])))
+    except (TypeError, ValueError):
+        return DEFAULTS["qr_min_module_px"]
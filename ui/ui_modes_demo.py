@@ -130,7 +130,9 @@ class AppRenderer:
 
 class SimpleApp:
     def __init__(self):
-        pygame.init()
+        # only the subsystems we use; pygame.init() would also probe audio, joystick, camera...
+        pygame.display.init()
+        pygame.font.init()
         # exact 320x240, no scaling
         self.screen = pygame.display.set_mode((320, 240))
         pygame.display.set_caption("Air-gapped Wallet")
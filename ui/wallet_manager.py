@@ -4,9 +4,18 @@ from stores.settings import get_display_mode
 from stores.wallet_store import list_wallets, get_active_wallet_name, set_active_wallet, ensure_wallet_exists, delete_wallet, rename_wallet
 from ui.on_screen_keyboard import OnScreenKeyboard
 from ui.pin_screen import PinScreen
-from ui.theme_store import theme_color
+from stores.session import on_wallet_switched
+from ui.theme_store import theme_color, on_settings_change
 
-WHITE=theme_color("bg"); BLACK=theme_color("fg"); OUT=theme_color("border")
+WHITE=BLACK=OUT=None
+
+@on_settings_change
+def _apply_theme(_settings=None):
+    # re-read palette whenever the theme changes instead of freezing it at import
+    global WHITE, BLACK, OUT
+    WHITE=theme_color("bg"); BLACK=theme_color("fg"); OUT=theme_color("border")
+
+_apply_theme()
 
 class WalletManagerScreen:
     def __init__(self, screen, renderer, title_font, body_font):
@@ -29,7 +38,7 @@ class WalletManagerScreen:
                     hit = self.r.hit_test(rects, ev.pos)
                     if hit is None: break
                     if hit < len(names):
-                        set_active_wallet(names[hit]); self._toast(f"Active: {names[hit]}"); return
+                        set_active_wallet(names[hit]); on_wallet_switched(); self._toast(f"Active: {names[hit]}"); return
                     elif hit == len(names):
                         self._new_wallet_flow()
                     elif hit == len(names)+1:
@@ -45,7 +54,7 @@ class WalletManagerScreen:
         name = kb.run()
         if not name: return
         safe = re.sub(r"[^A-Za-z0-9_\-]", "_", name).strip("_-")[:24] or "wallet"
-        ensure_wallet_exists(safe); set_active_wallet(safe)
+        ensure_wallet_exists(safe); set_active_wallet(safe); on_wallet_switched()
         self._toast(f"Created & active: {safe}")
 
     def _rename_wallet_flow(self):
@@ -89,6 +98,7 @@ class WalletManagerScreen:
         if not self._confirm(f"Delete '{target}'?\nThis cannot be undone."):
             return
         ok = delete_wallet(target)
+        on_wallet_switched()
         self._toast("Deleted" if ok else "Delete failed")
 
     def _confirm(self, text):
@@ -1,25 +1,19 @@
 # wallet_screens.py
-import pygame, qrcode
-from PIL import Image
+import pygame
 from stores.settings import get_display_mode
 from stores.network_store import list_networks
 from stores.wallet_store import upsert_wallet
+from stores.session import on_wallet_switched
 from ui.word_check import WordCheck
 from ui.seed_entry_wizard import SeedEntryWizard
+from ui.progress_screen import ProgressScreen
 
 WHITE=(255,255,255); BLACK=(0,0,0); OUT=(0,0,0); BG=(238,238,238)
 
-def pil_to_surface(img: Image.Image):
-    mode, size, data = img.mode, img.size, img.tobytes()
-    return pygame.image.fromstring(data, size, mode)
-
-def make_qr_surface(s, px=180):
-    import qrcode
-    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_Q, box_size=4, border=1)
-    qr.add_data(s); qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
-    img = img.resize((px, px), Image.NEAREST)
-    return pil_to_surface(img)
+def make_qr_surface(s, px=180, secret=False):
+    """secret=True renders uncached, so the payload never enters the shared QR cache."""
+    from qr.qr_render import qr_surface, render_qr
+    return render_qr(s, px) if secret else qr_surface(s, px)
 
 class WalletScreens:
     def __init__(self, screen, renderer, engine):
@@ -47,21 +41,15 @@ class WalletScreens:
         try:
             if not WordCheck(self.screen, self.title_font, self.body_font).run(mnemonic):
                 self._toast("Word check failed"); return
-            seed = self.engine.mnemonic_to_seed(mnemonic)
-            self.last_mnemonic, self.last_seed = mnemonic, seed
-            accounts = self._derive_all_known(seed)
-            upsert_wallet(mnemonic, accounts)
-            self._toast("Wallet saved")
-            # Quick address preview
-            acc = next((a for a in accounts if a["network_key"]=="ETH"), accounts[0] if accounts else None)
-            if acc: self._show_address_screen(acc["address"])
         except Exception as e:
-            self._alert(f"Save/derive failed:\n{e}")
+            self._alert(f"Word check failed:\n{e}"); return
+        self._derive_and_save(mnemonic)
 
     def _show_seed_numbered(self, mnemonic: str) -> bool:
         # returns True to continue, False to cancel
         words = mnemonic.split()
         scroll=0
+        qr=make_qr_surface(mnemonic, px=120, secret=True)   # rendered once; not cached
         while True:
             self.screen.fill(WHITE)
             self.screen.blit(self.title_font.render("Seed (write down)", True, BLACK),(8,6))
@@ -71,7 +59,7 @@ class WalletScreens:
                 self.screen.blit(self.body_font.render(f"{i:02d}. {w}", True, BLACK),(10,y))
                 y+=14
             # QR + buttons
-            qr=make_qr_surface(mnemonic, px=120); rect=qr.get_rect(center=(self.sw//2, self.sh//2+6))
+            rect=qr.get_rect(center=(self.sw//2, self.sh//2+6))
             self.screen.blit(qr, rect)
             btn_qr = pygame.Rect(8, self.sh-26, 60, 20)
             btn_next=pygame.Rect(self.sw-68, self.sh-26, 60, 20)
@@ -79,11 +67,11 @@ class WalletScreens:
                 pygame.draw.rect(self.screen,(220,220,220),r,border_radius=6); pygame.draw.rect(self.screen,OUT,r,1,border_radius=6)
                 self.screen.blit(self.body_font.render(l, True, BLACK),(r.x+10, r.y+2))
             pygame.display.flip()
-            for ev in pygame.event.get():
-                if ev.type==pygame.QUIT: return False
-                if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1:
-                    if btn_qr.collidepoint(ev.pos): self._show_qr_modal(mnemonic)
-                    if btn_next.collidepoint(ev.pos): return True
+            ev=pygame.event.wait()
+            if ev.type==pygame.QUIT: return False
+            if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1:
+                if btn_qr.collidepoint(ev.pos): self._show_qr_modal(mnemonic, secret=True)
+                if btn_next.collidepoint(ev.pos): return True
 
     # ---------------- Restore ----------------
     def restore_wallet_flow(self, keyboard_cls=None):
@@ -94,37 +82,57 @@ class WalletScreens:
         # Optionally show summary (numbered) then proceed
         self._show_seed_numbered(mnemonic)
         # Derive & save
-        try:
+        self._derive_and_save(mnemonic)
+
+    def _derive_and_save(self, mnemonic: str):
+        """Seed stretch + derivation on a worker thread; the wallet is written only on completion."""
+        nets = list_networks()
+        def job(progress):
+            progress.report(0.0, "Stretching seed (PBKDF2)…")
             seed = self.engine.mnemonic_to_seed(mnemonic)
-            self.last_mnemonic, self.last_seed = mnemonic, seed
-            accounts = self._derive_all_known(seed)
-            upsert_wallet(mnemonic, accounts)
-            self._toast("Wallet saved")
-            acc = next((a for a in accounts if a["network_key"]=="ETH"), accounts[0] if accounts else None)
-            if acc: self._show_address_screen(acc["address"])
+            if progress.cancelled: return None
+            accounts = self._derive_all_known(seed, nets, progress)
+            if progress.cancelled: return None
+            return seed, accounts, self._account_xpubs(seed, nets)
+        status, result = ProgressScreen(self.screen, self.title_font, self.body_font, "Deriving wallet").run(job)
+        if status == "cancelled":
+            self._toast("Cancelled — nothing saved"); return
+        if status == "error" or result is None:
+            self._alert(f"Save/derive failed:\n{result}"); return
+        seed, accounts, xpubs = result
+        try:
+            upsert_wallet(mnemonic, accounts, xpubs)
         except Exception as e:
-            self._alert(f"Save/derive failed:\n{e}")
+            self._alert(f"Save failed:\n{e}"); return
+        self.last_mnemonic, self.last_seed = mnemonic, seed
+        on_wallet_switched(seed)   # session picks up the new keys without re-stretching
+        self._toast("Wallet saved")
+        # Quick address preview
+        acc = next((a for a in accounts if a["network_key"]=="ETH"), accounts[0] if accounts else None)
+        if acc: self._show_address_screen(acc["address"])
 
     # ----- helpers (unchanged derive, alert, toast, address/qr) -----
-    def _derive_all_known(self, seed):
-        nets = list_networks(); out=[]
-        for n in nets:
+    def _derive_all_known(self, seed, nets=None, progress=None):
+        nets = list_networks() if nets is None else nets; out=[]
+        for i, n in enumerate(nets):
+            if progress is not None:
+                if progress.cancelled: return None
+                progress.report(0.2 + 0.8*i/max(1, len(nets)), f"Deriving {n.get('name') or n.get('key')}…")
             t = n.get("type","evm").lower(); key = n.get("key","").upper()
-            if t == "evm":
-                path = (n.get("derivation_path") or "m/44'/60'/0'/0/{index}").replace("{index}","0")
-                acc = self.engine.derive_evm_account(seed, path)
-                out.append({"network_key": key,"network_type":"evm",
-                            "derivation_path": acc["derivation_path"],"index": acc["index"],
-                            "address": acc["address"],"public_key": acc["public_key"],"private_key": acc["private_key"]})
-            else:
-                path = (n.get("derivation_path") or "m/84'/0'/0'/0/{index}").replace("{index}","0")
-                addr_type = n.get("address_type","P2WPKH"); coin_type = n.get("coin_type",0)
-                acc = self.engine.derive_utxo_account(seed, addr_type, coin_type, path)
-                out.append({"network_key": key,"network_type":"utxo","address_type": addr_type,
-                            "derivation_path": acc["derivation_path"],"index": acc["index"],
-                            "address": acc["address"],"public_key": acc["public_key"],"private_key": acc["private_key"]})
+            # full derivation_path template is honored (custom coin types / accounts)
+            acc = self.engine.derive_account(seed, n, 0)
+            entry = {"network_key": key,"network_type": t if t in ("evm","xrp") else "utxo"}
+            if entry["network_type"] == "utxo":
+                entry["address_type"] = n.get("address_type","P2WPKH")
+            entry.update({"derivation_path": acc["derivation_path"],"index": acc["index"],
+                          "address": acc["address"],"public_key": acc["public_key"],"private_key": acc["private_key"]})
+            out.append(entry)
         return out
 
+    def _account_xpubs(self, seed, nets):
+        """Account-level xpubs per network so later address work can run without the seed."""
+        return {n.get("key","").upper(): self.engine.account_xpub(seed, n) for n in nets}
+
     def _alert(self, msg):
         self.screen.fill(WHITE); self.screen.blit(self.title_font.render("Notice", True, BLACK),(8,6))
         y=34
@@ -157,20 +165,20 @@ class WalletScreens:
                 pygame.draw.rect(self.screen,(220,220,220),r,border_radius=6); pygame.draw.rect(self.screen,OUT,r,1,border_radius=6)
                 self.screen.blit(self.body_font.render(lab, True, BLACK),(r.x+(r.w-self.body_font.size(lab)[0])//2, r.y+2))
             pygame.display.flip()
-            for ev in pygame.event.get():
-                if ev.type==pygame.QUIT: return
-                if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1:
-                    if btn_back.collidepoint(ev.pos): return
-                    if btn_qr.collidepoint(ev.pos): self._show_qr_modal(address)
+            ev=pygame.event.wait()
+            if ev.type==pygame.QUIT: return
+            if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1:
+                if btn_back.collidepoint(ev.pos): return
+                if btn_qr.collidepoint(ev.pos): self._show_qr_modal(address)
 
-    def _show_qr_modal(self, data: str):
+    def _show_qr_modal(self, data: str, secret=False):
+        self.screen.fill(WHITE); qr=make_qr_surface(data, px=180, secret=secret); rect=qr.get_rect(center=(self.sw//2, self.sh//2)); self.screen.blit(qr, rect)
+        close=pygame.Rect(self.sw-54, 6, 48, 22); pygame.draw.rect(self.screen,(220,220,220),close,border_radius=6); pygame.draw.rect(self.screen,OUT,close,1,border_radius=6)
+        self.screen.blit(self.body_font.render("Close", True, BLACK),(close.x+6, close.y+2)); pygame.display.flip()
         while True:
-            self.screen.fill(WHITE); qr=make_qr_surface(data, px=180); rect=qr.get_rect(center=(self.sw//2, self.sh//2)); self.screen.blit(qr, rect)
-            close=pygame.Rect(self.sw-54, 6, 48, 22); pygame.draw.rect(self.screen,(220,220,220),close,border_radius=6); pygame.draw.rect(self.screen,OUT,close,1,border_radius=6)
-            self.screen.blit(self.body_font.render("Close", True, BLACK),(close.x+6, close.y+2)); pygame.display.flip()
-            for ev in pygame.event.get():
-                if ev.type==pygame.QUIT: return
-                if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1 and close.collidepoint(ev.pos): return
+            ev=pygame.event.wait()
+            if ev.type==pygame.QUIT: return
+            if ev.type==pygame.MOUSEBUTTONDOWN and ev.button==1 and close.collidepoint(ev.pos): return
 
     def _wait_click(self, rects, labels):
         while True: